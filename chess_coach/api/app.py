@@ -1,3 +1,6 @@
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -6,8 +9,20 @@ from chess_coach.api.routers import puzzles
 from chess_coach.api.routers import courses
 from chess_coach.api.routers import diagnostics
 from chess_coach.api.routers import pro
+from chess_coach.api.routers import jobs
+from chess_coach.api.deps import build_job_runner, engine_health
+from chess_coach.application.jobs import start_workers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # --- Background job workers (0 = jobs are run by `python -m chess_coach.worker`)
+    stop = start_workers(build_job_runner, int(os.getenv("CHESS_COACH_JOB_WORKERS", "1")))
+    yield
+    stop.set()
+
 
-app = FastAPI(title="Chess Coach Agentic MVP")
+app = FastAPI(title="Chess Coach Agentic MVP", lifespan=lifespan)
 
 # --- CORS (permite que el frontend en :3000 se conecte al backend :8000)
 app.add_middleware(
@@ -24,9 +39,10 @@ app.include_router(puzzles.router, prefix="/v1")
 app.include_router(courses.router, prefix="/v1")
 app.include_router(diagnostics.router, prefix="/v1")
 app.include_router(pro.router, prefix="/v1")
+app.include_router(jobs.router, prefix="/v1")
 
 
 # --- Health check
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "engines": engine_health()}
@@ -2,9 +2,15 @@ from __future__ import annotations
 
 import os
 
+from chess_coach.infrastructure.engine_pool import EnginePool
+from chess_coach.infrastructure.engine_resources import (
+    EngineResources, detect_cores, detect_memory_mb, is_deep_queue, plan_engine_resources,
+)
+from chess_coach.infrastructure.eval_cache import SqliteEvalCache
 from chess_coach.infrastructure.lichess_client import LichessClient
-from chess_coach.infrastructure.stockfish_engine import StockfishEngine
+from chess_coach.infrastructure.opening_book import PolyglotBook
 from chess_coach.infrastructure.sqlite_repo import SqliteGameRepository
+from chess_coach.infrastructure.tablebase import SyzygyTablebase
 
 
 def get_repo() -> SqliteGameRepository:
@@ -13,17 +19,146 @@ def get_repo() -> SqliteGameRepository:
 
 
 def get_lichess() -> LichessClient:
-    return LichessClient()
-_ENGINE: StockfishEngine | None = None
+    # "ndjson" skips PGN header parsing (metadata comes as JSON fields)
+    return LichessClient(fmt=os.getenv("LICHESS_EXPORT_FORMAT", "pgn"))
 
-def get_engine() -> StockfishEngine:
-    global _ENGINE
-    if _ENGINE is None:
-        _ENGINE = StockfishEngine(
+
+def _search_timeout_s() -> float:
+    """Wall-clock limit per search (0 = none); hung engines are killed and respawned."""
+    return float(os.getenv("STOCKFISH_SEARCH_TIMEOUT_S", "30"))
+
+def _search_retries() -> int:
+    return int(os.getenv("STOCKFISH_SEARCH_RETRIES", "1"))
+
+
+def _env_int(name: str) -> int | None:
+    value = os.getenv(name, "").strip()
+    return int(value) if value else None
+
+
+_ENGINE_RESOURCES: EngineResources | None = None
+
+def get_engine_resources() -> EngineResources:
+    """Pool size / Threads / Hash for this machine (STOCKFISH_POOL_SIZE, _THREADS, _HASH_MB override).
+
+    Re-planned whenever the job backlog crosses the deep-queue threshold, so
+    the pools follow the load (see `get_engine_pool`).
+    """
+    global _ENGINE_RESOURCES
+    queue_depth = get_job_queue().count_pending()
+    if _ENGINE_RESOURCES is None or is_deep_queue(queue_depth) != is_deep_queue(_ENGINE_RESOURCES.queue_depth):
+        _ENGINE_RESOURCES = plan_engine_resources(
+            cores=detect_cores(),
+            memory_mb=detect_memory_mb(),
+            queue_depth=queue_depth,
+            pools=2 if int(os.getenv("STOCKFISH_TRIAGE_DEPTH", "0")) > 0 else 1,
+            pool_size=_env_int("STOCKFISH_POOL_SIZE"),
+            threads=_env_int("STOCKFISH_THREADS"),
+            hash_mb=_env_int("STOCKFISH_HASH_MB"),
+        )
+    return _ENGINE_RESOURCES
+
+
+_ENGINE_POOL: EnginePool | None = None
+
+def get_engine_pool() -> EnginePool:
+    """Process-wide pool of Stockfish processes used for batch mining.
+
+    Reconfigured in place when the resource plan changes.
+    """
+    global _ENGINE_POOL
+    res = get_engine_resources()
+    if _ENGINE_POOL is not None:
+        _ENGINE_POOL.reconfigure(size=res.pool_size, threads=res.threads, hash_mb=res.hash_mb)
+    else:
+        _ENGINE_POOL = EnginePool(
+            size=res.pool_size,
             path=os.getenv("STOCKFISH_PATH", "stockfish"),
             depth=int(os.getenv("STOCKFISH_DEPTH", "8")),
+            threads=res.threads,
+            hash_mb=res.hash_mb,
+            timeout_s=_search_timeout_s(),
+            retries=_search_retries(),
+            # nothing acquires at INTERACTIVE priority yet: reserving an engine would only idle it
+            interactive_reserve=int(os.getenv("STOCKFISH_INTERACTIVE_RESERVE", "0")),
+        )
+    return _ENGINE_POOL
+
+
+_TRIAGE_POOL: EnginePool | None = None
+
+def get_triage_pool() -> EnginePool | None:
+    """Shallow engines for two-pass triage mining (off unless STOCKFISH_TRIAGE_DEPTH is set)."""
+    global _TRIAGE_POOL
+    depth = int(os.getenv("STOCKFISH_TRIAGE_DEPTH", "0"))
+    if depth <= 0:
+        return None
+    pool = get_engine_pool()
+    if _TRIAGE_POOL is not None:
+        _TRIAGE_POOL.reconfigure(size=pool.size, threads=pool.threads, hash_mb=pool.hash_mb)
+    else:
+        _TRIAGE_POOL = EnginePool(
+            size=pool.size,
+            path=pool.path,
+            depth=depth,
+            threads=pool.threads,
+            hash_mb=pool.hash_mb,
+            timeout_s=pool.timeout_s,
+            retries=pool.retries,
+            interactive_reserve=0,  # triage only serves batch mining
+        )
+    return _TRIAGE_POOL
+
+
+def engine_health() -> dict:
+    """Supervision counters of the engines created so far (nothing is spawned here)."""
+    out = {}
+    if _ENGINE_RESOURCES is not None:
+        out["config"] = _ENGINE_RESOURCES.to_dict()
+    if _ENGINE_POOL is not None:
+        out["pool"] = {"size": _ENGINE_POOL.size, **_ENGINE_POOL.health.snapshot(), **_ENGINE_POOL.scheduler_stats()}
+    if _TRIAGE_POOL is not None:
+        out["triage"] = {"size": _TRIAGE_POOL.size, **_TRIAGE_POOL.health.snapshot(), **_TRIAGE_POOL.scheduler_stats()}
+    return out
+
+
+_EVAL_CACHE: SqliteEvalCache | None = None
+
+def get_eval_cache() -> SqliteEvalCache:
+    """Position eval cache shared by all users (defaults to the main DB file)."""
+    global _EVAL_CACHE
+    if _EVAL_CACHE is None:
+        _EVAL_CACHE = SqliteEvalCache(
+            db_path=os.getenv("CHESS_COACH_EVAL_CACHE_DB", os.getenv("CHESS_COACH_DB", "chess_coach.db")),
+            memory_size=int(os.getenv("EVAL_CACHE_MEMORY_SIZE", "50000")),
         )
-    return _ENGINE
+    return _EVAL_CACHE
+
+_TABLEBASE: SyzygyTablebase | None = None
+
+def get_tablebase() -> SyzygyTablebase | None:
+    """Local Syzygy tablebases (off unless SYZYGY_PATH points at the .rtbw/.rtbz files)."""
+    global _TABLEBASE
+    path = os.getenv("SYZYGY_PATH", "").strip()
+    if not path:
+        return None
+    if _TABLEBASE is None:
+        _TABLEBASE = SyzygyTablebase(path)
+    return _TABLEBASE
+
+
+_BOOK: PolyglotBook | None = None
+
+def get_opening_book() -> PolyglotBook | None:
+    """Polyglot opening book (off unless POLYGLOT_BOOK points at a .bin file)."""
+    global _BOOK
+    path = os.getenv("POLYGLOT_BOOK", "").strip()
+    if not path:
+        return None
+    if _BOOK is None:
+        _BOOK = PolyglotBook(path)
+    return _BOOK
+
 
 from chess_coach.application.ports.llm_port import LLMPort
 from chess_coach.infrastructure.llm.ollama_adapter import OllamaLLMAdapter
@@ -46,15 +181,20 @@ def get_llm() -> LLMPort | None:
         return _LLM
     return None
 
-from chess_coach.infrastructure.chesscom_client import ChessComClient
+from chess_coach.infrastructure.chesscom_client import ArchiveDiskCache, ChessComClient
 
 
 _CHESSCOM: ChessComClient | None = None
 
 def get_chesscom() -> ChessComClient:
+    """Chess.com client; monthly archives are cached under CHESSCOM_CACHE_DIR (empty = no cache)."""
     global _CHESSCOM
     if _CHESSCOM is None:
-        _CHESSCOM = ChessComClient()
+        cache_dir = os.getenv("CHESSCOM_CACHE_DIR", ".chesscom_cache").strip()
+        _CHESSCOM = ChessComClient(
+            max_workers=int(os.getenv("CHESSCOM_MAX_WORKERS", "4")),
+            cache=ArchiveDiskCache(cache_dir) if cache_dir else None,
+        )
     return _CHESSCOM
 
 def get_game_source(platform: str):
@@ -64,3 +204,30 @@ def get_game_source(platform: str):
     if p in ("chesscom", "chess.com", "chess"):
         return get_chesscom()
     return get_lichess()
+
+
+from chess_coach.infrastructure.job_queue import SqliteJobQueue
+
+
+_JOB_QUEUE: SqliteJobQueue | None = None
+
+def get_job_queue() -> SqliteJobQueue:
+    global _JOB_QUEUE
+    if _JOB_QUEUE is None:
+        _JOB_QUEUE = SqliteJobQueue(db_path=os.getenv("CHESS_COACH_DB", "chess_coach.db"))
+    return _JOB_QUEUE
+
+def build_job_runner():
+    """JobRunner wired with the bootstrap pipeline handlers (composition root)."""
+    from chess_coach.application.jobs import BootstrapJobs, JobRunner
+    from chess_coach.application.use_cases import MinePuzzlesUseCase
+
+    jobs = BootstrapJobs(
+        repo_factory=get_repo,
+        source_factory=get_game_source,
+        miner_factory=lambda repo: MinePuzzlesUseCase(
+            repo=repo, pool=get_engine_pool(), cache=get_eval_cache(), triage_pool=get_triage_pool(),
+            tablebase=get_tablebase(), book=get_opening_book(),
+        ),
+    )
+    return JobRunner(queue=get_job_queue(), handlers=jobs.handlers())
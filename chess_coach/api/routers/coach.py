@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+import base64
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from chess_coach.api.deps import get_repo, get_game_source, get_engine, get_llm
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from chess_coach.api.deps import (
+    get_repo, get_game_source, get_engine_pool, get_eval_cache, get_job_queue, get_llm,
+    get_opening_book, get_tablebase, get_triage_pool,
+)
 from chess_coach.api.schemas import BootstrapRequest, CheckinRequest
 from chess_coach.api.schemas_chat import ChatRequest
 from chess_coach.api.schemas_teacher import TodayPlanRequest
-from chess_coach.application.use_cases import ImportGamesUseCase
-from chess_coach.application.blunder_mining import find_blunders
+from chess_coach.application.use_cases import ImportGamesUseCase, MinePuzzlesUseCase
+from chess_coach.application.blunder_mining import MiningStats
+from chess_coach.application.deadline import Deadline
+from chess_coach.application.jobs import JOB_BOOTSTRAP
+from chess_coach.infrastructure.job_queue import JOB_QUEUED, JOB_RUNNING, Job
 from chess_coach.agents.coach_agent import CoachAgent
-from chess_coach.application.pattern_tagger import tag_from_position_and_pv
 
 router = APIRouter(tags=["coach"])
 
@@ -19,56 +29,140 @@ def checkin(req: CheckinRequest):
     repo.save_checkin(username=req.username, fatigue=req.fatigue, note=req.note)
     return {"ok": True, "fatigue": req.fatigue}
 
+def _puzzle_out(r) -> dict:
+    tags = (r.get("tags") or "").split(",") if r.get("tags") else []
+    area = "mate" if "mate" in tags else "tactics"
+    hint = "Checks primero. Busca MATE o ganancia forzada."
+    return {
+        "puzzle_id": r["id"],
+        "area": area,
+        "game_id": r["game_id"],
+        "ply": r["ply"],
+        "fen": r["fen_before"],
+        "hint": hint,
+        "pv_uci": (r.get("pv_uci") or "").split(),
+        "tags": tags,
+        "attempts": r["attempts"],
+        "solved": r["solved"],
+    }
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+# time kept back from mining for tagging and building the response
+MINING_RESERVE_MS = 300
+
+def _decode_continuation(token: str, username: str) -> Dict[str, Any]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid continuation token")
+    if not isinstance(data, dict) or data.get("u") != username:
+        raise HTTPException(status_code=400, detail="Continuation token belongs to another user")
+    job_id = data.get("job_id")
+    if not isinstance(job_id, int) or isinstance(job_id, bool) or job_id < 1:
+        raise HTTPException(status_code=400, detail="Invalid continuation token")
+    return data
+
+def _continuation_job(req: BootstrapRequest) -> Job:
+    """The background job a partial bootstrap handed its remaining work to."""
+    cont = _decode_continuation(req.continuation, req.username)
+    job = get_job_queue().get(cont["job_id"])
+    if job is None or job.username != req.username or job.kind != JOB_BOOTSTRAP:
+        raise HTTPException(status_code=400, detail="Continuation job not found")
+    return job
+
+def _handoff(
+    repo, req: BootstrapRequest, remaining: int, import_pending: bool = False,
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """If import or mining was cut short, queue the rest as a bootstrap job.
+
+    Returns (job, continuation token), or (None, None) when nothing is left.
+    """
+    if not import_pending and (
+        remaining <= 0 or not repo.list_unanalyzed_games(req.username, limit=req.mine_blunders_from_games)
+    ):
+        return None, None
+    payload: Dict[str, Any] = {"mine_blunders_from_games": req.mine_blunders_from_games, "max_new_puzzles": max(1, remaining)}
+    if import_pending:
+        payload.update(import_games=req.import_games, force_import=True)
+    job, _ = get_job_queue().enqueue(JOB_BOOTSTRAP, req.username, req.platform, payload)
+    data = {"u": req.username, "job_id": job.id}
+    token = base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode()).decode().rstrip("=")
+    return job.to_dict(), token
+
+def _remaining_work(
+    repo, req: BootstrapRequest, cont_job: Optional[Job], remaining: int, import_pending: bool, stop,
+) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool]:
+    """(job, continuation, partial) for the response.
+
+    `job` holds this bootstrap's remaining work (the continuation's job, or
+    a new hand-off when the budget ran out); `partial` while it is pending.
+    """
+    if cont_job is not None:
+        pending = cont_job.state in (JOB_QUEUED, JOB_RUNNING)
+        return cont_job.to_dict(), (req.continuation if pending else None), pending
+    if not stop():
+        return None, None, False
+    job, token = _handoff(repo, req, remaining, import_pending)
+    return job, token, job is not None
+
+def _mine_use_case(repo) -> MinePuzzlesUseCase:
+    return MinePuzzlesUseCase(
+        repo=repo, pool=get_engine_pool(), cache=get_eval_cache(), triage_pool=get_triage_pool(),
+        tablebase=get_tablebase(), book=get_opening_book(),
+    )
+
 @router.post("/coach/bootstrap")
 def bootstrap(req: BootstrapRequest):
+    """Import -> mine -> tag. With `budget_ms`, mining stops when the budget is
+    spent (most recent games first) and the rest is queued as a background
+    job: the response is then `partial` and carries a `continuation` token.
+
+    This stays inline (unlike POST /jobs) because the caller needs today's
+    puzzles in the response; `budget_ms` bounds the wait and the queue gets
+    whatever does not fit in it. A request with `continuation` does no
+    import or mining itself: it reports the handed-off job (still `partial`
+    while that job is queued or running) with the puzzles saved so far.
+    """
+    deadline = Deadline(req.budget_ms)
+    cont_job = _continuation_job(req) if req.continuation else None
+
     repo = get_repo()
     source = get_game_source(req.platform)
-    engine = get_engine()
     agent = CoachAgent()
 
     fatigue = agent.infer_fatigue(repo, req.username, req.fatigue)
+    stop = lambda: deadline.expired(reserve_ms=MINING_RESERVE_MS)
 
     imported = 0
-    if repo.count_games(req.username) == 0:
-        ImportGamesUseCase(source=source, repo=repo).execute(username=req.username, limit=req.import_games)
-        imported = req.import_games
+    import_pending = False
+    if repo.count_games(req.username) == 0 and cont_job is None:
+        imported = ImportGamesUseCase(source=source, repo=repo).execute_streaming(
+            username=req.username, limit=req.import_games, stop=stop,
+        )
+        import_pending = stop() and imported < req.import_games
 
     mined = 0
-    if repo.count_puzzles(req.username) < req.daily_limit:
-        games = repo.list_recent_games(req.username, limit=req.mine_blunders_from_games)
-        blunders = find_blunders(games, engine, max_blunders=req.max_new_puzzles)
-        tuples = []
-        for b in blunders:
-            tags = tag_from_position_and_pv(b.fen_before, b.pv_uci)
-            tuples.append((
-                b.game_id, b.ply, b.fen_before, b.move_uci, b.best_move_uci,
-                " ".join(b.pv_uci), ",".join([t.value for t in tags]), b.swing_cp
-            ))
-        repo.save_puzzles(username=req.username, platform="lichess", puzzles=tuples)
-        mined = len(tuples)
-
-    tagged = agent.tag_puzzles_if_missing(repo, req.username, limit=200)
+    mining_stats = MiningStats()
+    # only games never mined before: repeated bootstraps cost ~no engine time
+    games = repo.list_unanalyzed_games(req.username, limit=req.mine_blunders_from_games) if cont_job is None else []
+    if games and not stop():
+        mined = _mine_use_case(repo).execute(
+            username=req.username, platform=req.platform, games=games,
+            max_new=req.max_new_puzzles, stats=mining_stats, stop=stop,
+        )
+
+    job, continuation, partial = _remaining_work(
+        repo, req, cont_job, req.max_new_puzzles - mined, import_pending, stop,
+    )
+    tagged = agent.tag_puzzles_if_missing(repo, req.username, limit=200) if not deadline.expired() else 0
 
     rows = repo.list_puzzles_for_session(req.username, limit=req.daily_limit, fatigue=fatigue)
-    puzzles = []
-    for r in rows:
-        tags = (r.get("tags") or "").split(",") if r.get("tags") else []
-        area = "mate" if "mate" in tags else "tactics"
-        hint = "Checks primero. Busca MATE o ganancia forzada."
-        puzzles.append({
-            "puzzle_id": r["id"],
-            "area": area,
-            "game_id": r["game_id"],
-            "ply": r["ply"],
-            "fen": r["fen_before"],
-            "hint": hint,
-            "pv_uci": (r.get("pv_uci") or "").split(),
-            "tags": tags,
-            "attempts": r["attempts"],
-            "solved": r["solved"],
-        })
+    puzzles = [_puzzle_out(r) for r in rows]
 
-    decision = {"fatigue": fatigue, "imported": imported, "mined": mined, "tagged_existing": tagged, "session_limit": req.daily_limit}
+    decision = {"fatigue": fatigue, "imported": imported, "mined": mined, "tagged_existing": tagged, "session_limit": req.daily_limit, "mining": mining_stats.to_dict(),
+                "budget_ms": req.budget_ms, "elapsed_ms": deadline.elapsed_ms(), "partial": partial}
     repo.trace(req.username, "bootstrap", fatigue, decision)
 
     return {
@@ -77,8 +171,86 @@ def bootstrap(req: BootstrapRequest):
         "puzzles": puzzles,
         "counts": {"games": repo.count_games(req.username), "puzzles": repo.count_puzzles(req.username)},
         "decision": decision,
+        "partial": partial,
+        "continuation": continuation,
+        "job": job,
     }
 
+@router.post("/coach/bootstrap/stream")
+def bootstrap_stream(req: BootstrapRequest):
+    """Bootstrap as Server-Sent Events.
+
+    Events: `progress` (stage updates), `puzzle` (each new puzzle as soon as it
+    is mined and saved) and a final `done` with the same payload as /coach/bootstrap.
+    """
+    deadline = Deadline(req.budget_ms)
+    cont_job = _continuation_job(req) if req.continuation else None
+
+    def events() -> Iterator[str]:
+        repo = get_repo()
+        source = get_game_source(req.platform)
+        agent = CoachAgent()
+
+        fatigue = agent.infer_fatigue(repo, req.username, req.fatigue)
+        stop = lambda: deadline.expired(reserve_ms=MINING_RESERVE_MS)
+
+        imported = 0
+        import_pending = False
+        if repo.count_games(req.username) == 0 and cont_job is None:
+            yield _sse("progress", {"stage": "import", "status": "started"})
+            imported = ImportGamesUseCase(source=source, repo=repo).execute_streaming(
+                username=req.username, limit=req.import_games, stop=stop,
+            )
+            import_pending = stop() and imported < req.import_games
+        yield _sse("progress", {"stage": "import", "status": "done", "games": repo.count_games(req.username)})
+
+        mined = 0
+        mining_stats = MiningStats()
+        games = repo.list_unanalyzed_games(req.username, limit=req.mine_blunders_from_games) if cont_job is None else []
+        if games and not stop():
+            yield _sse("progress", {"stage": "mining", "status": "started", "games_total": len(games)})
+            done_games: List[str] = []
+            for puzzle_id, _ in _mine_use_case(repo).iter_execute(
+                username=req.username, platform=req.platform, games=games,
+                max_new=req.max_new_puzzles, stats=mining_stats,
+                on_game_done=lambda res: done_games.append(res.game_id), stop=stop,
+            ):
+                mined += 1
+                row = repo.get_puzzle_by_id(puzzle_id)
+                if row:
+                    yield _sse("puzzle", _puzzle_out(row))
+                yield _sse("progress", {"stage": "mining", "games_done": len(done_games), "games_total": len(games), "mined": mined})
+            yield _sse("progress", {"stage": "mining", "status": "done", **mining_stats.to_dict()})
+
+        job, continuation, partial = _remaining_work(
+            repo, req, cont_job, req.max_new_puzzles - mined, import_pending, stop,
+        )
+        if partial:
+            yield _sse("progress", {"stage": "handoff", "job": job})
+        tagged = agent.tag_puzzles_if_missing(repo, req.username, limit=200) if not deadline.expired() else 0
+
+        rows = repo.list_puzzles_for_session(req.username, limit=req.daily_limit, fatigue=fatigue)
+        decision = {"fatigue": fatigue, "imported": imported, "mined": mined, "tagged_existing": tagged, "session_limit": req.daily_limit, "mining": mining_stats.to_dict(),
+                    "budget_ms": req.budget_ms, "elapsed_ms": deadline.elapsed_ms(), "partial": partial}
+        repo.trace(req.username, "bootstrap", fatigue, decision)
+
+        yield _sse("done", {
+            "username": req.username,
+            "fatigue": fatigue,
+            "puzzles": [_puzzle_out(r) for r in rows],
+            "counts": {"games": repo.count_games(req.username), "puzzles": repo.count_puzzles(req.username)},
+            "decision": decision,
+            "partial": partial,
+            "continuation": continuation,
+            "job": job,
+        })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.post("/coach/today")
 def today(req: TodayPlanRequest):
     repo = get_repo()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException
+
+from chess_coach.api.deps import get_job_queue
+from chess_coach.api.schemas import JobRequest
+from chess_coach.application.jobs import JOB_KINDS
+
+router = APIRouter(tags=["jobs"])
+
+@router.post("/jobs")
+def enqueue_job(req: JobRequest):
+    if req.kind not in JOB_KINDS:
+        raise HTTPException(status_code=422, detail=f"Unknown job kind '{req.kind}'")
+    payload = {
+        "import_games": req.import_games,
+        "mine_blunders_from_games": req.mine_blunders_from_games,
+        "max_new_puzzles": req.max_new_puzzles,
+    }
+    job, created = get_job_queue().enqueue(
+        kind=req.kind, username=req.username, platform=req.platform, payload=payload, max_attempts=req.max_attempts,
+    )
+    return {**job.to_dict(), "deduplicated": not created}
+
+@router.get("/jobs/{job_id}")
+def job_status(job_id: int):
+    job = get_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@router.get("/jobs")
+def list_jobs(username: str, limit: int = 20):
+    return {"items": [j.to_dict() for j in get_job_queue().list_jobs(username=username, limit=limit)]}
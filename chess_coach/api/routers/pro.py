@@ -1,8 +1,10 @@
 from __future__ import annotations
 import json
 from datetime import date
+from typing import Optional
 from fastapi import APIRouter
 from chess_coach.api.deps import get_repo
+from chess_coach.application.accuracy_analytics import build_accuracy_report
 from chess_coach.application.pro_diagnostics_engine import build_pro_diagnostics
 from chess_coach.application.weekly_curriculum import build_weekly_curriculum, curriculum_to_dict
 
@@ -13,6 +15,20 @@ def pro_diagnostics(username: str):
     repo = get_repo()
     return build_pro_diagnostics(repo, username)
 
+@router.get("/pro/accuracy")
+def accuracy(username: str, limit_games: int = 5000):
+    repo = get_repo()
+    return build_accuracy_report(repo, username, limit_games=limit_games)
+
+@router.get("/pro/moments")
+def moments(username: str, kind: Optional[str] = None, limit: int = 50):
+    """Missed punishments, only-moves and conversion failures found while mining."""
+    repo = get_repo()
+    items = repo.list_moments(username=username, kind=kind, limit=limit)
+    for it in items:
+        it["pv_uci"] = (it.get("pv_uci") or "").split()
+    return {"items": items}
+
 @router.get("/pro/curriculum/weekly")
 def weekly_curriculum(username: str):
     repo = get_repo()
@@ -1,5 +1,6 @@
+import chess
 from fastapi import APIRouter, HTTPException
-from chess_coach.api.deps import get_repo
+from chess_coach.api.deps import get_repo, get_tablebase
 from chess_coach.api.schemas import AttemptRequest, AttemptResponse
 
 router = APIRouter(tags=["puzzles"])
@@ -26,6 +27,22 @@ def list_puzzles(username: str, limit: int = 50):
         })
     return {"items": items}
 
+def _tablebase_keeps_result(fen: str, line: list, move_uci: str) -> bool:
+    """True if `move_uci` (after playing `line` from `fen`) keeps the tablebase WDL."""
+    tb = get_tablebase()
+    if tb is None:
+        return False
+    try:
+        board = chess.Board(fen)
+        for uci in line:
+            board.push_uci(uci)
+        move = chess.Move.from_uci(move_uci)
+    except ValueError:
+        return False
+    if move not in board.legal_moves:
+        return False
+    return bool(tb.preserves_result(board, move))
+
 @router.post("/puzzles/{puzzle_id}/attempt", response_model=AttemptResponse)
 def attempt(puzzle_id: int, req: AttemptRequest):
     repo = get_repo()
@@ -54,6 +71,17 @@ def attempt(puzzle_id: int, req: AttemptRequest):
             expected=(None if done else pv[step + 1]),
         )
 
+    keeps = _tablebase_keeps_result(row["fen_before"], pv[:step], move)
+    if keeps:
+        # another move with the same exact result: the line diverges, so the puzzle ends here
+        repo.record_attempt(puzzle_id=puzzle_id, solved=True)
+        return AttemptResponse(
+            correct=True,
+            done=True,
+            message=f"✅ Correcto (tablebase): mantiene el resultado. La línea principal era {pv[step]}.",
+            expected=None,
+        )
+
     repo.record_attempt(puzzle_id=puzzle_id, solved=False)
     return AttemptResponse(
         correct=False,
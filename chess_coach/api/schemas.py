@@ -11,6 +11,8 @@ class BootstrapRequest(BaseModel):
     mine_blunders_from_games: int = Field(30, ge=1, le=200)
     max_new_puzzles: int = Field(30, ge=1, le=200)
     daily_limit: int = Field(10, ge=1, le=50)
+    budget_ms: Optional[int] = Field(None, ge=500, le=600000, description="latency budget; unfinished work goes to a background job")
+    continuation: Optional[str] = Field(None, description="token from a previous partial bootstrap")
 
 class CheckinRequest(BaseModel):
     username: str
@@ -35,3 +37,12 @@ class AttemptResponse(BaseModel):
     done: bool
     message: str
     expected: Optional[str]
+
+class JobRequest(BaseModel):
+    kind: str = Field('bootstrap', description='import | mine | tag | bootstrap | sync')
+    platform: str = Field('lichess', description='lichess | chesscom')
+    username: str = Field(..., min_length=2)
+    import_games: int = Field(50, ge=1, le=200)
+    mine_blunders_from_games: int = Field(30, ge=1, le=200)
+    max_new_puzzles: int = Field(30, ge=1, le=200)
+    max_attempts: int = Field(3, ge=1, le=10)
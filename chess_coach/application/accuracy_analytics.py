@@ -0,0 +1,135 @@
+from __future__ import annotations
+from typing import Any, Dict, List
+
+import numpy as np
+
+from chess_coach.application.pro_diagnostics_engine import ENDGAME_MIN_MOVE, OPENING_MAX_MOVE
+from chess_coach.domain.eval_curve import HEADER_SIZE, MISSING, EvalCurve
+
+CP_CAP = 1000  # evals beyond +-10 pawns (and mates) count as +-10 pawns, as lichess does
+
+# drop in win% (0-100) of the mover
+INACCURACY_DROP = 5.0
+MISTAKE_DROP = 10.0
+BLUNDER_DROP = 15.0
+
+PHASES = ("opening", "middlegame", "endgame")
+
+
+def win_percent(cp: np.ndarray) -> np.ndarray:
+    """Lichess win% model (side to move's point of view)."""
+    return 50.0 + 50.0 * (2.0 / (1.0 + np.exp(-0.00368208 * cp)) - 1.0)
+
+
+def move_accuracy(drop: np.ndarray) -> np.ndarray:
+    """Lichess per-move accuracy from the mover's win% drop."""
+    return np.clip(103.1668 * np.exp(-0.04354 * drop) - 3.1669, 0.0, 100.0)
+
+
+def _mean(total: float, n: int) -> float:
+    return round(float(total) / n, 1) if n else 0.0
+
+
+def build_accuracy_report(repo, username: str, limit_games: int = 5000, per_game_limit: int = 50) -> Dict[str, Any]:
+    """ACPL, accuracy, per-phase loss and error counts of the user's moves.
+
+    Works on the stored eval curves only (no engine, no PGN): every curve is
+    viewed in place with np.frombuffer, concatenated once, and all games are
+    scored in a single vectorised pass.
+    """
+    rows = repo.list_eval_curves(username, limit=limit_games)
+    u = username.lower()
+
+    curves: List[np.ndarray] = []
+    games: List[Dict[str, Any]] = []
+    for r in rows:
+        user_white = (r.get("white") or "").lower() == u
+        if not user_white and (r.get("black") or "").lower() != u:
+            continue
+        n, black_first = EvalCurve.read_header(r["curve"])
+        if n < 2:
+            continue
+        curves.append(np.frombuffer(r["curve"], dtype="<i2", count=n, offset=HEADER_SIZE))
+        games.append({
+            "game_id": r["game_id"],
+            "played_at": r.get("played_at"),
+            "opening": r.get("opening"),
+            "color": "white" if user_white else "black",
+            "user_white": user_white,
+            "black_first": black_first,
+        })
+
+    empty_phases = {p: {"moves": 0, "acpl": 0.0} for p in PHASES}
+    if not curves:
+        return {
+            "username": username, "games": 0, "moves": 0, "acpl": 0.0, "accuracy": 0.0,
+            "phases": empty_phases, "counts": {"inaccuracy": 0, "mistake": 0, "blunder": 0}, "per_game": [],
+        }
+
+    cp = np.concatenate(curves).astype(np.int32)
+    lengths = np.fromiter((len(c) for c in curves), dtype=np.int64, count=len(curves))
+    starts = np.cumsum(lengths) - lengths
+    n_games = len(curves)
+
+    # one entry per move: position i -> i+1 inside the same game
+    game = np.repeat(np.arange(n_games), lengths - 1)
+    is_last = np.zeros(cp.size, dtype=bool)
+    is_last[starts + lengths - 1] = True
+    pos = np.flatnonzero(~is_last)
+    ply0 = pos - starts[game]  # index of the position before the move
+
+    user_white = np.fromiter((g["user_white"] for g in games), dtype=bool, count=n_games)
+    black_first = np.fromiter((g["black_first"] for g in games), dtype=bool, count=n_games)
+    white_moves = (ply0 % 2 == 0) != black_first[game]
+
+    before, after = cp[pos], cp[pos + 1]
+    mask = (white_moves == user_white[game]) & (before != MISSING) & (after != MISSING)
+
+    sign = np.where(white_moves[mask], 1, -1)
+    b = np.clip(before[mask], -CP_CAP, CP_CAP) * sign
+    a = np.clip(after[mask], -CP_CAP, CP_CAP) * sign
+    g_idx = game[mask]
+    loss = np.maximum(0, b - a).astype(np.float64)
+    drop = np.maximum(0.0, win_percent(b) - win_percent(a))
+    acc = move_accuracy(drop)
+
+    moves_per_game = np.bincount(g_idx, minlength=n_games)
+    loss_per_game = np.bincount(g_idx, weights=loss, minlength=n_games)
+    acc_per_game = np.bincount(g_idx, weights=acc, minlength=n_games)
+
+    move_no = ply0[mask] // 2 + 1
+    phase = np.where(move_no <= OPENING_MAX_MOVE, 0, np.where(move_no >= ENDGAME_MIN_MOVE, 2, 1))
+    phase_moves = np.bincount(phase, minlength=3)
+    phase_loss = np.bincount(phase, weights=loss, minlength=3)
+
+    per_game = []
+    for i in range(min(per_game_limit, n_games)):  # rows come most recent first
+        g = games[i]
+        per_game.append({
+            "game_id": g["game_id"],
+            "played_at": g["played_at"],
+            "opening": g["opening"],
+            "color": g["color"],
+            "moves": int(moves_per_game[i]),
+            "acpl": _mean(loss_per_game[i], int(moves_per_game[i])),
+            "accuracy": _mean(acc_per_game[i], int(moves_per_game[i])),
+        })
+
+    n_moves = int(loss.size)
+    return {
+        "username": username,
+        "games": n_games,
+        "moves": n_moves,
+        "acpl": _mean(loss.sum(), n_moves),
+        "accuracy": _mean(acc.sum(), n_moves),
+        "phases": {
+            p: {"moves": int(phase_moves[i]), "acpl": _mean(phase_loss[i], int(phase_moves[i]))}
+            for i, p in enumerate(PHASES)
+        },
+        "counts": {
+            "inaccuracy": int(np.count_nonzero((drop >= INACCURACY_DROP) & (drop < MISTAKE_DROP))),
+            "mistake": int(np.count_nonzero((drop >= MISTAKE_DROP) & (drop < BLUNDER_DROP))),
+            "blunder": int(np.count_nonzero(drop >= BLUNDER_DROP)),
+        },
+        "per_game": per_game,
+    }
@@ -1,13 +1,38 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
 import io
 
 import chess
 import chess.pgn
 
-from chess_coach.domain.models import Game
-from chess_coach.infrastructure.stockfish_engine import StockfishEngine
+from chess_coach.application.detectors import Detector, Moment, PlyContext
+from chess_coach.application.eval_pipeline import (
+    BestMoveSource,
+    CountingEngine,
+    DedupEngine,
+    EmbeddedEvalSource,
+    MainlineEvaluator,
+    PlyEval,
+    TranspositionTable,
+    is_score_only,
+    swing_cp,
+)
+from chess_coach.domain.eval_curve import EvalCurve
+from chess_coach.domain.models import Game, PositionEval
+from chess_coach.infrastructure.engine_pool import BATCH, EnginePool
+from chess_coach.infrastructure.eval_cache import CachedEngine, SqliteEvalCache
+from chess_coach.infrastructure.opening_book import PolyglotBook
+from chess_coach.infrastructure.tablebase import SyzygyTablebase
+
+if TYPE_CHECKING:  # annotations only: any engine with `analyze` works
+    from chess_coach.infrastructure.stockfish_engine import StockfishEngine
+
+BLUNDER_SWING_CP = 250
+TRIAGE_SWING_CP = 120
+MATE_HORIZON = 5
 
 
 @dataclass(frozen=True)
@@ -22,64 +47,515 @@ class Blunder:
     is_mate: bool
 
 
-def _eval_to_int(cp: Optional[int], mate: Optional[int]) -> int:
-    if mate is not None:
-        return 100000 if mate > 0 else -100000
-    return cp or 0
+@dataclass
+class GameMiningResult:
+    game_id: str
+    blunders: List[Blunder] = field(default_factory=list)
+    plies: int = 0
+    engine_calls: int = 0
+    cache_hits: int = 0
+    deep_calls: int = 0
+    deep_searches_saved: int = 0
+    resumed_plies: int = 0
+    source_evals: Dict[str, int] = field(default_factory=dict)
+    book_plies: Optional[int] = None  # leading book moves (None: no opening book configured)
+    positions: int = 0  # searches requested through the batch transposition table
+    dedup_hits: int = 0  # ... answered by a search done for another game/ply
+    moments: List[Moment] = field(default_factory=list)  # from the detectors (not limited)
+    multipv_calls: int = 0
+    eval_curve: Optional[bytes] = None  # EvalCurve blob of the whole game (complete games only)
+    complete: bool = False  # every ply was examined (not cut short by the blunder limit)
 
 
-def find_blunders(games: List[Game], engine: StockfishEngine, max_blunders: int = 20) -> List[Blunder]:
-    blunders: List[Blunder] = []
+@dataclass
+class MiningStats:
+    """Engine usage of a mining run (filled in by find_blunders*)."""
+    games: int = 0
+    plies: int = 0
+    engine_calls: int = 0
+    cache_hits: int = 0
+    deep_calls: int = 0
+    deep_searches_saved: int = 0
+    resumed_plies: int = 0
+    source_evals: Dict[str, int] = field(default_factory=dict)
+    book_plies: int = 0
+    positions: int = 0
+    dedup_hits: int = 0
+    moments: Dict[str, int] = field(default_factory=dict)
+    multipv_calls: int = 0
+    engine_calls_by_game: Dict[str, int] = field(default_factory=dict)
 
-    for g in games:
-        game = chess.pgn.read_game(io.StringIO(g.pgn))
-        if not game:
-            continue
-
-        board = game.board()
-        ply = 0
-
-        for move in game.mainline_moves():
-            ply += 1
-            fen_before = board.fen()
-
-            before = engine.analyze(board)
-            before_score_mover = _eval_to_int(before.cp, before.mate)
-            pv = before.pv_uci
-            best = before.best_move_uci
-            played_uci = move.uci()
-
-            # push played
-            board.push(move)
-
-            # if played best, skip
-            if best and played_uci == best:
-                continue
-
-            after = engine.analyze(board)
-            after_score_side_to_move = _eval_to_int(after.cp, after.mate)
-            after_score_mover = -after_score_side_to_move
-
-            swing = before_score_mover - after_score_mover
-
-            is_mate = before.mate is not None and abs(before.mate) <= 5
-
-            # threshold: either large swing or mate patterns
-            if best and (swing >= 250 or is_mate):
-                blunders.append(
-                    Blunder(
-                        game_id=g.game_id,
-                        ply=ply,
-                        fen_before=fen_before,
-                        move_uci=played_uci,
-                        best_move_uci=best,
-                        pv_uci=pv[:8],  # keep it short for training
-                        swing_cp=int(swing),
-                        is_mate=is_mate,
-                    )
-                )
-
-            if len(blunders) >= max_blunders:
-                return sorted(blunders, key=lambda b: (b.is_mate, b.swing_cp), reverse=True)
+    def record(self, res: GameMiningResult) -> None:
+        self.games += 1
+        self.plies += res.plies
+        self.engine_calls += res.engine_calls
+        self.cache_hits += res.cache_hits
+        self.deep_calls += res.deep_calls
+        self.deep_searches_saved += res.deep_searches_saved
+        self.resumed_plies += res.resumed_plies
+        self.book_plies += res.book_plies or 0
+        self.positions += res.positions
+        self.dedup_hits += res.dedup_hits
+        self.multipv_calls += res.multipv_calls
+        for m in res.moments:
+            self.moments[m.kind] = self.moments.get(m.kind, 0) + 1
+        for name, n in res.source_evals.items():
+            self.source_evals[name] = self.source_evals.get(name, 0) + n
+        self.engine_calls_by_game[res.game_id] = res.engine_calls
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "games": self.games,
+            "plies": self.plies,
+            "engine_calls": self.engine_calls,
+            "cache_hits": self.cache_hits,
+            "deep_calls": self.deep_calls,
+            "deep_searches_saved": self.deep_searches_saved,
+            "resumed_plies": self.resumed_plies,
+            "source_evals": dict(self.source_evals),
+            "book_plies": self.book_plies,
+            "positions": self.positions,
+            "dedup_hits": self.dedup_hits,
+            "dedup_ratio": round(self.dedup_hits / self.positions, 3) if self.positions else 0.0,
+            "moments": dict(self.moments),
+            "multipv_calls": self.multipv_calls,
+        }
+
+
+class MiningCheckpoints:
+    """Per-game checkpoint store for mining, bound to one engine setting.
+
+    Backed by the repository's mining_checkpoints table; evals are kept as
+    [cp, mate, best_uci, pv_uci, score_only] rows (one per position, index = ply;
+    null for book positions that were never analysed). `mined_ply` is the
+    last ply whose blunder was saved as a puzzle. Both the mark and the
+    clearing of a finished game belong to whoever saves the puzzles.
+    """
 
+    def __init__(self, repo, engine_settings: str, every: int = 10) -> None:
+        self.repo = repo
+        self.engine_settings = engine_settings
+        self.every = max(1, int(every))
+
+    def load(self, g: Game) -> Tuple[Optional[List[PositionEval]], int]:
+        """(evals, mined_ply) of the game's checkpoint ((None, 0) without one)."""
+        cp = self.repo.load_mining_checkpoint(g.platform, g.game_id, self.engine_settings)
+        if not cp:
+            return None, 0
+        evals = [
+            PositionEval(
+                cp=e[0], mate=e[1], best_move_uci=e[2], pv_uci=list(e[3] or []),
+                score_only=bool(e[4]) if len(e) > 4 else False,
+            ) if e is not None else None
+            for e in cp["evals"]
+        ]
+        return evals, int(cp.get("mined_ply") or 0)
+
+    def save(self, g: Game, evals: List[Any]) -> None:
+        rows = [
+            [e.cp, e.mate, e.best_move_uci, list(e.pv_uci or []), is_score_only(e)] if e is not None else None
+            for e in evals
+        ]
+        self.repo.save_mining_checkpoint(g.platform, g.game_id, self.engine_settings, len(rows), rows)
+
+    def clear(self, g: Game) -> None:
+        self.repo.clear_mining_checkpoint(g.platform, g.game_id, self.engine_settings)
+
+    def mark_mined(self, g: Game, ply: int) -> None:
+        """The game's blunders up to `ply` are saved: a resumed run skips them."""
+        self.repo.set_mining_checkpoint_mined_ply(g.platform, g.game_id, self.engine_settings, ply)
+
+
+def _sort_blunders(blunders: List[Blunder]) -> List[Blunder]:
     return sorted(blunders, key=lambda b: (b.is_mate, b.swing_cp), reverse=True)
+
+
+def _is_mate_pattern(before) -> bool:
+    return before.mate is not None and abs(before.mate) <= MATE_HORIZON
+
+
+def _blunder_at(g: Game, pe: PlyEval, before, after) -> Optional[Blunder]:
+    """Apply the blunder rule to one ply given its (full-depth) evaluations."""
+    best = before.best_move_uci
+    played_uci = pe.move.uci()
+
+    # if played best, skip
+    if not best or played_uci == best:
+        return None
+
+    swing = swing_cp(before, after)
+    is_mate = _is_mate_pattern(before)
+
+    # threshold: either large swing or mate patterns
+    if swing < BLUNDER_SWING_CP and not is_mate:
+        return None
+
+    return Blunder(
+        game_id=g.game_id,
+        ply=pe.ply,
+        fen_before=pe.fen_before,
+        move_uci=played_uci,
+        best_move_uci=best,
+        pv_uci=list(before.pv_uci)[:8],  # keep it short for training
+        swing_cp=int(swing),
+        is_mate=is_mate,
+    )
+
+
+def _is_triage_candidate(pe: PlyEval) -> bool:
+    """Cheap pre-filter on shallow evals; deliberately looser than the blunder rule."""
+    if pe.before.best_move_uci and pe.move.uci() == pe.before.best_move_uci:
+        return False
+    return swing_cp(pe.before, pe.after) >= TRIAGE_SWING_CP or _is_mate_pattern(pe.before)
+
+
+def _user_color(g: Game, username: Optional[str]) -> Optional[chess.Color]:
+    """Colour `username` played in `g`, or None (unknown user: mine both sides)."""
+    u = (username or "").strip().lower()
+    if not u:
+        return None
+    if (g.white or "").lower() == u:
+        return chess.WHITE
+    if (g.black or "").lower() == u:
+        return chess.BLACK
+    return None
+
+
+def _counted(engine, cache: Optional[SqliteEvalCache]):
+    return CachedEngine(engine, cache) if cache is not None else CountingEngine(engine)
+
+
+def _iter_game(
+    g: Game,
+    engine: StockfishEngine,
+    result: GameMiningResult,
+    limit: int,
+    cache: Optional[SqliteEvalCache] = None,
+    checkpoints: Optional[MiningCheckpoints] = None,
+    triage_engine: Optional[StockfishEngine] = None,
+    tablebase: Optional[SyzygyTablebase] = None,
+    book: Optional[PolyglotBook] = None,
+    table: Optional[TranspositionTable] = None,
+    username: Optional[str] = None,
+    detectors: Optional[List[Detector]] = None,
+    stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[Blunder]:
+    """Mine one game, yielding blunders as found and filling `result`.
+
+    Stops once `limit` blunders were found. With `triage_engine`, every ply
+    is scanned with the cheap engine and only candidates are re-searched at
+    full depth (two-pass triage). `[%eval]` comments embedded in the PGN
+    play the same role as the triage scan, so annotated games only need
+    engine searches on candidate plies. With `checkpoints`, mainline evals are
+    persisted as the game progresses and a later run replays them instead
+    of searching again; blunders at or before the checkpoint's `mined_ply`
+    were saved by an earlier run and are neither yielded nor counted. The
+    checkpoint outlives the game: whoever saves its results clears it.
+    With `tablebase`, positions it covers get exact evals and never reach
+    the engine. With `book`, the leading book moves are neither searched
+    nor mined, and `result.book_plies` records where the game left book.
+    `table` is the batch transposition table shared with the other games.
+    With `username`, only that player's moves are mined: positions with the
+    opponent to move are only needed as "after" evals, so when the user
+    played the best move the score is taken from the previous PV instead.
+    `detectors` (which need `username`) run on the same eval stream and
+    add their Moments to `result.moments`. `stop()` is checked after every
+    ply; when it returns True the game is left incomplete.
+    """
+    game = chess.pgn.read_game(io.StringIO(g.pgn))
+    if not game:
+        result.complete = True
+        return
+
+    deep = _counted(engine, cache)
+    scan = _counted(triage_engine, cache) if triage_engine is not None else deep
+    # searches go through the batch table; the counted wrappers only see the ones it dispatches
+    deep_tt = DedupEngine(deep, table) if table is not None else deep
+    scan_tt = deep_tt if scan is deep else (DedupEngine(scan, table) if table is not None else scan)
+    deep_evals: Dict[str, Any] = {}
+    resume, mined_ply = checkpoints.load(g) if checkpoints is not None else (None, 0)
+    saved_upto = len(resume or [])
+    embedded = EmbeddedEvalSource.from_game(game)
+    sources = [src for src in (tablebase, embedded if len(embedded) else None) if src is not None]
+    tb_verified = 0
+
+    def _deep(board: chess.Board):
+        nonlocal tb_verified
+        key = board.fen()
+        if key not in deep_evals:
+            exact = tablebase.evaluate(board) if tablebase is not None else None
+            if exact is not None:
+                tb_verified += 1
+            deep_evals[key] = exact if exact is not None else deep_tt.analyze(board)
+        return deep_evals[key]
+
+    if book is not None:
+        result.book_plies = book.book_plies(game)
+
+    evaluator = MainlineEvaluator(scan_tt, resume_evals=resume, sources=sources)
+    user = _user_color(g, username)
+    if user is not None:
+        evaluator.sources.insert(0, BestMoveSource(evaluator.evals, wanted=lambda b: b.turn != user))
+    first_mover = game.board().turn
+    detectors = list(detectors or []) if user is not None else []
+    history: List[PlyEval] = []
+    raw_multipv = getattr(engine, "analyze_multipv", None)
+
+    def _multipv(board: chess.Board, n: int):
+        result.multipv_calls += 1
+        return raw_multipv(board, n)
+
+    multipv = _multipv if raw_multipv is not None else None
+
+    try:
+        for pe in evaluator.iter_plies(game, skip_plies=result.book_plies or 0):
+            result.plies = pe.ply
+            if checkpoints is not None and len(evaluator.evals) - saved_upto >= checkpoints.every:
+                checkpoints.save(g, evaluator.evals)
+                saved_upto = len(evaluator.evals)
+
+            mover = first_mover if pe.ply % 2 else not first_mover
+            if user is not None and mover != user:
+                blunder = None  # opponent's move: its evals only keep the chain going
+            elif scan is deep and not is_score_only(pe.before) and not is_score_only(pe.after):
+                blunder = _blunder_at(g, pe, pe.before, pe.after)
+            elif _is_triage_candidate(pe):
+                # cheap evals (shallow engine or PGN annotations): confirm at full depth
+                board = chess.Board(pe.fen_before)
+                before = _deep(board)
+                board.push(pe.move)
+                blunder = _blunder_at(g, pe, before, _deep(board))
+            else:
+                blunder = None
+
+            if blunder is not None and pe.ply <= mined_ply:
+                blunder = None  # already a puzzle: must not use up this run's limit
+
+            if detectors:
+                ctx = PlyContext(game=g, user=user, mover=mover, pe=pe, history=history, multipv=multipv)
+                result.moments.extend(m for m in (d.on_ply(ctx) for d in detectors) if m is not None)
+                history.append(pe)
+
+            if blunder is not None:
+                result.blunders.append(blunder)
+                yield blunder
+            if len(result.blunders) >= limit:
+                break
+            if stop is not None and stop():
+                break  # out of time: the checkpoint keeps the work done so far
+        else:
+            result.complete = True
+            result.eval_curve = EvalCurve.from_evals(evaluator.evals, black_first=not first_mover).encode()
+            for d in detectors:
+                result.moments.extend(d.on_game_end(g, user, history))
+    finally:
+        if cache is not None:
+            cache.flush()
+        if checkpoints is not None and len(evaluator.evals) > saved_upto:
+            # keep what we paid for, even for a finished game: its results may still be
+            # dropped by the batch limit, so only the consumer clears the checkpoint
+            checkpoints.save(g, evaluator.evals)
+
+        result.resumed_plies = max(0, evaluator.reused - 1)
+        result.source_evals = dict(evaluator.by_source)
+        if tb_verified:
+            result.source_evals[tablebase.name] = result.source_evals.get(tablebase.name, 0) + tb_verified
+
+        wrappers = [deep] if scan is deep else [deep, scan]
+        result.cache_hits = sum(w.hits for w in wrappers)
+        result.engine_calls = sum(w.misses for w in wrappers)
+        result.deep_calls = deep.hits + deep.misses
+        if table is not None:
+            shared = [deep_tt] if scan_tt is deep_tt else [deep_tt, scan_tt]
+            result.dedup_hits = sum(w.hits for w in shared)
+            result.positions = sum(w.hits + w.misses for w in shared)
+        if result.plies or result.book_plies:
+            # a single full-depth pass would have searched every (non-resumed) position once
+            result.deep_searches_saved = max(0, (result.plies + 1) - evaluator.reused - result.deep_calls)
+
+
+def _mine_game(
+    g: Game,
+    engine: StockfishEngine,
+    limit: int,
+    cache: Optional[SqliteEvalCache] = None,
+    checkpoints: Optional[MiningCheckpoints] = None,
+    triage_engine: Optional[StockfishEngine] = None,
+    tablebase: Optional[SyzygyTablebase] = None,
+    book: Optional[PolyglotBook] = None,
+    table: Optional[TranspositionTable] = None,
+    username: Optional[str] = None,
+    detectors: Optional[List[Detector]] = None,
+    stop: Optional[Callable[[], bool]] = None,
+) -> GameMiningResult:
+    result = GameMiningResult(game_id=g.game_id)
+    for _ in _iter_game(
+        g, engine, result, limit, cache=cache, checkpoints=checkpoints, triage_engine=triage_engine,
+        tablebase=tablebase, book=book, table=table, username=username, detectors=detectors, stop=stop,
+    ):
+        pass
+    return result
+
+
+def iter_blunders(
+    games: List[Game],
+    engine: StockfishEngine,
+    max_blunders: int = 20,
+    stats: Optional[MiningStats] = None,
+    cache: Optional[SqliteEvalCache] = None,
+    checkpoints: Optional[MiningCheckpoints] = None,
+    triage_engine: Optional[StockfishEngine] = None,
+    on_game_done: Optional[Callable[[GameMiningResult], None]] = None,
+    tablebase: Optional[SyzygyTablebase] = None,
+    book: Optional[PolyglotBook] = None,
+    table: Optional[TranspositionTable] = None,
+    username: Optional[str] = None,
+    detectors: Optional[List[Detector]] = None,
+    stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[Blunder]:
+    """Yield blunders as soon as they are found (games in order, plies in order).
+
+    `on_game_done` is called with each game's GameMiningResult after all of
+    that game's blunders were yielded (check `complete` before treating the
+    game as fully mined). Positions repeated across games are searched once
+    per call (or per `table`, if one is passed in). With `username`, only
+    that player's moves are mined (games they did not play: both sides).
+    """
+    table = table if table is not None else TranspositionTable()
+    found = 0
+    for g in games:
+        if stop is not None and stop():
+            return
+        res = GameMiningResult(game_id=g.game_id)
+        for b in _iter_game(
+            g, engine, res, max_blunders - found, cache=cache, checkpoints=checkpoints, triage_engine=triage_engine,
+            tablebase=tablebase, book=book, table=table, username=username, detectors=detectors,
+            stop=stop,
+        ):
+            found += 1
+            yield b
+        if stats is not None:
+            stats.record(res)
+        if on_game_done is not None:
+            on_game_done(res)
+        if found >= max_blunders:
+            return
+
+
+def find_blunders(
+    games: List[Game],
+    engine: StockfishEngine,
+    max_blunders: int = 20,
+    stats: Optional[MiningStats] = None,
+    cache: Optional[SqliteEvalCache] = None,
+    checkpoints: Optional[MiningCheckpoints] = None,
+    triage_engine: Optional[StockfishEngine] = None,
+    tablebase: Optional[SyzygyTablebase] = None,
+    book: Optional[PolyglotBook] = None,
+    username: Optional[str] = None,
+    detectors: Optional[List[Detector]] = None,
+    stop: Optional[Callable[[], bool]] = None,
+) -> List[Blunder]:
+    return _sort_blunders(list(iter_blunders(
+        games, engine, max_blunders=max_blunders, stats=stats, cache=cache, checkpoints=checkpoints,
+        triage_engine=triage_engine, tablebase=tablebase, book=book, username=username, detectors=detectors,
+        stop=stop,
+    )))
+
+
+def iter_blunders_parallel(
+    games: List[Game],
+    pool: EnginePool,
+    max_blunders: int = 20,
+    stats: Optional[MiningStats] = None,
+    cache: Optional[SqliteEvalCache] = None,
+    checkpoints: Optional[MiningCheckpoints] = None,
+    triage_pool: Optional[EnginePool] = None,
+    on_game_done: Optional[Callable[[GameMiningResult], None]] = None,
+    tablebase: Optional[SyzygyTablebase] = None,
+    book: Optional[PolyglotBook] = None,
+    username: Optional[str] = None,
+    detectors: Optional[List[Detector]] = None,
+    stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[Blunder]:
+    """`iter_blunders` with games fanned out over an engine pool.
+
+    Games are mined concurrently (one engine process each), but results are
+    released in input order and truncated exactly like the serial scan, so
+    the output does not depend on scheduling. Each game's blunders are
+    yielded as soon as that game and all earlier ones are done.
+
+    Engines are borrowed per game as batch work for `username`, so the
+    pool's scheduler can interleave other users and interactive requests.
+    """
+    table = TranspositionTable()
+
+    def _engine():
+        return pool.acquire(BATCH, user=username)
+
+    def _triage():
+        return triage_pool.acquire(BATCH, user=username) if triage_pool is not None else nullcontext()
+
+    if len(games) <= 1:
+        with _engine() as engine, _triage() as triage_engine:
+            yield from iter_blunders(
+                games, engine, max_blunders=max_blunders, stats=stats, cache=cache, checkpoints=checkpoints,
+                triage_engine=triage_engine, on_game_done=on_game_done, tablebase=tablebase, book=book,
+                table=table, username=username, detectors=detectors, stop=stop,
+            )
+        return
+
+    def _work(g: Game) -> GameMiningResult:
+        if stop is not None and stop():
+            return GameMiningResult(game_id=g.game_id)  # not started: left for a later run
+        with _engine() as engine, _triage() as triage_engine:
+            return _mine_game(
+                g, engine, limit=max_blunders, cache=cache, checkpoints=checkpoints, triage_engine=triage_engine,
+                tablebase=tablebase, book=book, table=table, username=username, detectors=detectors,
+                stop=stop,
+            )
+
+    found = 0
+    ex = ThreadPoolExecutor(max_workers=pool.batch_limit)
+    try:
+        futures = [ex.submit(_work, g) for g in games]
+        for fut in futures:
+            res = fut.result()
+            if len(res.blunders) > max_blunders - found:
+                res.blunders = res.blunders[:max_blunders - found]
+                res.complete = False
+            if stats is not None:
+                stats.record(res)
+            for b in res.blunders:
+                found += 1
+                yield b
+            if on_game_done is not None:
+                on_game_done(res)
+            if found >= max_blunders:
+                return
+    finally:
+        # the in-order prefix is complete (or the consumer left): drop pending work
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+def find_blunders_parallel(
+    games: List[Game],
+    pool: EnginePool,
+    max_blunders: int = 20,
+    stats: Optional[MiningStats] = None,
+    cache: Optional[SqliteEvalCache] = None,
+    checkpoints: Optional[MiningCheckpoints] = None,
+    triage_pool: Optional[EnginePool] = None,
+    on_game_done: Optional[Callable[[GameMiningResult], None]] = None,
+    tablebase: Optional[SyzygyTablebase] = None,
+    book: Optional[PolyglotBook] = None,
+    username: Optional[str] = None,
+    detectors: Optional[List[Detector]] = None,
+    stop: Optional[Callable[[], bool]] = None,
+) -> List[Blunder]:
+    """Same result as `find_blunders`, computed over an engine pool."""
+    return _sort_blunders(list(iter_blunders_parallel(
+        games, pool, max_blunders=max_blunders, stats=stats, cache=cache, checkpoints=checkpoints,
+        triage_pool=triage_pool, on_game_done=on_game_done, tablebase=tablebase, book=book,
+        username=username, detectors=detectors, stop=stop,
+    )))
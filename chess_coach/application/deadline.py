@@ -0,0 +1,27 @@
+from __future__ import annotations
+import time
+from typing import Optional
+
+
+class Deadline:
+    """Wall-clock budget for one request (monotonic clock).
+
+    `budget_ms=None` means no limit: `expired()` is then always False.
+    """
+
+    def __init__(self, budget_ms: Optional[int] = None) -> None:
+        self.budget_ms = budget_ms
+        self._start = time.monotonic()
+        self._end = None if budget_ms is None else self._start + budget_ms / 1000.0
+
+    def elapsed_ms(self) -> int:
+        return int((time.monotonic() - self._start) * 1000)
+
+    def remaining_ms(self) -> Optional[int]:
+        if self._end is None:
+            return None
+        return max(0, int((self._end - time.monotonic()) * 1000))
+
+    def expired(self, reserve_ms: int = 0) -> bool:
+        """True once less than `reserve_ms` of the budget is left."""
+        return self._end is not None and time.monotonic() >= self._end - reserve_ms / 1000.0
@@ -0,0 +1,166 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Protocol
+
+import chess
+
+from chess_coach.application.eval_pipeline import PlyEval, is_score_only, score_cp, swing_cp
+from chess_coach.domain.models import Game
+
+# Moment kinds (besides the user's own blunders, which become puzzles)
+MISSED_PUNISH = "missed_punish"
+ONLY_MOVE = "only_move"
+CONVERSION_FAILURE = "conversion_failure"
+
+OPPONENT_ERROR_CP = 200   # opponent move that handed over at least this much
+GAVE_BACK_CP = 150        # ... and the user's reply lost at least this much of it
+ONLY_MOVE_GAP_CP = 200    # best move this much better than the second best
+ONLY_MOVE_MAX_CP = 500    # beyond this the position is decided, not critical
+WINNING_CP = 300          # advantage the user should have converted
+
+MultiPV = Callable[[chess.Board, int], List[Any]]
+
+
+@dataclass(frozen=True)
+class Moment:
+    """A training signal found in one of the user's games (other than a blunder)."""
+    kind: str
+    game_id: str
+    ply: int
+    fen_before: str
+    move_uci: str
+    best_move_uci: Optional[str]
+    pv_uci: List[str] = field(default_factory=list)
+    swing_cp: int = 0
+    eval_cp: int = 0  # before the move, user's point of view
+
+
+@dataclass
+class PlyContext:
+    """What a detector sees for one ply of the mainline stream."""
+    game: Game
+    user: chess.Color
+    mover: chess.Color
+    pe: PlyEval
+    history: List[PlyEval]  # earlier plies of this game, in order
+    multipv: Optional[MultiPV] = None  # engine MultiPV, when the engine supports it
+
+
+class Detector(Protocol):
+    """One analysis over the mining eval stream.
+
+    Detectors are stateless (they can be shared by concurrent games): what
+    they need from earlier plies is in `PlyContext.history`.
+    """
+    kind: str
+
+    def on_ply(self, ctx: PlyContext) -> Optional[Moment]: ...
+
+    def on_game_end(self, game: Game, user: chess.Color, history: List[PlyEval]) -> List[Moment]: ...
+
+
+def _moment(kind: str, game: Game, pe: PlyEval, swing: int) -> Moment:
+    return Moment(
+        kind=kind,
+        game_id=game.game_id,
+        ply=pe.ply,
+        fen_before=pe.fen_before,
+        move_uci=pe.move.uci(),
+        best_move_uci=pe.before.best_move_uci,
+        pv_uci=list(pe.before.pv_uci or [])[:8],
+        swing_cp=int(swing),
+        eval_cp=score_cp(pe.before),
+    )
+
+
+class MissedPunishment:
+    """The opponent blundered and the user's reply let most of it go."""
+    kind = MISSED_PUNISH
+
+    def on_ply(self, ctx: PlyContext) -> Optional[Moment]:
+        pe = ctx.pe
+        if ctx.mover != ctx.user or not ctx.history or ctx.history[-1].ply != pe.ply - 1:
+            return None
+        if is_score_only(pe.before) or not pe.before.best_move_uci or pe.move.uci() == pe.before.best_move_uci:
+            return None
+        opp = ctx.history[-1]
+        if swing_cp(opp.before, opp.after) < OPPONENT_ERROR_CP:
+            return None
+        swing = swing_cp(pe.before, pe.after)
+        if swing < GAVE_BACK_CP:
+            return None
+        return _moment(self.kind, ctx.game, pe, swing)
+
+    def on_game_end(self, game: Game, user: chess.Color, history: List[PlyEval]) -> List[Moment]:
+        return []
+
+
+class OnlyMove:
+    """The user found the only good move in a balanced position.
+
+    Needs MultiPV 2, asked only for plies where the user played the best
+    move in a position that is not yet decided.
+    """
+    kind = ONLY_MOVE
+
+    def on_ply(self, ctx: PlyContext) -> Optional[Moment]:
+        pe = ctx.pe
+        if ctx.multipv is None or ctx.mover != ctx.user or is_score_only(pe.before):
+            return None
+        if pe.move.uci() != pe.before.best_move_uci or pe.before.mate is not None:
+            return None
+        if abs(score_cp(pe.before)) > ONLY_MOVE_MAX_CP:
+            return None
+        board = chess.Board(pe.fen_before)
+        if board.legal_moves.count() < 2:
+            return None  # forced, nothing to find
+        lines = ctx.multipv(board, 2)
+        if len(lines) < 2:
+            return None
+        gap = score_cp(lines[0]) - score_cp(lines[1])
+        if gap < ONLY_MOVE_GAP_CP:
+            return None
+        return _moment(self.kind, ctx.game, pe, gap)
+
+    def on_game_end(self, game: Game, user: chess.Color, history: List[PlyEval]) -> List[Moment]:
+        return []
+
+
+def _mover(pe: PlyEval) -> chess.Color:
+    return pe.fen_before.split(" ", 2)[1] == "w"
+
+
+def _user_won(game: Game, user: chess.Color) -> Optional[bool]:
+    res = (game.result or "").strip()
+    if res == "1-0":
+        return user == chess.WHITE
+    if res == "0-1":
+        return user == chess.BLACK
+    if res in ("1/2-1/2", "½-½"):
+        return False
+    return None
+
+
+class ConversionFailure:
+    """The user reached a winning position and did not win the game.
+
+    Reported at the user's costliest move after the advantage was reached.
+    """
+    kind = CONVERSION_FAILURE
+
+    def on_ply(self, ctx: PlyContext) -> Optional[Moment]:
+        return None
+
+    def on_game_end(self, game: Game, user: chess.Color, history: List[PlyEval]) -> List[Moment]:
+        if _user_won(game, user) is not False or not history:
+            return []
+        own = [pe for pe in history if _mover(pe) == user]
+        winning = next((i for i, pe in enumerate(own) if score_cp(pe.before) >= WINNING_CP), None)
+        if winning is None:
+            return []
+        worst = max(own[winning:], key=lambda pe: swing_cp(pe.before, pe.after))
+        return [_moment(self.kind, game, worst, max(0, swing_cp(worst.before, worst.after)))]
+
+
+def default_detectors() -> List[Detector]:
+    return [MissedPunishment(), OnlyMove(), ConversionFailure()]
@@ -0,0 +1,289 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Tuple
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+from chess_coach.domain.models import PositionEval
+
+MATE_SCORE_CP = 100000  # any forced mate outweighs every centipawn score
+
+
+@dataclass(frozen=True)
+class PlyEval:
+    """One mainline move with the evaluations around it.
+
+    `before` is from the mover's point of view, `after` from the opponent's
+    (side to move after the push), exactly as the engine reports them.
+    """
+    ply: int
+    fen_before: str
+    move: chess.Move
+    before: Any
+    after: Any
+
+
+def score_cp(ev: Any) -> int:
+    """Eval as one comparable number (side to move POV); mates map to +-MATE_SCORE_CP."""
+    if ev.mate is not None:
+        return MATE_SCORE_CP if ev.mate > 0 else -MATE_SCORE_CP
+    return ev.cp or 0
+
+
+def swing_cp(before: Any, after: Any) -> int:
+    """Loss for the mover: `before` is from its POV, `after` from the opponent's."""
+    return score_cp(before) + score_cp(after)
+
+
+def is_score_only(ev: Any) -> bool:
+    """True for evaluations without a trustworthy best move (e.g. PGN annotations)."""
+    return bool(getattr(ev, "score_only", False))
+
+
+class EvalSource(Protocol):
+    """Something that can evaluate some positions without the engine.
+
+    `ply` is the position index along the mainline (0 = start position).
+    Returning None means "not known here": the next source (and finally the
+    engine) is asked. Score-only results (no best move / PV) must set
+    `score_only=True`.
+    """
+    name: str
+
+    def evaluate(self, board: chess.Board, ply: int) -> Optional[PositionEval]: ...
+
+
+class EmbeddedEvalSource:
+    """Evaluations already present in the PGN as `[%eval ...]` comments.
+
+    Lichess attaches them to games that had server analysis. They carry no
+    best move or PV, so they are score-only: good enough to decide which
+    plies deserve an engine search, not to build a puzzle.
+    """
+    name = "pgn_eval"
+
+    def __init__(self, evals: Dict[int, PositionEval]) -> None:
+        self.evals = evals
+
+    @classmethod
+    def from_game(cls, game: chess.pgn.Game) -> "EmbeddedEvalSource":
+        evals: Dict[int, PositionEval] = {}
+        for ply, node in enumerate(game.mainline(), start=1):
+            pov = node.eval()
+            if pov is None:
+                continue
+            score = pov.pov(node.turn())
+            evals[ply] = PositionEval(
+                cp=score.score(), mate=score.mate(), best_move_uci=None, pv_uci=[], score_only=True,
+            )
+        return cls(evals)
+
+    def __len__(self) -> int:
+        return len(self.evals)
+
+    def evaluate(self, board: chess.Board, ply: int) -> Optional[PositionEval]:
+        return self.evals.get(ply)
+
+
+class BestMoveSource:
+    """Score of a position reached by playing the previous position's best move.
+
+    That position is the first step of the previous PV, so its score is the
+    previous one negated and needs no search. The result is score-only, so
+    it is used only where `wanted(board)` says nothing more is needed (e.g.
+    positions with the opponent to move, in side-aware mining).
+    """
+    name = "best_move"
+
+    def __init__(self, evals: List[Any], wanted: Callable[[chess.Board], bool]) -> None:
+        self.evals = evals
+        self.wanted = wanted
+
+    def evaluate(self, board: chess.Board, ply: int) -> Optional[PositionEval]:
+        if ply == 0 or ply > len(self.evals) or not board.move_stack or not self.wanted(board):
+            return None
+        prev = self.evals[ply - 1]
+        if prev is None or is_score_only(prev) or prev.best_move_uci != board.peek().uci():
+            return None
+        mate = prev.mate
+        if mate is not None:
+            if mate == 0:
+                return None
+            # mover mates in m -> opponent is mated in m-1; mover mated in m -> opponent mates in m
+            mate = -(mate - 1) if mate > 0 else -mate
+        cp = -prev.cp if prev.cp is not None else None
+        return PositionEval(cp=cp, mate=mate, best_move_uci=None, pv_uci=[], score_only=True)
+
+
+class CountingEngine:
+    """Pass-through engine wrapper with the same counters as CachedEngine."""
+
+    def __init__(self, engine) -> None:
+        self.engine = engine
+        self.depth = getattr(engine, "depth", None)
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, board: chess.Board):
+        self.misses += 1
+        return self.engine.analyze(board)
+
+
+class TranspositionTable:
+    """Batch-wide memo of engine results keyed by position hash and search settings.
+
+    Shared by every game of one mining batch, so a position reached in many
+    games (the same opening, the same endgame) is searched once and the
+    result fans out to all of them. Concurrent requests for a position that
+    is being searched wait for that search instead of starting another.
+    """
+
+    def __init__(self, max_size: int = 200000) -> None:
+        self.max_size = int(max_size)
+        self.requests = 0
+        self.hits = 0
+        self._evals: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._inflight: Dict[Tuple, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Tuple):
+        ev = self._evals.get(key)
+        if ev is not None:
+            self._evals.move_to_end(key)
+        return ev
+
+    def analyze(self, key: Tuple, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return (eval, shared); shared=False means `compute` ran for this caller."""
+        with self._lock:
+            self.requests += 1
+            ev = self._lookup(key)
+            if ev is not None:
+                self.hits += 1
+                return ev, True
+            pending = self._inflight.get(key)
+            if pending is None:
+                self._inflight[key] = threading.Event()
+
+        if pending is not None:
+            pending.wait()
+            with self._lock:
+                ev = self._lookup(key)
+                if ev is not None:
+                    self.hits += 1
+                    return ev, True
+            return compute(), False  # the other search failed: do our own
+
+        try:
+            ev = compute()
+            with self._lock:
+                self._evals[key] = ev
+                if len(self._evals) > self.max_size:
+                    self._evals.popitem(last=False)
+            return ev, False
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "positions": self.requests,
+                "dedup_hits": self.hits,
+                "dedup_ratio": round(self.hits / self.requests, 3) if self.requests else 0.0,
+            }
+
+
+class DedupEngine:
+    """Engine wrapper that routes searches through a batch TranspositionTable.
+
+    `hits` counts results shared from other games/plies, `misses` the
+    searches actually passed on to the wrapped engine.
+    """
+
+    def __init__(self, engine, table: TranspositionTable) -> None:
+        self.engine = engine
+        self.table = table
+        self.depth = getattr(engine, "depth", None)
+        self._settings = (self.depth, getattr(engine, "nodes", 0))
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, board: chess.Board):
+        key = (chess.polyglot.zobrist_hash(board),) + self._settings
+        ev, shared = self.table.analyze(key, lambda: self.engine.analyze(board))
+        if shared:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return ev
+
+
+class MainlineEvaluator:
+    """Walks a game's mainline analysing every position exactly once.
+
+    The evaluation after ply N is the evaluation before ply N+1, so it is
+    carried forward instead of searched again: a game of N plies costs N+1
+    engine calls instead of ~2N.
+
+    `evals` holds the evaluation of every position reached so far (index =
+    ply). Passing a previous run's list as `resume_evals` replays those
+    positions without touching the engine.
+    """
+
+    def __init__(
+        self,
+        engine,
+        resume_evals: Optional[List[Any]] = None,
+        sources: Optional[List[EvalSource]] = None,
+    ) -> None:
+        self.engine = engine
+        self.engine_calls = 0
+        self.reused = 0
+        self.by_source: Dict[str, int] = {}
+        self.evals: List[Any] = []
+        self._resume = list(resume_evals or [])
+        self.sources: List[EvalSource] = list(sources or [])
+
+    def _analyze(self, board: chess.Board):
+        idx = len(self.evals)
+        ev = None
+        if idx < len(self._resume) and self._resume[idx] is not None:
+            self.reused += 1
+            ev = self._resume[idx]
+        else:
+            for src in self.sources:
+                ev = src.evaluate(board, idx)
+                if ev is not None:
+                    self.by_source[src.name] = self.by_source.get(src.name, 0) + 1
+                    break
+        if ev is None:
+            self.engine_calls += 1
+            ev = self.engine.analyze(board)
+        self.evals.append(ev)
+        return ev
+
+    def iter_plies(self, game: chess.pgn.Game, skip_plies: int = 0) -> Iterator[PlyEval]:
+        """Yield every ply after the first `skip_plies` ones.
+
+        Skipped plies (e.g. book moves) are played without analysis; their
+        positions are recorded as None in `evals`.
+        """
+        board = game.board()
+        moves = list(game.mainline_moves())
+        if skip_plies >= len(moves):
+            return
+        for move in moves[:skip_plies]:
+            self.evals.append(None)
+            board.push(move)
+        before = self._analyze(board)
+
+        for ply, move in enumerate(moves[skip_plies:], start=skip_plies + 1):
+            fen_before = board.fen()
+            board.push(move)
+            after = self._analyze(board)
+            yield PlyEval(ply=ply, fen_before=fen_before, move=move, before=before, after=after)
+            before = after
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import socket
+import threading
+import traceback
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from chess_coach.agents.coach_agent import CoachAgent
+from chess_coach.application.blunder_mining import MiningStats
+from chess_coach.application.use_cases import ImportGamesUseCase, MinePuzzlesUseCase
+from chess_coach.infrastructure.job_queue import Job, SqliteJobQueue
+
+JOB_IMPORT = "import"
+JOB_MINE = "mine"
+JOB_TAG = "tag"
+JOB_BOOTSTRAP = "bootstrap"
+JOB_SYNC = "sync"
+JOB_KINDS = (JOB_IMPORT, JOB_MINE, JOB_TAG, JOB_BOOTSTRAP, JOB_SYNC)
+
+Report = Callable[[Dict[str, Any]], None]
+Handler = Callable[[Job, Report], Dict[str, Any]]
+
+
+class LeaseLost(Exception):
+    """Raised by `report` once the job's lease expired and another worker claimed it."""
+
+
+class BootstrapJobs:
+    """Job handlers for the bootstrap pipeline (import -> mine -> tag).
+
+    Each step is also a job kind on its own; `bootstrap` runs all three.
+    Dependencies are factories so every job gets fresh adapters.
+    """
+
+    def __init__(self, repo_factory, source_factory, miner_factory: Callable[[Any], MinePuzzlesUseCase]) -> None:
+        self.repo_factory = repo_factory
+        self.source_factory = source_factory
+        self.miner_factory = miner_factory
+
+    def handlers(self) -> Dict[str, Handler]:
+        return {
+            JOB_IMPORT: self.run_import,
+            JOB_MINE: self.run_mine,
+            JOB_TAG: self.run_tag,
+            JOB_BOOTSTRAP: self.run_bootstrap,
+            JOB_SYNC: self.run_sync,
+        }
+
+    def _import(self, repo, job: Job, report: Report) -> int:
+        report({"stage": "import"})
+        limit = int(job.payload.get("import_games", 50))
+        source = self.source_factory(job.platform)
+        return ImportGamesUseCase(source=source, repo=repo).execute_streaming(username=job.username, limit=limit)
+
+    def _mine(self, repo, job: Job, report: Report) -> Dict[str, Any]:
+        games = repo.list_unanalyzed_games(job.username, limit=int(job.payload.get("mine_blunders_from_games", 30)))
+        stats = MiningStats()
+        report({"stage": "mining", "games_total": len(games)})
+
+        def _game_done(_res) -> None:
+            # per-game heartbeat: a long mining stage must not outlive the lease
+            report({"stage": "mining", "games_total": len(games), "games_done": stats.games})
+
+        mined = self.miner_factory(repo).execute(
+            username=job.username, platform=job.platform, games=games,
+            max_new=int(job.payload.get("max_new_puzzles", 30)), stats=stats, on_game_done=_game_done,
+        )
+        return {"mined": mined, "mining": stats.to_dict()}
+
+    def _tag(self, repo, job: Job, report: Report) -> int:
+        report({"stage": "tagging"})
+        return CoachAgent().tag_puzzles_if_missing(repo, job.username, limit=200)
+
+    def run_sync(self, job: Job, report: Report) -> Dict[str, Any]:
+        """Fetch only the games played since the last sync (no `import_games` cap:
+        the high-water mark bounds the download)."""
+        report({"stage": "sync"})
+        source = self.source_factory(job.platform)
+        imported = ImportGamesUseCase(source=source, repo=self.repo_factory()).sync(
+            username=job.username, platform=job.platform,
+        )
+        return {"imported": imported}
+
+    def run_import(self, job: Job, report: Report) -> Dict[str, Any]:
+        return {"imported": self._import(self.repo_factory(), job, report)}
+
+    def run_mine(self, job: Job, report: Report) -> Dict[str, Any]:
+        return self._mine(self.repo_factory(), job, report)
+
+    def run_tag(self, job: Job, report: Report) -> Dict[str, Any]:
+        return {"tagged": self._tag(self.repo_factory(), job, report)}
+
+    def run_bootstrap(self, job: Job, report: Report) -> Dict[str, Any]:
+        repo = self.repo_factory()
+        imported = 0
+        if repo.count_games(job.username) == 0 or job.payload.get("force_import"):
+            imported = self._import(repo, job, report)
+        out: Dict[str, Any] = {"imported": imported}
+        out.update(self._mine(repo, job, report))
+        out["tagged"] = self._tag(repo, job, report)
+        out["counts"] = {"games": repo.count_games(job.username), "puzzles": repo.count_puzzles(job.username)}
+        return out
+
+
+class JobRunner:
+    """Polls the job queue and executes jobs with the registered handlers."""
+
+    def __init__(
+        self,
+        queue: SqliteJobQueue,
+        handlers: Dict[str, Handler],
+        worker_id: Optional[str] = None,
+        poll_interval_s: float = 1.0,
+        lease_s: int = 1800,
+    ) -> None:
+        self.queue = queue
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}:{uuid.uuid4().hex[:8]}"
+        self.poll_interval_s = poll_interval_s
+        self.lease_s = lease_s
+
+    def run_once(self) -> Optional[Job]:
+        """Claim and run one job. Returns the job, or None if the queue was empty."""
+        job = self.queue.claim(self.worker_id, lease_s=self.lease_s)
+        if job is None:
+            return None
+
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            self.queue.fail(job.id, self.worker_id, f"unknown job kind: {job.kind}")
+            return job
+
+        def report(progress: Dict[str, Any]) -> None:
+            if not self.queue.report_progress(job.id, self.worker_id, progress, lease_s=self.lease_s):
+                raise LeaseLost(f"job {job.id} was claimed by another worker")
+
+        try:
+            result = handler(job, report)
+        except LeaseLost:
+            pass  # the new owner runs it; whatever this run saved is idempotent
+        except Exception as e:
+            self.queue.fail(job.id, self.worker_id, f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=5)}")
+        else:
+            self.queue.complete(job.id, self.worker_id, result or {})
+        return job
+
+    def run_forever(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                job = self.run_once()
+            except Exception:
+                job = None
+            if job is None:
+                stop.wait(self.poll_interval_s)
+
+
+def start_workers(runner_factory: Callable[[], JobRunner], count: int) -> threading.Event:
+    """Start `count` daemon worker threads; set the returned event to stop them."""
+    stop = threading.Event()
+    for i in range(max(0, count)):
+        t = threading.Thread(target=runner_factory().run_forever, args=(stop,), name=f"job-worker-{i}", daemon=True)
+        t.start()
+    return stop
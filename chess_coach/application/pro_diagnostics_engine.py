@@ -70,17 +70,21 @@ def build_phase_stats(repo, username: str) -> Dict[str, Any]:
 def build_opening_breakpoints(repo, username: str, limit_games: int = 200) -> List[Dict[str, Any]]:
     games = repo.list_recent_games(username, limit=limit_games)
     puzzles = repo.list_puzzles(username=username, limit=5000)
+    book_exits = repo.list_book_exits(username)  # game_id -> leading book plies
     by_game = defaultdict(list)
     for p in puzzles:
         by_game[p["game_id"]].append(p)
 
-    breakpoints = defaultdict(lambda: {"count": 0, "swings": []})
+    breakpoints = defaultdict(lambda: {"count": 0, "swings": [], "out_of_book": []})
     for g in games:
-        opening = (g.get("opening_name") or "Unknown")
-        items = sorted(by_game.get(g["game_id"], []), key=lambda x: int(x.get("ply") or 0))
+        opening = (g.opening or "Unknown")
+        book_plies = book_exits.get(g.game_id)
+        items = sorted(by_game.get(g.game_id, []), key=lambda x: int(x.get("ply") or 0))
         bp_move = None; bp_swing=None
         for it in items:
             ply = int(it.get("ply") or 0)
+            if book_plies is not None and ply <= book_plies:
+                continue  # still theory
             move = _move_number_from_ply(ply)
             if move > OPENING_MAX_MOVE:
                 break
@@ -92,6 +96,8 @@ def build_opening_breakpoints(repo, username: str, limit_games: int = 200) -> Li
             key=(opening, bp_move)
             breakpoints[key]["count"] += 1
             breakpoints[key]["swings"].append(bp_swing)
+            if book_plies is not None:
+                breakpoints[key]["out_of_book"].append(_move_number_from_ply(book_plies + 1))
 
     out=[]
     for (opening, move), v in breakpoints.items():
@@ -100,6 +106,8 @@ def build_opening_breakpoints(repo, username: str, limit_games: int = 200) -> Li
             "move_number": move,
             "count": v["count"],
             "avg_swing": float(statistics.mean(v["swings"])) if v["swings"] else 0.0,
+            # where these games left the opening book (None: no book data)
+            "avg_out_of_book_move": float(statistics.mean(v["out_of_book"])) if v["out_of_book"] else None,
         })
     out.sort(key=lambda x: (x["count"], x["avg_swing"]), reverse=True)
     return out[:25]
@@ -116,13 +124,13 @@ def build_conversion_stats(repo, username: str) -> Dict[str, Any]:
     u = username.lower()
 
     for g in games:
-        res = (g.get("result") or "").strip()
-        white = (g.get("white") or "").lower()
-        black = (g.get("black") or "").lower()
+        res = (g.result or "").strip()
+        white = (g.white or "").lower()
+        black = (g.black or "").lower()
         player_is_white = (white == u)
         won = (res == "1-0" and player_is_white) or (res == "0-1" and (not player_is_white))
 
-        items = by_game.get(g["game_id"], [])
+        items = by_game.get(g.game_id, [])
         had_adv = any(abs(float(it.get("swing_cp") or 0.0)) >= ADVANTAGE_CP for it in items)
         if had_adv:
             total_adv += 1
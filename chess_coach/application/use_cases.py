@@ -1,12 +1,27 @@
 from __future__ import annotations
+import itertools
+import time
 from collections import Counter
-from typing import List
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from chess_coach.application.blunder_mining import (
+    Blunder,
+    GameMiningResult,
+    MiningCheckpoints,
+    MiningStats,
+    find_blunders_parallel,
+    iter_blunders_parallel,
+)
+from chess_coach.application.detectors import default_detectors
+from chess_coach.application.pattern_tagger import tag_from_position_and_pv
 from chess_coach.domain.models import Game
 from chess_coach.domain.training_plan import WeeklyPlan, TrainingItem
 from chess_coach.ports.services import GameSource
 from chess_coach.ports.repositories import GameRepository
 
+SYNC_FALLBACK_WINDOW = 100  # games fetched per sync from sources that cannot filter by date
+
 
 class ImportGamesUseCase:
     def __init__(self, source: GameSource, repo: GameRepository) -> None:
@@ -18,6 +33,254 @@ class ImportGamesUseCase:
         self.repo.save_games(games, username=username)
         return games
 
+    def execute_streaming(
+        self, username: str, limit: Optional[int], batch_size: int = 200, stop: Optional[Callable[[], bool]] = None,
+    ) -> int:
+        """Import without holding the history in memory: each batch is saved
+        as it arrives (sources without `iter_games` are fetched in one go).
+
+        `stop()` is checked after every batch; when it returns True the
+        download is abandoned (the games saved so far are kept).
+        Returns the number of games saved.
+        """
+        iter_games = getattr(self.source, "iter_games", None)
+        if iter_games is None:
+            batches = iter([self.source.fetch_games(username=username, limit=limit)])
+        else:
+            batches = iter_games(username=username, limit=limit, batch_size=batch_size)
+        n = 0
+        try:
+            for batch in batches:
+                self.repo.save_games(batch, username=username)
+                n += len(batch)
+                if stop is not None and stop():
+                    break
+        finally:
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()  # leaving the generator ends the download
+        return n
+
+    def sync(self, username: str, platform: str, limit: Optional[int] = None, batch_size: int = 200) -> int:
+        """Incremental import: only the games newer than the user's high-water mark.
+
+        Streaming sources are asked for games `since` the mark and reading
+        stops at the first known game; stored games are never rewritten.
+        The mark only moves when the new games reach back to it (i.e. were
+        not cut short by `limit`). Returns the number of games added (games
+        stored by an earlier, cut-short sync are read again but not counted).
+        """
+        state = self.repo.get_sync_state(username, platform)
+        since = datetime.fromisoformat(state["last_played_at"]) if state else None
+        known_id = state["last_game_id"] if state else None
+
+        def _is_new(g: Game) -> bool:
+            return g.game_id != known_id and (since is None or g.played_at >= since)
+
+        iter_games = getattr(self.source, "iter_games", None)
+        if iter_games is None:
+            # no server-side filter: fetch the usual window and keep the new games
+            cap: Optional[int] = limit or SYNC_FALLBACK_WINDOW
+            window = self.source.fetch_games(username=username, limit=cap)
+            batches: Iterator[List[Game]] = iter([[g for g in window if _is_new(g)]])
+        else:
+            cap = limit
+            batches = iter_games(username=username, limit=limit, batch_size=batch_size, since=since)
+
+        n = 0
+        added = 0
+        newest: Optional[Game] = None
+        reached = False
+        try:
+            for batch in batches:
+                fresh = list(itertools.takewhile(_is_new, batch))  # newest first: stop at the mark
+                reached = len(fresh) < len(batch)
+                if fresh:
+                    added += self.repo.save_games(fresh, username=username, replace=False)
+                    n += len(fresh)
+                    top = max(fresh, key=lambda g: g.played_at)
+                    if newest is None or top.played_at > newest.played_at:
+                        newest = top
+                if reached:
+                    break
+        finally:
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()  # leaving the generator ends the download
+
+        if newest is not None and (reached or cap is None or n < cap):
+            self.repo.set_sync_state(username, platform, newest.played_at.isoformat(), newest.game_id)
+        return added
+
+
+class BulkImportPgnUseCase:
+    """Seed an account from a local PGN file (OTB history, Lichess database dumps).
+
+    `reader` yields (next_offset, games) chunks in file order (e.g.
+    `PgnFileReader`); each chunk is written in one transaction, and
+    `on_progress` gets the offset to resume from after every chunk.
+    """
+
+    def __init__(self, reader, repo: GameRepository) -> None:
+        self.reader = reader
+        self.repo = repo
+
+    def execute(
+        self, username: str, start_offset: int = 0, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        games = 0
+        offset = start_offset
+        for offset, chunk in self.reader.iter_chunks(start_offset):
+            if chunk:
+                self.repo.save_games(chunk, username=username, replace=False)
+                games += len(chunk)
+            if on_progress is not None:
+                on_progress(self._progress(games, start_offset, offset, t0))
+        return self._progress(games, start_offset, offset, t0)
+
+    @staticmethod
+    def _progress(games: int, start_offset: int, offset: int, t0: float) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - t0
+        return {
+            "games": games,
+            "offset": offset,
+            "mb": round((offset - start_offset) / (1024 * 1024), 1),
+            "elapsed_s": round(elapsed, 1),
+            "games_per_s": round(games / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+class MinePuzzlesUseCase:
+    """Mine blunders from stored games, tag them and save them as puzzles.
+
+    The same pass runs the moment detectors (missed punishments, only-moves,
+    conversion failures; `detectors=[]` turns them off) and saves their records.
+    """
+
+    def __init__(
+        self, repo: GameRepository, pool, cache=None, triage_pool=None, tablebase=None, book=None,
+        detectors=None,
+    ) -> None:
+        self.repo = repo
+        self.pool = pool
+        self.cache = cache
+        self.triage_pool = triage_pool
+        self.tablebase = tablebase
+        self.book = book
+        self.detectors = default_detectors() if detectors is None else list(detectors)
+        self.checkpoints = MiningCheckpoints(repo, self.engine_settings)
+
+    @property
+    def engine_settings(self) -> str:
+        settings = self.pool.settings
+        if self.triage_pool is not None:
+            settings += f"; triage {self.triage_pool.settings}"
+        return settings
+
+    @staticmethod
+    def _to_tuple(b: Blunder) -> Tuple:
+        tags = tag_from_position_and_pv(b.fen_before, b.pv_uci)
+        return (
+            b.game_id, b.ply, b.fen_before, b.move_uci, b.best_move_uci,
+            " ".join(b.pv_uci), ",".join([t.value for t in tags]), b.swing_cp,
+        )
+
+    def _save_moments(self, username: str, platform: str, done: List[GameMiningResult]) -> None:
+        moments = [
+            (m.kind, m.game_id, m.ply, m.fen_before, m.move_uci, m.best_move_uci, " ".join(m.pv_uci),
+             m.swing_cp, m.eval_cp)
+            for r in done for m in r.moments
+        ]
+        if moments:
+            self.repo.save_moments(username=username, platform=platform, moments=moments)
+
+    def _mark_analyzed(self, username: str, games: List[Game], done: List[GameMiningResult]) -> None:
+        """Record the complete games (their puzzles are saved) and drop their checkpoints."""
+        by_id = {g.game_id: g for g in games}
+        platforms = {g.game_id: g.platform for g in games}
+        curves = [(platforms[r.game_id], r.game_id, r.eval_curve) for r in done if r.complete and r.eval_curve]
+        if curves:
+            self.repo.save_eval_curves(engine_settings=self.engine_settings, curves=curves)
+        self.repo.mark_games_analyzed(
+            username=username,
+            engine_settings=self.engine_settings,
+            results=[
+                (platforms[r.game_id], r.game_id, len(r.blunders), r.book_plies) for r in done if r.complete
+            ],
+        )
+        for r in done:
+            if r.complete:
+                self.checkpoints.clear(by_id[r.game_id])  # nothing left to resume
+
+    def _mark_mined(self, games: List[Game], done: List[GameMiningResult]) -> None:
+        """Games cut short (limit or `stop`) resume after their last saved puzzle."""
+        by_id = {g.game_id: g for g in games}
+        for r in done:
+            if not r.complete and r.blunders:
+                self.checkpoints.mark_mined(by_id[r.game_id], max(b.ply for b in r.blunders))
+
+    def execute(
+        self, username: str, platform: str, games: List[Game], max_new: int, stats: Optional[MiningStats] = None,
+        stop=None, on_game_done=None,
+    ) -> int:
+        """Mine `games` (typically `repo.list_unanalyzed_games`) and save their puzzles.
+
+        Fully mined games are recorded in the repo after their puzzles are
+        saved, so they are skipped by later runs. `stop()` (e.g. a request
+        deadline) or `max_new` cuts mining short; unfinished games stay
+        unanalyzed and resume from their checkpoints after their last saved
+        puzzle, so repeated runs keep making progress. `on_game_done` gets
+        each GameMiningResult as mining goes (before anything is saved).
+        """
+        done: List[GameMiningResult] = []
+
+        def _game_done(res: GameMiningResult) -> None:
+            done.append(res)
+            if on_game_done is not None:
+                on_game_done(res)
+
+        blunders = find_blunders_parallel(
+            games, self.pool, max_blunders=max_new,
+            stats=stats, cache=self.cache, checkpoints=self.checkpoints,
+            triage_pool=self.triage_pool, on_game_done=_game_done, tablebase=self.tablebase,
+            book=self.book, username=username, detectors=self.detectors, stop=stop,
+        )
+        tuples = [self._to_tuple(b) for b in blunders]
+        self.repo.save_puzzles(username=username, platform=platform, puzzles=tuples)
+        self._mark_mined(games, done)
+        self._save_moments(username, platform, done)
+        self._mark_analyzed(username, games, done)
+        return len(tuples)
+
+    def iter_execute(
+        self, username: str, platform: str, games: List[Game], max_new: int, stats: Optional[MiningStats] = None,
+        on_game_done=None, stop=None,
+    ) -> Iterator[Tuple[int, Blunder]]:
+        """Streaming variant: each blunder is saved as soon as it is found.
+
+        Yields (puzzle_id, blunder).
+        """
+        by_id = {g.game_id: g for g in games}
+
+        def _game_done(res: GameMiningResult) -> None:
+            # called once all of this game's blunders were yielded (and saved)
+            self._save_moments(username, platform, [res])
+            self._mark_analyzed(username, games, [res])
+            if on_game_done is not None:
+                on_game_done(res)
+
+        for b in iter_blunders_parallel(
+            games, self.pool, max_blunders=max_new,
+            stats=stats, cache=self.cache, checkpoints=self.checkpoints,
+            triage_pool=self.triage_pool, on_game_done=_game_done, tablebase=self.tablebase,
+            book=self.book, username=username, detectors=self.detectors, stop=stop,
+        ):
+            ids = self.repo.save_puzzles(username=username, platform=platform, puzzles=[self._to_tuple(b)])
+            # marked per puzzle: a client that disconnects mid-game still resumes after it
+            self.checkpoints.mark_mined(by_id[b.game_id], b.ply)
+            yield ids[0], b
+
 
 class BuildWeeklyPlanUseCase:
     def execute(self, username: str, games: List[Game]) -> WeeklyPlan:
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import argparse
+import os
+
+from chess_coach.application.use_cases import BulkImportPgnUseCase
+from chess_coach.infrastructure.pgn_file import CHUNK_BYTES, PgnFileReader
+from chess_coach.infrastructure.sqlite_repo import SqliteGameRepository
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import of a local PGN file (OTB history, Lichess database dumps).")
+    parser.add_argument("pgn", help="path to the .pgn file")
+    parser.add_argument("--username", required=True, help="account the games are stored under")
+    parser.add_argument("--db", default=os.getenv("CHESS_COACH_DB", "chess_coach.db"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_BYTES // (1024 * 1024))
+    parser.add_argument("--offset", type=int, default=0, help="resume from this byte offset (printed as progress)")
+    parser.add_argument("--platform", default=None, help="platform to store (default: lichess for lichess games, else pgn)")
+    parser.add_argument("--only-player", action="store_true", help="keep only games where --username played")
+    args = parser.parse_args()
+
+    reader = PgnFileReader(
+        args.pgn,
+        workers=args.workers,
+        chunk_bytes=args.chunk_mb * 1024 * 1024,
+        platform=args.platform,
+        player=args.username if args.only_player else None,
+    )
+    size_mb = reader.size / (1024 * 1024)
+
+    def progress(p: dict) -> None:
+        print(
+            f"{p['games']} partidas | {p['games_per_s']} partidas/s | "
+            f"{p['offset'] / (1024 * 1024):.0f}/{size_mb:.0f} MB | offset={p['offset']}",
+            flush=True,
+        )
+
+    use_case = BulkImportPgnUseCase(reader=reader, repo=SqliteGameRepository(db_path=args.db))
+    try:
+        done = use_case.execute(username=args.username, start_offset=args.offset, on_progress=progress)
+    except KeyboardInterrupt:
+        print("Interrumpido: relanzar con --offset igual al último offset mostrado para continuar.")
+        return
+    print(
+        f"Importadas {done['games']} partidas en {done['elapsed_s']}s "
+        f"({done['games_per_s']} partidas/s, {done['mb']} MB)."
+    )
+
+
+if __name__ == "__main__":
+    main()
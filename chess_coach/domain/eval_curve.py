@@ -0,0 +1,91 @@
+from __future__ import annotations
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Blob layout (little-endian):
+#   header  "<4sBBI": magic b"EVC1", flags, reserved, n positions
+#   cp      n * int16, white's point of view, one per position (index = ply)
+#   mates   k * (uint32 index, int16 mate), white's point of view, sorted by index
+MAGIC = b"EVC1"
+_HEADER = struct.Struct("<4sBBI")
+_MATE = struct.Struct("<Ih")
+HEADER_SIZE = _HEADER.size  # the cp array starts here
+
+FLAG_BLACK_FIRST = 1  # the game started with black to move (FEN setups)
+
+MISSING = -32768      # position not evaluated (e.g. book moves)
+CP_LIMIT = 30000      # centipawns are clamped to +-CP_LIMIT
+MATE_CP = 32000       # cp slot of a mate position (sign = who mates); the mate is in `mates`
+
+
+def _clamp(cp: int) -> int:
+    return max(-CP_LIMIT, min(CP_LIMIT, int(cp)))
+
+
+@dataclass(frozen=True)
+class EvalCurve:
+    """Per-position evaluations of one game, from white's point of view.
+
+    `cp` is an int16 view straight over the stored blob (no copy);
+    `mates` holds the few positions with a forced mate (index -> moves,
+    positive = white mates; 0 = mate on the board, winner given by the cp slot).
+    """
+    cp: Sequence[int]
+    mates: Dict[int, int]
+    black_first: bool = False
+
+    def __len__(self) -> int:
+        return len(self.cp)
+
+    @classmethod
+    def from_evals(cls, evals: List[Any], black_first: bool = False) -> "EvalCurve":
+        """Build from mainline evals (side-to-move POV, None = not evaluated)."""
+        cp = array("h")
+        mates: Dict[int, int] = {}
+        for i, ev in enumerate(evals):
+            if ev is None:
+                cp.append(MISSING)
+                continue
+            white_to_move = (i % 2 == 0) != black_first
+            sign = 1 if white_to_move else -1
+            if ev.mate is not None:
+                mates[i] = sign * ev.mate
+                cp.append(sign * (MATE_CP if ev.mate > 0 else -MATE_CP))
+            else:
+                cp.append(sign * _clamp(ev.cp or 0))
+        return cls(cp=cp, mates=mates, black_first=black_first)
+
+    def encode(self) -> bytes:
+        cp = array("h", self.cp)
+        if sys.byteorder != "little":
+            cp.byteswap()
+        mates = b"".join(_MATE.pack(i, m) for i, m in sorted(self.mates.items()))
+        flags = FLAG_BLACK_FIRST if self.black_first else 0
+        return _HEADER.pack(MAGIC, flags, 0, len(cp)) + cp.tobytes() + mates
+
+    @staticmethod
+    def read_header(blob: bytes) -> Tuple[int, bool]:
+        """(n positions, black_first) without decoding the arrays."""
+        magic, flags, _, n = _HEADER.unpack_from(blob)
+        if magic != MAGIC:
+            raise ValueError("not an eval curve blob")
+        return n, bool(flags & FLAG_BLACK_FIRST)
+
+    @classmethod
+    def decode(cls, blob: bytes) -> "EvalCurve":
+        n, black_first = cls.read_header(blob)
+        start = HEADER_SIZE
+        end = start + 2 * n
+        if sys.byteorder == "little":
+            cp: Sequence[int] = memoryview(blob)[start:end].cast("h")
+        else:
+            cp = array("h", blob[start:end])
+            cp.byteswap()
+        mates = {i: m for i, m in _MATE.iter_unpack(blob[end:])}
+        return cls(cp=cp, mates=mates, black_first=black_first)
+
+    def mate_at(self, index: int) -> Optional[int]:
+        return self.mates.get(index)
@@ -1,7 +1,7 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 @dataclass(frozen=True)
@@ -15,3 +15,13 @@ class Game:
     pgn: str
     opening: Optional[str] = None
     time_control: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PositionEval:
+    """Engine-compatible evaluation (side-to-move point of view)."""
+    cp: Optional[int]
+    mate: Optional[int]
+    best_move_uci: Optional[str]
+    pv_uci: List[str] = field(default_factory=list)
+    score_only: bool = False  # no best move/PV (e.g. taken from a PGN [%eval] comment)
@@ -1,45 +1,36 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import re
 import requests
-from datetime import datetime, timezone
-from typing import List, Optional
-import io
-
-import chess.pgn
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, List, Optional
 
 from chess_coach.domain.models import Game
+from chess_coach.infrastructure.pgn_tokenizer import iter_pgn
 from chess_coach.ports.services import GameSource
 
 CHESSCOM_BASE = "https://api.chess.com/pub"
 
 _RE_URL_ID = re.compile(r"/game/(?:live|daily|computer|analysis)/([0-9]+)")
-_RE_LINK = re.compile(r'^\[(Link|Site)\s+\"(.*)\"\]\s*$')
-
-
-def _extract_game_id_from_headers(pgn_text: str) -> str:
-    # Try Link/Site header
-    link = None
-    for line in pgn_text.splitlines():
-        m = _RE_LINK.match(line.strip())
-        if m:
-            link = m.group(2)
-            break
-        if line.strip() == "" and link:
-            break
-    if link:
-        m2 = _RE_URL_ID.search(link)
-        if m2:
-            return m2.group(1)
-        # fallback stable hash
-        import hashlib
-        return hashlib.sha1(link.encode("utf-8")).hexdigest()[:16]
-    import hashlib
-    return hashlib.sha1(pgn_text.encode("utf-8")).hexdigest()[:16]
-
-
-def _played_at_from_pgn(game: chess.pgn.Game) -> datetime:
-    h = game.headers
+
+
+def _extract_game_id_from_headers(headers: Dict[str, str], pgn_text: str) -> str:
+    # Link holds the game URL; Site is usually just "Chess.com"
+    for link in (headers.get("Link"), headers.get("Site")):
+        if link:
+            m = _RE_URL_ID.search(link)
+            if m:
+                return m.group(1)
+    # fallback stable hash
+    return hashlib.sha1((headers.get("Link") or pgn_text).encode("utf-8")).hexdigest()[:16]
+
+
+def _played_at_from_headers(h: Dict[str, str]) -> datetime:
     # Chess.com often provides UTCDate + UTCTime
     utc_date = h.get("UTCDate")
     utc_time = h.get("UTCTime")
@@ -79,14 +70,83 @@ def _time_control(h: dict) -> Optional[str]:
     return tc or None
 
 
+_RE_ARCHIVE_MONTH = re.compile(r"/games/(\d{4})/(\d{2})/?$")
+# a month's archive is only trusted as final a while after the month ends (late-finishing games)
+ARCHIVE_SETTLE = timedelta(days=1)
+
+
+def _month_closed(archive_url: str, at: Optional[datetime] = None) -> bool:
+    """True if the archive's month was over (and settled) at `at` (default: now)."""
+    m = _RE_ARCHIVE_MONTH.search(archive_url)
+    if not m:
+        return False
+    year, month = int(m.group(1)), int(m.group(2))
+    next_month = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return (at or datetime.now(timezone.utc)) >= next_month + ARCHIVE_SETTLE
+
+
+class ArchiveDiskCache:
+    """Monthly PGN archives on disk, with the validators needed to revalidate them.
+
+    One `<sha1(url)>.pgn` + `.json` (url, etag, last_modified, final) pair per
+    archive. `final` means the copy was fetched after its month closed, so it
+    can never change; other copies are revalidated before use.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str, ext: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ext)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """{"text", "etag", "last_modified", "final"} or None."""
+        try:
+            with open(self._path(url, ".json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(self._path(url, ".pgn"), encoding="utf-8") as f:
+                meta["text"] = f.read()
+        except (OSError, ValueError):
+            return None
+        meta["final"] = bool(meta.get("final"))  # entries written before the flag existed: revalidate
+        return meta
+
+    def put(self, url: str, text: str, etag: Optional[str], last_modified: Optional[str], final: bool = False) -> None:
+        # body first, then meta (both via rename): a reader never sees meta without its body
+        meta = {"url": url, "etag": etag, "last_modified": last_modified, "final": bool(final)}
+        for ext, data in ((".pgn", text), (".json", json.dumps(meta))):
+            path = self._path(url, ext)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+
 class ChessComClient(GameSource):
     """Outbound adapter for Chess.com Published Data API.
 
     It loads games by pulling monthly PGNs from most recent months until it reaches 'limit'.
+    Months are downloaded `max_workers` at a time over one pooled session; with a
+    `cache`, months cached after they closed are read from disk; any other cached
+    month (including one cached while it was still current) is revalidated with
+    ETag / Last-Modified.
     """
 
-    def __init__(self, session: Optional[requests.Session] = None) -> None:
-        self._http = session or requests.Session()
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        max_workers: int = 4,
+        cache: Optional[ArchiveDiskCache] = None,
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.cache = cache
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self._http = session
 
     def _archives(self, username: str) -> List[str]:
         url = f"{CHESSCOM_BASE}/player/{username}/games/archives"
@@ -98,8 +158,26 @@ class ChessComClient(GameSource):
     def _pgn_month(self, archive_url: str) -> str:
         # archive_url: .../games/YYYY/MM
         url = archive_url + "/pgn"
-        r = self._http.get(url, timeout=60)
+        cached = self.cache.get(url) if self.cache is not None else None
+        if cached is not None and cached["final"]:
+            return cached["text"]
+
+        # decided before the request: only a response asked for after the month closed is complete
+        closed = _month_closed(archive_url)
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        r = self._http.get(url, headers=headers, timeout=60)
+        if r.status_code == 304 and cached is not None:
+            if closed:
+                self.cache.put(url, cached["text"], cached.get("etag"), cached.get("last_modified"), final=True)
+            return cached["text"]
         r.raise_for_status()
+        if self.cache is not None:
+            self.cache.put(url, r.text, r.headers.get("ETag"), r.headers.get("Last-Modified"), final=closed)
         return r.text
 
     def fetch_games(self, username: str, limit: int) -> List[Game]:
@@ -108,31 +186,33 @@ class ChessComClient(GameSource):
             return []
 
         games: List[Game] = []
-        # newest months last in archives list
-        for archive_url in reversed(archives):
-            if len(games) >= limit:
-                break
-            pgn_text = self._pgn_month(archive_url)
-            pgn_io = io.StringIO(pgn_text)
-
-            while len(games) < limit:
-                g = chess.pgn.read_game(pgn_io)
-                if g is None:
+        # newest months last in archives list; download them `max_workers` at a time
+        # (in order) until `limit` games are read
+        months = list(reversed(archives))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            for start in range(0, len(months), self.max_workers):
+                if len(games) >= limit:
                     break
-                headers = g.headers
-                pgn_str = str(g).strip()
-                game_id = _extract_game_id_from_headers(pgn_str)
-                played_at = _played_at_from_pgn(g)
-                games.append(Game(
-                    platform="chesscom",
-                    game_id=game_id,
-                    played_at=played_at,
-                    white=headers.get("White", ""),
-                    black=headers.get("Black", ""),
-                    result=_result(headers),
-                    pgn=pgn_str,
-                    opening=_opening(headers),
-                    time_control=_time_control(headers),
-                ))
+                for pgn_text in ex.map(self._pgn_month, months[start:start + self.max_workers]):
+                    if len(games) >= limit:
+                        break
+                    self._read_month(pgn_text, games, limit)
 
         return games
+
+    def _read_month(self, pgn_text: str, games: List[Game], limit: int) -> None:
+        for rec in iter_pgn(pgn_text.splitlines()):
+            if len(games) >= limit:
+                break
+            headers = rec.headers
+            games.append(Game(
+                platform="chesscom",
+                game_id=_extract_game_id_from_headers(headers, rec.text),
+                played_at=_played_at_from_headers(headers),
+                white=headers.get("White", ""),
+                black=headers.get("Black", ""),
+                result=_result(headers),
+                pgn=rec.text,
+                opening=_opening(headers),
+                time_control=_time_control(headers),
+            ))
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set
+
+from chess_coach.infrastructure.engine_supervisor import EngineHealth, SupervisedEngine
+from chess_coach.infrastructure.uci_engine import UciEngine
+
+# priority classes for EnginePool.acquire
+INTERACTIVE = "interactive"  # a user is waiting on this search
+BATCH = "batch"              # mining jobs and bootstraps
+
+
+class _Ticket:
+    __slots__ = ("priority", "user", "engine")
+
+    def __init__(self, priority: str, user: str) -> None:
+        self.priority = priority
+        self.user = user
+        self.engine: Optional[SupervisedEngine] = None
+
+
+class EnginePool:
+    """Fixed-size pool of UCI engine processes (outbound adapter).
+
+    Each engine is a separate Stockfish process (UciEngine) configured with
+    its own Threads/Hash. Processes are spawned lazily, so an idle API worker
+    does not pay for engines it never uses. Every engine is supervised
+    (per-search `timeout_s`, respawn and `retries`); `health` aggregates
+    the counters of all of them.
+
+    Engines are handed out by priority: interactive requests go first, batch
+    work never holds more than `batch_limit` engines (the rest are kept for
+    interactive requests) and waiting batch requests are served round-robin
+    across users, so one large mining job cannot starve everybody else.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        path: str = "stockfish",
+        depth: int = 8,
+        threads: int = 1,
+        hash_mb: int = 64,
+        factory: Optional[Callable[[], Any]] = None,
+        timeout_s: Optional[float] = 30.0,
+        retries: int = 1,
+        interactive_reserve: int = 0,
+    ) -> None:
+        self.size = max(1, int(size))
+        self.path = path
+        self.depth = int(depth)
+        self.threads = max(1, int(threads))
+        self.hash_mb = max(1, int(hash_mb))
+        self.timeout_s = timeout_s
+        self.retries = retries
+        self.interactive_reserve = max(0, int(interactive_reserve))
+        # a single engine cannot be reserved: batch work then shares it with interactive requests
+        self.batch_limit = max(1, self.size - self.interactive_reserve)
+        self.health = EngineHealth()
+        self._raw_factory = factory or self._spawn
+        self._idle: List[SupervisedEngine] = []
+        self._engines: List[SupervisedEngine] = []
+        self._retired: Set[int] = set()  # ids of busy engines from an older configuration
+        self._cond = threading.Condition()
+        self._interactive: Deque[_Ticket] = deque()
+        self._batch: "OrderedDict[str, Deque[_Ticket]]" = OrderedDict()  # user -> waiting tickets
+        self._batch_busy = 0
+        self._closed = False
+
+    @property
+    def settings(self) -> str:
+        """Short description of the search settings, stored with analysis results."""
+        return f"stockfish depth={self.depth}"
+
+    def _spawn(self) -> UciEngine:
+        # Threads/Hash go out with the process start, before its first search
+        return UciEngine(path=self.path, depth=self.depth, options={"Threads": self.threads, "Hash": self.hash_mb})
+
+    def _factory(self) -> SupervisedEngine:
+        return SupervisedEngine(self._raw_factory, timeout_s=self.timeout_s, retries=self.retries, health=self.health)
+
+    def _free_engine(self) -> Optional[SupervisedEngine]:
+        if self._idle:
+            return self._idle.pop()
+        if len(self._engines) < self.size:
+            engine = self._factory()  # cheap: the process starts on its first search
+            self._engines.append(engine)
+            return engine
+        return None
+
+    def _dispatch(self) -> None:
+        """Hand free engines to waiting tickets (called with the lock held)."""
+        while self._interactive or (self._batch and self._batch_busy < self.batch_limit):
+            engine = self._free_engine()
+            if engine is None:
+                break  # tickets granted above must still be woken
+            if self._interactive:
+                ticket = self._interactive.popleft()
+            else:
+                # round-robin: serve the user at the head, then move them to the back
+                user, waiting = next(iter(self._batch.items()))
+                ticket = waiting.popleft()
+                self._batch.pop(user)
+                if waiting:
+                    self._batch[user] = waiting
+                self._batch_busy += 1
+            ticket.engine = engine
+        self._cond.notify_all()
+
+    def _take(self, priority: str, user: str) -> SupervisedEngine:
+        ticket = _Ticket(priority, user)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("EnginePool is closed")
+            if priority == INTERACTIVE:
+                self._interactive.append(ticket)
+            else:
+                self._batch.setdefault(user, deque()).append(ticket)
+            self._dispatch()
+            while ticket.engine is None:
+                if self._closed:
+                    raise RuntimeError("EnginePool is closed")
+                self._cond.wait()
+        return ticket.engine
+
+    def _give_back(self, engine: SupervisedEngine, priority: str) -> None:
+        with self._cond:
+            if priority != INTERACTIVE:
+                self._batch_busy -= 1
+            if self._closed:
+                return
+            retired = id(engine) in self._retired
+            if retired:
+                self._retired.discard(id(engine))
+                self._engines.remove(engine)
+            else:
+                self._idle.append(engine)
+            self._dispatch()
+        if retired:
+            self._close_all([engine])
+
+    def reconfigure(self, size: int, threads: int, hash_mb: int) -> None:
+        """Switch to a new size / Threads / Hash without interrupting searches.
+
+        Idle engines are closed now and busy ones when they are given back;
+        their replacements are spawned with the new options on demand.
+        """
+        size, threads, hash_mb = max(1, int(size)), max(1, int(threads)), max(1, int(hash_mb))
+        with self._cond:
+            if self._closed or (size, threads, hash_mb) == (self.size, self.threads, self.hash_mb):
+                return
+            self.size, self.threads, self.hash_mb = size, threads, hash_mb
+            self.batch_limit = max(1, self.size - self.interactive_reserve)
+            idle, self._idle = self._idle, []
+            self._engines = [e for e in self._engines if e not in idle]
+            self._retired = {id(e) for e in self._engines}
+            self._dispatch()
+        self._close_all(idle)
+
+    @contextmanager
+    def acquire(self, priority: str = BATCH, user: Optional[str] = None) -> Iterator[SupervisedEngine]:
+        """Borrow one engine; blocks until the scheduler grants one.
+
+        `user` groups batch requests for fairness (None = one shared group).
+        """
+        engine = self._take(priority, user or "")
+        try:
+            yield engine
+        finally:
+            self._give_back(engine, priority)
+
+    def scheduler_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "batch_limit": self.batch_limit,
+                "batch_busy": self._batch_busy,
+                "waiting_interactive": len(self._interactive),
+                "waiting_batch": sum(len(q) for q in self._batch.values()),
+                "waiting_users": len(self._batch),
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            engines, self._engines, self._idle = self._engines, [], []
+            self._cond.notify_all()
+        self._close_all(engines)
+
+    @staticmethod
+    def _close_all(engines: List[SupervisedEngine]) -> None:
+        for engine in engines:
+            try:
+                engine.close()
+            except Exception:
+                pass
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+HASH_MIN_MB = 16
+HASH_MAX_MB = 512         # mining searches are shallow: more hash buys nothing
+HASH_MEMORY_FRACTION = 0.25  # share of the machine's memory all engine hash tables may use
+MAX_THREADS = 4           # Stockfish SMP gains little at mining depths beyond this
+DEEP_QUEUE = 2            # pending jobs from which throughput matters more than latency
+
+
+@dataclass(frozen=True)
+class EngineResources:
+    """Engine processes and per-process Threads/Hash chosen for this machine."""
+    pool_size: int
+    threads: int
+    hash_mb: int
+    cores: int
+    memory_mb: Optional[int]
+    queue_depth: int
+    source: str  # "auto", or "env" when at least one value was set explicitly
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def detect_cores() -> int:
+    """CPUs this process may use: affinity mask, capped by a cgroup v2 CPU quota."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cores = os.cpu_count() or 1
+    quota = (_read("/sys/fs/cgroup/cpu.max") or "").split()
+    if len(quota) == 2 and quota[0] != "max":
+        try:
+            cores = min(cores, max(1, int(int(quota[0]) / int(quota[1]))))
+        except (ValueError, ZeroDivisionError):
+            pass
+    return max(1, cores)
+
+
+def detect_memory_mb() -> Optional[int]:
+    """Memory available to this process: cgroup limit if any, else physical memory."""
+    limit = _read("/sys/fs/cgroup/memory.max") or _read("/sys/fs/cgroup/memory/memory.limit_in_bytes")
+    physical: Optional[int] = None
+    try:
+        physical = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        pass
+    if limit and limit.isdigit():
+        limit_mb = int(limit) // (1024 * 1024)
+        if physical is None or limit_mb < physical:  # cgroup v1 reports a huge number when unlimited
+            return limit_mb
+    return physical
+
+
+def is_deep_queue(queue_depth: int) -> bool:
+    """Whether a backlog this size makes the plan favour throughput over latency."""
+    return queue_depth >= DEEP_QUEUE
+
+
+def _pow2_floor(n: int) -> int:
+    return 1 << (max(1, n).bit_length() - 1)
+
+
+def plan_engine_resources(
+    cores: int,
+    memory_mb: Optional[int],
+    queue_depth: int = 0,
+    pools: int = 1,
+    pool_size: Optional[int] = None,
+    threads: Optional[int] = None,
+    hash_mb: Optional[int] = None,
+) -> EngineResources:
+    """Pick pool size, Threads and Hash without oversubscribing cores.
+
+    With a backlog of jobs, mining throughput comes from searching games in
+    parallel, so every core gets its own single-threaded process. With an
+    idle queue, fewer processes with 2 threads each answer interactive and
+    bootstrap searches faster. Hash is a fixed share of memory split over
+    all processes of all `pools` (e.g. main + triage). Explicit values win.
+    """
+    explicit = any(v is not None for v in (pool_size, threads, hash_mb))
+    cores = max(1, int(cores))
+    if threads is None:
+        threads = 1 if is_deep_queue(queue_depth) or cores < 4 else 2
+        if pool_size is not None:
+            threads = max(1, min(MAX_THREADS, cores // max(1, pool_size)))
+    threads = max(1, int(threads))
+    if pool_size is None:
+        pool_size = max(1, cores // threads)
+    pool_size = max(1, int(pool_size))
+    if hash_mb is None:
+        if memory_mb:
+            per_process = int(memory_mb * HASH_MEMORY_FRACTION) // (pool_size * max(1, pools))
+            hash_mb = max(HASH_MIN_MB, min(HASH_MAX_MB, _pow2_floor(per_process)))
+        else:
+            hash_mb = 64
+    return EngineResources(
+        pool_size=pool_size,
+        threads=threads,
+        hash_mb=int(hash_mb),
+        cores=cores,
+        memory_mb=memory_mb,
+        queue_depth=int(queue_depth),
+        source="env" if explicit else "auto",
+    )
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Deque, Dict, Optional
+
+import chess
+
+# engine methods run under supervision (timeout, respawn, retry)
+SUPERVISED = ("analyze", "analyze_multipv")
+
+
+class EngineFailure(RuntimeError):
+    """A search failed on every attempt (crash or timeout each time)."""
+
+
+def _percentile(sorted_ms: list, q: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    i = min(len(sorted_ms) - 1, int(round(q * (len(sorted_ms) - 1))))
+    return round(sorted_ms[i], 1)
+
+
+class EngineHealth:
+    """Thread-safe counters shared by the engines of one pool (for /health)."""
+
+    def __init__(self, window: int = 2048) -> None:
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.searches = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.restarts = 0
+
+    def record(self, ms: float) -> None:
+        with self._lock:
+            self.searches += 1
+            self._latencies.append(ms)
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lat = sorted(self._latencies)
+            return {
+                "searches": self.searches,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "retries": self.retries,
+                "restarts": self.restarts,
+                "p50_ms": _percentile(lat, 0.50),
+                "p99_ms": _percentile(lat, 0.99),
+            }
+
+
+class SupervisedEngine:
+    """Engine wrapper that survives hung or crashed Stockfish processes.
+
+    Each search runs on a private thread with a wall-clock limit. A search
+    that raises or times out throws the process away (closed in the
+    background, so a hung process cannot block the caller), spawns a fresh
+    one from `factory` and retries up to `retries` times.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        timeout_s: Optional[float] = 30.0,
+        retries: int = 1,
+        health: Optional[EngineHealth] = None,
+    ) -> None:
+        self._factory = factory
+        self.timeout_s = timeout_s if timeout_s and timeout_s > 0 else None
+        self.retries = max(0, int(retries))
+        self.health = health or EngineHealth()
+        self._options: Dict[str, Any] = {}
+        self._engine: Any = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _ensure(self) -> Any:
+        if self._engine is None:
+            self._engine = self._factory()
+            if self._options:
+                self._engine.configure(self._options)  # respawned processes keep their options
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine")
+        return self._engine
+
+    def _discard(self, background: bool = True) -> None:
+        engine, executor = self._engine, self._executor
+        self._engine, self._executor = None, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if engine is None:
+            return
+        if background:
+            threading.Thread(target=_close_quietly, args=(engine,), daemon=True).start()
+        else:
+            _close_quietly(engine)
+
+    def _call(self, method: str, board: chess.Board, *args: Any) -> Any:
+        last: Optional[BaseException] = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.health.incr("retries")
+            engine = self._ensure()
+            t0 = time.perf_counter()
+            # the worker gets its own copy: after a timeout it may still be running
+            future = self._executor.submit(getattr(engine, method), board.copy(), *args)
+            try:
+                result = future.result(timeout=self.timeout_s)
+            except FutureTimeout as e:
+                self.health.incr("timeouts")
+                last = e
+            except Exception as e:
+                self.health.incr("failures")
+                last = e
+            else:
+                self.health.record((time.perf_counter() - t0) * 1000.0)
+                return result
+            self._discard()
+            self.health.incr("restarts")
+        raise EngineFailure(f"{method} failed after {self.retries + 1} attempts: {last!r}")
+
+    def analyze(self, board: chess.Board) -> Any:
+        return self._call("analyze", board)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        # optional engine capabilities (analyze_multipv, ...) exist only if the engine has them
+        attr = getattr(self._ensure(), name)
+        if name in SUPERVISED:
+            return lambda board, *args: self._call(name, board, *args)
+        return attr
+
+    def configure(self, options: Dict[str, Any]) -> None:
+        self._options.update(options)
+        self._ensure().configure(options)
+
+    def close(self) -> None:
+        self._discard(background=False)
+
+
+def _close_quietly(engine: Any) -> None:
+    try:
+        engine.close()
+    except Exception:
+        pass
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import chess
+import chess.polyglot
+
+from chess_coach.domain.models import PositionEval
+
+
+def position_key(board: chess.Board) -> int:
+    """Polyglot Zobrist hash as a signed 64-bit int (fits SQLite INTEGER)."""
+    h = chess.polyglot.zobrist_hash(board)
+    return h - (1 << 64) if h >= (1 << 63) else h
+
+
+class SqliteEvalCache:
+    """Two-tier position evaluation cache (outbound adapter).
+
+    Keyed by Zobrist hash + search limit (depth, nodes). A cached result
+    satisfies any request whose depth and nodes are both <= the cached ones,
+    so a deep search answers later shallow requests for free.
+
+    - tier 1: in-process LRU (deepest result per position)
+    - tier 2: SQLite table `eval_cache`, shared across users and restarts
+    """
+
+    def __init__(self, db_path: str = "chess_coach.db", memory_size: int = 50_000, flush_every: int = 64) -> None:
+        self.db_path = db_path
+        self.memory_size = max(0, int(memory_size))
+        self.flush_every = max(1, int(flush_every))
+        self._lru: "OrderedDict[int, Tuple[int, int, PositionEval]]" = OrderedDict()
+        self._pending: List[Tuple] = []
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        with self._connect() as con:
+            con.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+
+                CREATE TABLE IF NOT EXISTS eval_cache (
+                    zhash INTEGER NOT NULL,
+                    depth INTEGER NOT NULL,
+                    nodes INTEGER NOT NULL,
+                    cp INTEGER,
+                    mate INTEGER,
+                    best_uci TEXT,
+                    pv_uci TEXT,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY(zhash, depth, nodes)
+                ) WITHOUT ROWID;
+                """
+            )
+
+    # -----------------------
+    # Memory tier
+    # -----------------------
+    def _remember(self, key: int, depth: int, nodes: int, ev: PositionEval) -> None:
+        if not self.memory_size:
+            return
+        cur = self._lru.get(key)
+        if cur is not None and cur[0] >= depth and cur[1] >= nodes:
+            self._lru.move_to_end(key)
+            return
+        self._lru[key] = (depth, nodes, ev)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.memory_size:
+            self._lru.popitem(last=False)
+
+    # -----------------------
+    # Public API
+    # -----------------------
+    def get(self, key: int, depth: int, nodes: int = 0) -> Optional[PositionEval]:
+        with self._lock:
+            cur = self._lru.get(key)
+            if cur is not None and cur[0] >= depth and cur[1] >= nodes:
+                self._lru.move_to_end(key)
+                self.memory_hits += 1
+                return cur[2]
+
+        with self._connect() as con:
+            r = con.execute(
+                """
+                SELECT depth, nodes, cp, mate, best_uci, pv_uci
+                FROM eval_cache
+                WHERE zhash=? AND depth>=? AND nodes>=?
+                ORDER BY depth DESC, nodes DESC
+                LIMIT 1
+                """,
+                (key, int(depth), int(nodes)),
+            ).fetchone()
+
+        with self._lock:
+            if r is None:
+                self.misses += 1
+                return None
+            self.db_hits += 1
+            ev = PositionEval(
+                cp=r["cp"],
+                mate=r["mate"],
+                best_move_uci=r["best_uci"],
+                pv_uci=(r["pv_uci"] or "").split(),
+            )
+            self._remember(key, int(r["depth"]), int(r["nodes"]), ev)
+            return ev
+
+    def put(self, key: int, depth: int, nodes: int, ev: Any) -> PositionEval:
+        stored = PositionEval(
+            cp=ev.cp,
+            mate=ev.mate,
+            best_move_uci=ev.best_move_uci,
+            pv_uci=list(ev.pv_uci or []),
+        )
+        with self._lock:
+            self._remember(key, int(depth), int(nodes), stored)
+            self._pending.append((
+                key, int(depth), int(nodes), stored.cp, stored.mate,
+                stored.best_move_uci, " ".join(stored.pv_uci), datetime.utcnow().isoformat(),
+            ))
+            should_flush = len(self._pending) >= self.flush_every
+        if should_flush:
+            self.flush()
+        return stored
+
+    def flush(self) -> None:
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return
+        with self._connect() as con:
+            con.executemany(
+                """
+                INSERT OR REPLACE INTO eval_cache
+                  (zhash, depth, nodes, cp, mate, best_uci, pv_uci, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.db_hits
+            total = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "hit_rate": (hits / total) if total else 0.0,
+                "memory_entries": len(self._lru),
+            }
+
+
+class CachedEngine:
+    """Engine decorator: answers `analyze` from an eval cache when it can.
+
+    Hit/miss counters are per instance, so a short-lived wrapper (e.g. one
+    per mined game) measures exactly the engine work it saved.
+    """
+
+    def __init__(self, engine, cache: SqliteEvalCache, nodes: int = 0) -> None:
+        self.engine = engine
+        self.cache = cache
+        self.depth = int(getattr(engine, "depth", 0) or 0)
+        self.nodes = int(nodes)
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, board: chess.Board):
+        key = position_key(board)
+        ev = self.cache.get(key, self.depth, self.nodes)
+        if ev is not None:
+            self.hits += 1
+            return ev
+        self.misses += 1
+        return self.cache.put(key, self.depth, self.nodes, self.engine.analyze(board))
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class Job:
+    id: int
+    kind: str
+    username: str
+    platform: str
+    payload: Dict[str, Any]
+    state: str
+    attempts: int
+    max_attempts: int
+    error: Optional[str]
+    result: Optional[Dict[str, Any]]
+    progress: Optional[Dict[str, Any]]
+    created_at: str
+    updated_at: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "username": self.username,
+            "platform": self.platform,
+            "state": self.state,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "error": self.error,
+            "result": self.result,
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class SqliteJobQueue:
+    """Durable job queue on SQLite (outbound adapter).
+
+    - states: queued -> running -> done | failed (retried while attempts < max_attempts)
+    - per-user dedup: at most one queued/running job per (username, kind)
+    - running jobs hold a lease; a job whose worker died is re-claimed after it expires
+      (that counts as an attempt), and only the lease holder may report or finish it
+    """
+
+    def __init__(self, db_path: str = "chess_coach.db") -> None:
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        with self._connect() as con:
+            con.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    username TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    payload_json TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL DEFAULT 3,
+                    error TEXT,
+                    result_json TEXT,
+                    progress_json TEXT,
+                    run_after TEXT NOT NULL,
+                    lease_until TEXT,
+                    worker TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_user_kind
+                    ON jobs(username, kind) WHERE state IN ('queued', 'running');
+                CREATE INDEX IF NOT EXISTS idx_jobs_state_run_after ON jobs(state, run_after);
+                CREATE INDEX IF NOT EXISTS idx_jobs_user_created ON jobs(username, created_at DESC);
+                """
+            )
+
+    @staticmethod
+    def _row_to_job(r: sqlite3.Row) -> Job:
+        return Job(
+            id=int(r["id"]),
+            kind=r["kind"],
+            username=r["username"],
+            platform=r["platform"],
+            payload=json.loads(r["payload_json"]),
+            state=r["state"],
+            attempts=int(r["attempts"]),
+            max_attempts=int(r["max_attempts"]),
+            error=r["error"],
+            result=json.loads(r["result_json"]) if r["result_json"] else None,
+            progress=json.loads(r["progress_json"]) if r["progress_json"] else None,
+            created_at=r["created_at"],
+            updated_at=r["updated_at"],
+        )
+
+    # -----------------------
+    # Producer side
+    # -----------------------
+    def enqueue(
+        self,
+        kind: str,
+        username: str,
+        platform: str,
+        payload: Dict[str, Any],
+        max_attempts: int = 3,
+    ) -> Tuple[Job, bool]:
+        """Enqueue a job. Returns (job, created); created=False means an
+        equivalent job for this user was already queued or running."""
+        now = datetime.utcnow().isoformat()
+        with self._connect() as con:
+            try:
+                cur = con.execute(
+                    """
+                    INSERT INTO jobs
+                      (kind, username, platform, payload_json, state, max_attempts, run_after, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (kind, username, platform, json.dumps(payload, ensure_ascii=False), JOB_QUEUED,
+                     int(max_attempts), now, now, now),
+                )
+                job_id, created = int(cur.lastrowid), True
+            except sqlite3.IntegrityError:
+                r = con.execute(
+                    "SELECT id FROM jobs WHERE username=? AND kind=? AND state IN (?, ?)",
+                    (username, kind, JOB_QUEUED, JOB_RUNNING),
+                ).fetchone()
+                job_id, created = int(r["id"]), False
+        return self.get(job_id), created
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._connect() as con:
+            r = con.execute("SELECT * FROM jobs WHERE id=?", (job_id,)).fetchone()
+        return self._row_to_job(r) if r else None
+
+    def list_jobs(self, username: str, limit: int = 20) -> List[Job]:
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT * FROM jobs WHERE username=? ORDER BY created_at DESC LIMIT ?",
+                (username, limit),
+            ).fetchall()
+        return [self._row_to_job(r) for r in rows]
+
+    def count_pending(self) -> int:
+        with self._connect() as con:
+            r = con.execute(
+                "SELECT COUNT(*) AS c FROM jobs WHERE state IN (?, ?)", (JOB_QUEUED, JOB_RUNNING)
+            ).fetchone()
+        return int(r["c"])
+
+    # -----------------------
+    # Worker side
+    # -----------------------
+    def claim(self, worker: str, lease_s: int = 1800) -> Optional[Job]:
+        """Atomically take the oldest runnable job (or one whose lease expired).
+
+        An expired job that already used its `max_attempts` is failed instead
+        of being handed out again.
+        """
+        now = datetime.utcnow()
+        now_s = now.isoformat()
+        lease = (now + timedelta(seconds=lease_s)).isoformat()
+        con = self._connect()
+        try:
+            con.execute("BEGIN IMMEDIATE")
+            con.execute(
+                """
+                UPDATE jobs
+                SET state=?, error=?, lease_until=NULL, worker=NULL, updated_at=?
+                WHERE state=? AND lease_until<? AND attempts>=max_attempts
+                """,
+                (JOB_FAILED, "lease expired: worker lost", now_s, JOB_RUNNING, now_s),
+            )
+            r = con.execute(
+                """
+                SELECT id FROM jobs
+                WHERE (state=? AND run_after<=?) OR (state=? AND lease_until<?)
+                ORDER BY run_after ASC, id ASC
+                LIMIT 1
+                """,
+                (JOB_QUEUED, now_s, JOB_RUNNING, now_s),
+            ).fetchone()
+            if r is None:
+                con.execute("COMMIT")
+                return None
+            con.execute(
+                """
+                UPDATE jobs
+                SET state=?, attempts=attempts+1, lease_until=?, worker=?, updated_at=?
+                WHERE id=?
+                """,
+                (JOB_RUNNING, lease, worker, now_s, int(r["id"])),
+            )
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        finally:
+            con.close()
+        return self.get(int(r["id"]))
+
+    # report_progress / complete / fail only touch a job `worker` still owns;
+    # they return False once its lease expired and another worker claimed it.
+
+    def report_progress(self, job_id: int, worker: str, progress: Dict[str, Any], lease_s: int = 1800) -> bool:
+        """Store progress and extend the lease (doubles as a heartbeat)."""
+        now = datetime.utcnow()
+        with self._connect() as con:
+            cur = con.execute(
+                "UPDATE jobs SET progress_json=?, lease_until=?, updated_at=? WHERE id=? AND state=? AND worker=?",
+                (json.dumps(progress, ensure_ascii=False), (now + timedelta(seconds=lease_s)).isoformat(),
+                 now.isoformat(), job_id, JOB_RUNNING, worker),
+            )
+        return cur.rowcount > 0
+
+    def complete(self, job_id: int, worker: str, result: Dict[str, Any]) -> bool:
+        now = datetime.utcnow().isoformat()
+        with self._connect() as con:
+            cur = con.execute(
+                """
+                UPDATE jobs SET state=?, result_json=?, error=NULL, lease_until=NULL, updated_at=?
+                WHERE id=? AND state=? AND worker=?
+                """,
+                (JOB_DONE, json.dumps(result, ensure_ascii=False), now, job_id, JOB_RUNNING, worker),
+            )
+        return cur.rowcount > 0
+
+    def fail(self, job_id: int, worker: str, error: str, backoff_s: int = 30) -> bool:
+        """Record a failed attempt: re-queue with exponential backoff, or give up."""
+        now = datetime.utcnow()
+        with self._connect() as con:
+            r = con.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id=? AND state=? AND worker=?",
+                (job_id, JOB_RUNNING, worker),
+            ).fetchone()
+            if r is None:
+                return False
+            attempts = int(r["attempts"])
+            if attempts < int(r["max_attempts"]):
+                run_after = now + timedelta(seconds=backoff_s * (2 ** (attempts - 1)))
+                state, run_after_s = JOB_QUEUED, run_after.isoformat()
+            else:
+                state, run_after_s = JOB_FAILED, None
+            cur = con.execute(
+                """
+                UPDATE jobs SET state=?, error=?, run_after=COALESCE(?, run_after), lease_until=NULL, updated_at=?
+                WHERE id=? AND state=? AND worker=?
+                """,
+                (state, error, run_after_s, now.isoformat(), job_id, JOB_RUNNING, worker),
+            )
+        return cur.rowcount > 0
@@ -1,95 +1,143 @@
 from __future__ import annotations
 
+import json
 import requests
 from datetime import datetime, timezone
-from typing import List, Optional
-import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from chess_coach.domain.models import Game
+from chess_coach.infrastructure.pgn_tokenizer import iter_pgn
 from chess_coach.ports.services import GameSource
 
-
-_RE_TAG = re.compile(r'^\[(\w+)\s+\"(.*)\"\]\s*$')
-
-
-def _split_pgn_games(pgn_text: str) -> List[str]:
-    chunks: List[str] = []
-    current: List[str] = []
-
-    for line in pgn_text.splitlines():
-        if line.startswith("[Event ") and current:
-            chunks.append("\n".join(current).strip())
-            current = [line]
-        else:
-            current.append(line)
-
-    if current:
-        last = "\n".join(current).strip()
-        if last:
-            chunks.append(last)
-
-    return chunks
-
-
-def _get_tag(pgn: str, name: str) -> Optional[str]:
-    for line in pgn.splitlines():
-        m = _RE_TAG.match(line.strip())
-        if not m:
-            continue
-        if m.group(1) == name:
-            return m.group(2)
-    return None
+# game statuses without a result: stored as "*" so they never count as draws
+_UNFINISHED_STATUSES = frozenset(("created", "started", "aborted", "noStart", "unknownFinish"))
+
+
+def _game_from_headers(headers: Dict[str, str], pgn: str) -> Game:
+    site = headers.get("Site") or ""
+    game_id = site.rsplit("/", 1)[-1] if "/" in site else (site or "unknown")
+
+    utc_date = headers.get("UTCDate")
+    utc_time = headers.get("UTCTime")
+    played_at = datetime.now(tz=timezone.utc)
+    if utc_date and utc_time:
+        try:
+            played_at = datetime.strptime(
+                f"{utc_date} {utc_time}", "%Y.%m.%d %H:%M:%S"
+            ).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+
+    time_control = headers.get("TimeControl")
+    if time_control == "-":
+        time_control = None
+
+    return Game(
+        platform="lichess",
+        game_id=game_id,
+        played_at=played_at,
+        white=headers.get("White") or "white",
+        black=headers.get("Black") or "black",
+        result=headers.get("Result") or "*",
+        pgn=pgn,
+        opening=headers.get("Opening"),
+        time_control=time_control,
+    )
+
+
+def _player_name(player: Dict[str, Any], default: str) -> str:
+    user = player.get("user") or {}
+    if user.get("name"):
+        return user["name"]
+    if player.get("aiLevel"):
+        return f"Stockfish level {player['aiLevel']}"
+    return default
+
+
+def _game_from_json(obj: Dict[str, Any]) -> Game:
+    """Game from one NDJSON export line (requested with pgnInJson=true): no header scan."""
+    players = obj.get("players") or {}
+    winner = obj.get("winner")
+    if winner == "white":
+        result = "1-0"
+    elif winner == "black":
+        result = "0-1"
+    elif obj.get("status") in _UNFINISHED_STATUSES:
+        result = "*"
+    else:
+        result = "1/2-1/2"
+    clock = obj.get("clock") or {}
+    time_control = f"{clock['initial']}+{clock['increment']}" if "initial" in clock else None
+    created = obj.get("createdAt")
+    played_at = (
+        datetime.fromtimestamp(created / 1000.0, tz=timezone.utc) if created else datetime.now(tz=timezone.utc)
+    )
+    return Game(
+        platform="lichess",
+        game_id=obj.get("id") or "unknown",
+        played_at=played_at,
+        white=_player_name(players.get("white") or {}, "white"),
+        black=_player_name(players.get("black") or {}, "black"),
+        result=result,
+        pgn=(obj.get("pgn") or "").strip(),
+        opening=(obj.get("opening") or {}).get("name"),
+        time_control=time_control,
+    )
+
+
+def _batched(games: Iterable[Game], batch_size: int) -> Iterator[List[Game]]:
+    batch: List[Game] = []
+    for g in games:
+        batch.append(g)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 class LichessClient(GameSource):
     BASE = "https://lichess.org"
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, fmt: str = "pgn") -> None:
+        if fmt not in ("pgn", "ndjson"):
+            raise ValueError(f"Unknown Lichess export format: {fmt}")
+        self.fmt = fmt
 
     def fetch_games(self, username: str, limit: int) -> List[Game]:
+        return [g for batch in self.iter_games(username, limit) for g in batch]
+
+    def iter_games(
+        self, username: str, limit: Optional[int] = None, batch_size: int = 200, since: Optional[datetime] = None,
+    ) -> Iterator[List[Game]]:
+        """Stream the export: games are parsed while the response downloads and
+        yielded in batches of `batch_size`, so memory does not grow with the history.
+
+        Newest games first; `limit=None` exports every game, `since` only the
+        games started at or after that time.
+        """
         url = f"{self.BASE}/api/games/user/{username}"
-        headers = {"Accept": "application/x-chess-pgn"}
-        params = {"max": limit, "opening": "true", "clocks": "true"}
-
-        r = requests.get(url, headers=headers, params=params, timeout=30)
-        if r.status_code == 404:
-            raise ValueError(f"Usuario '{username}' no encontrado en Lichess (404).")
-        r.raise_for_status()
-
-        games: List[Game] = []
-        for pgn in _split_pgn_games(r.text):
-            site = _get_tag(pgn, "Site") or ""
-            game_id = site.rsplit("/", 1)[-1] if "/" in site else (site or "unknown")
-
-            utc_date = _get_tag(pgn, "UTCDate")
-            utc_time = _get_tag(pgn, "UTCTime")
-            played_at = datetime.now(tz=timezone.utc)
-            if utc_date and utc_time:
-                try:
-                    played_at = datetime.strptime(
-                        f"{utc_date} {utc_time}", "%Y.%m.%d %H:%M:%S"
-                    ).replace(tzinfo=timezone.utc)
-                except ValueError:
-                    pass
-
-            white = _get_tag(pgn, "White") or "white"
-            black = _get_tag(pgn, "Black") or "black"
-            result = _get_tag(pgn, "Result") or "*"
-            opening = _get_tag(pgn, "Opening")
-            time_control = _get_tag(pgn, "TimeControl")
-            if time_control == "-":
-                time_control = None
-
-            games.append(
-                Game(
-                    platform="lichess",
-                    game_id=game_id,
-                    played_at=played_at,
-                    white=white,
-                    black=black,
-                    result=result,
-                    pgn=pgn,
-                    opening=opening,
-                    time_control=time_control,
-                )
-            )
-
-        return games
+        ndjson = self.fmt == "ndjson"
+        headers = {"Accept": "application/x-ndjson" if ndjson else "application/x-chess-pgn"}
+        # evals=true: games with server analysis come with [%eval] comments, which
+        # blunder mining uses instead of running the engine on every ply
+        params: Dict[str, Any] = {"opening": "true", "clocks": "true", "evals": "true"}
+        if limit is not None:
+            params["max"] = limit
+        if since is not None:
+            params["since"] = int(since.timestamp() * 1000)
+        if ndjson:
+            params["pgnInJson"] = "true"
+
+        with requests.get(url, headers=headers, params=params, timeout=30, stream=True) as r:
+            if r.status_code == 404:
+                raise ValueError(f"Usuario '{username}' no encontrado en Lichess (404).")
+            r.raise_for_status()
+            r.encoding = "utf-8"
+            lines = r.iter_lines(chunk_size=self.CHUNK_SIZE, decode_unicode=True)
+            if ndjson:
+                games: Iterable[Game] = (_game_from_json(json.loads(line)) for line in lines if line.strip())
+            else:
+                games = (_game_from_headers(rec.headers, rec.text) for rec in iter_pgn(lines))
+            yield from _batched(games, batch_size)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+
+class PolyglotBook:
+    """Local Polyglot opening book (.bin) (outbound adapter).
+
+    Used to tell theory from the player's own moves: mining does not search
+    book positions, and each game records where it left the book.
+    """
+
+    def __init__(self, path: str, min_weight: int = 1) -> None:
+        self.path = path
+        self.min_weight = int(min_weight)
+        self._reader = chess.polyglot.open_reader(path)
+
+    def is_book_move(self, board: chess.Board, move: chess.Move) -> bool:
+        return any(e.move == move for e in self._reader.find_all(board, minimum_weight=self.min_weight))
+
+    def book_plies(self, game: chess.pgn.Game) -> int:
+        """Number of leading mainline plies that are book moves (0 = out of book at once)."""
+        board = game.board()
+        n = 0
+        for move in game.mainline_moves():
+            if not self.is_book_move(board, move):
+                break
+            board.push(move)
+            n += 1
+        return n
+
+    def close(self) -> None:
+        self._reader.close()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from chess_coach.domain.models import Game
+from chess_coach.infrastructure.pgn_tokenizer import PgnRecord, iter_pgn
+
+GAME_START = b"\n[Event "
+CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def _played_at(h: Dict[str, str]) -> datetime:
+    date = (h.get("UTCDate") or h.get("Date") or "").replace("??", "01")
+    time = h.get("UTCTime") or "00:00:00"
+    try:
+        return datetime.strptime(f"{date} {time}", "%Y.%m.%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return datetime.now(tz=timezone.utc)
+
+
+def game_from_record(rec: PgnRecord, platform: Optional[str] = None) -> Game:
+    """Game from a PGN file entry.
+
+    Lichess database games keep their lichess id (and platform), so they
+    match games imported over the API; other games (OTB, engines) get a
+    stable hash of their text as id.
+    """
+    h = rec.headers
+    site = h.get("Site") or ""
+    if "lichess.org/" in site:
+        game_id = site.rstrip("/").rsplit("/", 1)[-1]
+        platform = platform or "lichess"
+    else:
+        game_id = hashlib.sha1(rec.text.encode("utf-8")).hexdigest()[:16]
+        platform = platform or "pgn"
+    time_control = h.get("TimeControl")
+    return Game(
+        platform=platform,
+        game_id=game_id,
+        played_at=_played_at(h),
+        white=h.get("White") or "white",
+        black=h.get("Black") or "black",
+        result=h.get("Result") or "*",
+        pgn=rec.text,
+        opening=h.get("Opening"),
+        time_control=None if time_control in (None, "-", "?") else time_control,
+    )
+
+
+def _parse_range(path: str, start: int, end: int, platform: Optional[str], player: Optional[str]) -> List[Game]:
+    """Worker: parse the games in bytes [start, end) of `path` (a process pool task)."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode("utf-8-sig", errors="replace")
+    wanted = player.lower() if player else None
+    games: List[Game] = []
+    for rec in iter_pgn(text.splitlines()):
+        if wanted and wanted not in ((rec.headers.get("White") or "").lower(), (rec.headers.get("Black") or "").lower()):
+            continue
+        games.append(game_from_record(rec, platform))
+    return games
+
+
+class PgnFileReader:
+    """Reads a (multi-GB) PGN file in game-aligned chunks over a process pool.
+
+    The file is memory-mapped; chunk ends are moved forward to the next
+    `[Event` line, so every chunk holds whole games and is parsed on its own
+    by a worker. Chunks come back in file order with the byte offset where
+    the next chunk starts, which is where an interrupted import resumes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        workers: Optional[int] = None,
+        chunk_bytes: int = CHUNK_BYTES,
+        platform: Optional[str] = None,
+        player: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_bytes = max(64 * 1024, int(chunk_bytes))
+        self.platform = platform
+        self.player = player
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+    def _ranges(self, mm: mmap.mmap, start: int) -> Iterator[Tuple[int, int]]:
+        size = len(mm)
+        while start < size:
+            end = mm.find(GAME_START, min(size, start + self.chunk_bytes))
+            end = size if end < 0 else end + 1  # the chunk keeps the newline, the next one starts at "["
+            yield start, end
+            start = end
+
+    def iter_chunks(self, start_offset: int = 0) -> Iterator[Tuple[int, List[Game]]]:
+        """Yield (next_offset, games) per chunk, in file order, from `start_offset`.
+
+        `start_offset` must be a game boundary (0 or a `next_offset` yielded before).
+        """
+        if self.size == 0:
+            return
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                ProcessPoolExecutor(max_workers=self.workers) as ex:
+            pending: Deque[Tuple[int, Future]] = deque()
+            for start, end in self._ranges(mm, start_offset):
+                pending.append((end, ex.submit(_parse_range, self.path, start, end, self.platform, self.player)))
+                # bounded read-ahead: parsed chunks never pile up faster than they are written
+                if len(pending) >= 2 * self.workers:
+                    end_offset, fut = pending.popleft()
+                    yield end_offset, fut.result()
+            while pending:
+                end_offset, fut = pending.popleft()
+                yield end_offset, fut.result()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Single-pass PGN splitting for importers: headers, the raw text and where the
+# movetext starts. No python-chess game tree is built here; mining parses the
+# moves later (chess.pgn.read_game) only for the games it actually analyzes.
+
+
+def _header(line: str) -> Optional[Tuple[str, str]]:
+    """`[Name "Value"]` -> (name, value), without a regex."""
+    line = line.strip()
+    if not (line.startswith("[") and line.endswith('"]')):
+        return None
+    sp = line.find(' "')
+    if sp < 2:
+        return None
+    value = line[sp + 2:-2]
+    if "\\" in value:
+        value = value.replace('\\"', '"').replace("\\\\", "\\")
+    return line[1:sp], value
+
+
+@dataclass(frozen=True)
+class PgnRecord:
+    """One game as found in the file: headers plus the untouched PGN text."""
+    headers: Dict[str, str]
+    text: str
+    movetext_start: int  # offset of the movetext in `text`
+
+    @property
+    def movetext(self) -> str:
+        return self.text[self.movetext_start:]
+
+
+def _in_comment_after(line: str, in_comment: bool) -> bool:
+    """Whether a `{...}` comment is still open at the end of a movetext line."""
+    if not in_comment and "{" not in line:
+        return False
+    i = 0
+    while True:
+        if in_comment:
+            i = line.find("}", i)
+            if i < 0:
+                return True
+            in_comment = False
+        else:
+            brace, semi = line.find("{", i), line.find(";", i)
+            if brace < 0 or 0 <= semi < brace:
+                return False  # no comment opens (a ";" comment hides the rest of the line)
+            in_comment, i = True, brace
+        i += 1
+
+
+def iter_pgn(lines: Iterable[str]) -> Iterator[PgnRecord]:
+    """Split a stream of PGN lines into games, parsing headers as the lines go by.
+
+    A game ends at the first tag line (`[Name "value"]`) after its movetext,
+    or at the next `[Event`, for games without moves, so only one game is
+    held at a time. Lines inside a `{...}` comment that spans lines never
+    start a game, even when they begin with "[" (e.g. a wrapped `[%clk ...]`),
+    except for an `[Event` tag after a blank line: a game whose comment never
+    closes ends there instead of swallowing the rest of the file.
+    """
+    headers: Dict[str, str] = {}
+    current: List[str] = []
+    movetext_line: Optional[int] = None
+    in_comment = False
+    after_blank = False
+
+    def _record() -> Optional[PgnRecord]:
+        # leading blank lines are dropped, trailing whitespace stripped
+        start = 0
+        while start < len(current) and not current[start].strip():
+            start += 1
+        if start == len(current):
+            return None
+        text = "\n".join(current[start:]).rstrip()
+        if movetext_line is None:
+            return PgnRecord(headers=headers, text=text, movetext_start=len(text))
+        head_len = sum(len(line) + 1 for line in current[start:movetext_line])
+        return PgnRecord(headers=headers, text=text, movetext_start=head_len)
+
+    for line in lines:
+        if in_comment and after_blank and line.startswith("[Event "):
+            in_comment = _header(line) is None  # unclosed `{` in the previous game
+        after_blank = not line.strip()
+        tag = _header(line) if line.startswith("[") and not in_comment else None
+        if tag is not None and current and (movetext_line is not None or line.startswith("[Event ")):
+            rec = _record()
+            if rec is not None:
+                yield rec
+            headers, current, movetext_line = {}, [], None
+        if movetext_line is None and line.startswith("["):
+            if tag is not None:
+                headers[tag[0]] = tag[1]
+        elif movetext_line is None and line.strip():
+            movetext_line = len(current)
+        if movetext_line is not None:
+            in_comment = _in_comment_after(line, in_comment)
+        current.append(line)
+
+    rec = _record()
+    if rec is not None:
+        yield rec
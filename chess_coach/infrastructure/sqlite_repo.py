@@ -20,6 +20,7 @@ class SqliteGameRepository:
     - coach messages
     - spaced review queue
     - weekly curriculum
+    - per-game mining state (game_analysis) + resumable checkpoints
     """
 
     def __init__(self, db_path: str = "chess_coach.db") -> None:
@@ -128,6 +129,64 @@ class SqliteGameRepository:
                 CREATE INDEX IF NOT EXISTS idx_review_user_due ON spaced_review_queue(username, due_date);
                 CREATE INDEX IF NOT EXISTS idx_weekly_user_start ON weekly_curriculum(username, start_date);
                 CREATE INDEX IF NOT EXISTS idx_msgs_user_created ON coach_messages(username, created_at DESC);
+
+                CREATE TABLE IF NOT EXISTS game_analysis (
+                    username TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    game_id TEXT NOT NULL,
+                    analyzed_at TEXT NOT NULL,
+                    engine_settings TEXT NOT NULL,
+                    blunders_found INTEGER NOT NULL DEFAULT 0,
+                    book_plies INTEGER,
+                    PRIMARY KEY(username, platform, game_id)
+                );
+
+                CREATE TABLE IF NOT EXISTS mining_checkpoints (
+                    platform TEXT NOT NULL,
+                    game_id TEXT NOT NULL,
+                    engine_settings TEXT NOT NULL,
+                    next_ply INTEGER NOT NULL,
+                    evals_json TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    mined_ply INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY(platform, game_id, engine_settings)
+                );
+
+                CREATE TABLE IF NOT EXISTS eval_curves (
+                    platform TEXT NOT NULL,
+                    game_id TEXT NOT NULL,
+                    engine_settings TEXT NOT NULL,
+                    curve BLOB NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY(platform, game_id)
+                );
+
+                CREATE TABLE IF NOT EXISTS game_moments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    game_id TEXT NOT NULL,
+                    ply INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    fen_before TEXT NOT NULL,
+                    played_uci TEXT NOT NULL,
+                    best_uci TEXT,
+                    pv_uci TEXT,
+                    swing_cp INTEGER NOT NULL,
+                    eval_cp INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    UNIQUE(username, platform, game_id, ply, kind)
+                );
+                CREATE INDEX IF NOT EXISTS idx_game_moments_user_kind ON game_moments(username, kind, created_at DESC);
+
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    username TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    last_played_at TEXT NOT NULL,
+                    last_game_id TEXT NOT NULL,
+                    synced_at TEXT NOT NULL,
+                    PRIMARY KEY(username, platform)
+                );
                 """
             )
 
@@ -136,19 +195,40 @@ class SqliteGameRepository:
                 con.execute("ALTER TABLE puzzles ADD COLUMN pv_uci TEXT")
             if not self._has_column(con, "puzzles", "tags"):
                 con.execute("ALTER TABLE puzzles ADD COLUMN tags TEXT")
+            if not self._has_column(con, "game_analysis", "book_plies"):
+                con.execute("ALTER TABLE game_analysis ADD COLUMN book_plies INTEGER")
+            if not self._has_column(con, "mining_checkpoints", "mined_ply"):
+                con.execute("ALTER TABLE mining_checkpoints ADD COLUMN mined_ply INTEGER NOT NULL DEFAULT 0")
+
+            # one puzzle per (user, game, ply): drop duplicates left by re-mining, then enforce it
+            if not con.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='index' AND name='uq_puzzles_user_game_ply'"
+            ).fetchone():
+                dup = "SELECT id FROM puzzles WHERE id NOT IN (SELECT MIN(id) FROM puzzles GROUP BY username, platform, game_id, ply)"
+                con.execute(f"DELETE FROM puzzle_stats WHERE puzzle_id IN ({dup})")
+                con.execute(f"DELETE FROM spaced_review_queue WHERE puzzle_id IN ({dup})")
+                con.execute(f"DELETE FROM puzzles WHERE id IN ({dup})")
+                con.execute(
+                    "CREATE UNIQUE INDEX uq_puzzles_user_game_ply ON puzzles(username, platform, game_id, ply)"
+                )
 
     # -----------------------
     # Games
     # -----------------------
-    def save_games(self, games: List[Game], username: str) -> None:
+    def save_games(self, games: List[Game], username: str, replace: bool = True) -> int:
+        """`replace=False` keeps games that are already stored untouched (incremental sync).
+
+        Returns the number of rows written (with `replace=False`: the games that were new).
+        """
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
         with self._connect() as con:
-            for g in games:
-                con.execute(
-                    """
-                    INSERT OR REPLACE INTO games
-                      (username, platform, game_id, played_at, white, black, result, pgn, opening, time_control)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+            cur = con.executemany(
+                f"""
+                {verb} INTO games
+                  (username, platform, game_id, played_at, white, black, result, pgn, opening, time_control)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
                     (
                         username,
                         g.platform,
@@ -160,8 +240,11 @@ class SqliteGameRepository:
                         g.pgn,
                         g.opening,
                         g.time_control,
-                    ),
-                )
+                    )
+                    for g in games
+                ],
+            )
+        return cur.rowcount
 
     def list_recent_games(self, username: str, limit: int) -> List[Game]:
         with self._connect() as con:
@@ -176,44 +259,209 @@ class SqliteGameRepository:
                 (username, limit),
             ).fetchall()
 
-        out: List[Game] = []
-        for r in rows:
-            out.append(
-                Game(
-                    platform=r["platform"],
-                    game_id=r["game_id"],
-                    played_at=datetime.fromisoformat(r["played_at"]),
-                    white=r["white"],
-                    black=r["black"],
-                    result=r["result"],
-                    pgn=r["pgn"],
-                    opening=r["opening"],
-                    time_control=r["time_control"],
-                )
+        return [self._row_to_game(r) for r in rows]
+
+    @staticmethod
+    def _row_to_game(r: sqlite3.Row) -> Game:
+        return Game(
+            platform=r["platform"],
+            game_id=r["game_id"],
+            played_at=datetime.fromisoformat(r["played_at"]),
+            white=r["white"],
+            black=r["black"],
+            result=r["result"],
+            pgn=r["pgn"],
+            opening=r["opening"],
+            time_control=r["time_control"],
+        )
+
+    def list_unanalyzed_games(self, username: str, limit: int) -> List[Game]:
+        """Among the `limit` most recent games, those never mined for blunders."""
+        with self._connect() as con:
+            rows = con.execute(
+                """
+                SELECT g.platform, g.game_id, g.played_at, g.white, g.black, g.result, g.pgn, g.opening, g.time_control
+                FROM (
+                    SELECT * FROM games WHERE username=? ORDER BY played_at DESC LIMIT ?
+                ) g
+                LEFT JOIN game_analysis a
+                  ON a.username=? AND a.platform=g.platform AND a.game_id=g.game_id
+                WHERE a.game_id IS NULL
+                ORDER BY g.played_at DESC
+                """,
+                (username, limit, username),
+            ).fetchall()
+        return [self._row_to_game(r) for r in rows]
+
+    def mark_games_analyzed(
+        self, username: str, engine_settings: str, results: List[Tuple[str, str, int, Optional[int]]]
+    ) -> None:
+        """results: (platform, game_id, blunders_found, book_plies) per fully mined game.
+
+        book_plies is the number of leading book moves (None when no opening book was used).
+        """
+        now = datetime.utcnow().isoformat()
+        with self._connect() as con:
+            con.executemany(
+                """
+                INSERT INTO game_analysis(username, platform, game_id, analyzed_at, engine_settings, blunders_found, book_plies)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(username, platform, game_id) DO UPDATE SET
+                    analyzed_at=excluded.analyzed_at,
+                    engine_settings=excluded.engine_settings,
+                    blunders_found=excluded.blunders_found,
+                    book_plies=COALESCE(excluded.book_plies, game_analysis.book_plies)
+                """,
+                [
+                    (username, platform, game_id, now, engine_settings, int(n), book)
+                    for (platform, game_id, n, book) in results
+                ],
+            )
+
+    def list_book_exits(self, username: str) -> Dict[str, int]:
+        """game_id -> number of leading book plies, for games mined with an opening book."""
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT game_id, book_plies FROM game_analysis WHERE username=? AND book_plies IS NOT NULL",
+                (username,),
+            ).fetchall()
+        return {r["game_id"]: int(r["book_plies"]) for r in rows}
+
+    # -----------------------
+    # Mining checkpoints (per game, independent of the user)
+    # -----------------------
+    def save_mining_checkpoint(
+        self, platform: str, game_id: str, engine_settings: str, next_ply: int, evals: List[List[Any]]
+    ) -> None:
+        """evals: one [cp, mate, best_uci, pv_uci, score_only] entry per position evaluated so far."""
+        now = datetime.utcnow().isoformat()
+        with self._connect() as con:
+            con.execute(
+                """
+                INSERT INTO mining_checkpoints(platform, game_id, engine_settings, next_ply, evals_json, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(platform, game_id, engine_settings) DO UPDATE SET
+                    next_ply=excluded.next_ply,
+                    evals_json=excluded.evals_json,
+                    updated_at=excluded.updated_at
+                """,
+                (platform, game_id, engine_settings, int(next_ply), json.dumps(evals), now),
+            )
+
+    def set_mining_checkpoint_mined_ply(self, platform: str, game_id: str, engine_settings: str, mined_ply: int) -> None:
+        """Record that the game's blunders up to `mined_ply` are saved as puzzles.
+
+        Creates an empty checkpoint if the game has none (e.g. its evals were
+        already cleared), so a later run still skips those blunders.
+        """
+        now = datetime.utcnow().isoformat()
+        with self._connect() as con:
+            con.execute(
+                """
+                INSERT INTO mining_checkpoints(platform, game_id, engine_settings, next_ply, evals_json, updated_at, mined_ply)
+                VALUES (?, ?, ?, 0, '[]', ?, ?)
+                ON CONFLICT(platform, game_id, engine_settings) DO UPDATE SET
+                    mined_ply=MAX(mining_checkpoints.mined_ply, excluded.mined_ply),
+                    updated_at=excluded.updated_at
+                """,
+                (platform, game_id, engine_settings, now, int(mined_ply)),
+            )
+
+    def load_mining_checkpoint(self, platform: str, game_id: str, engine_settings: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as con:
+            r = con.execute(
+                """
+                SELECT next_ply, evals_json, updated_at, mined_ply
+                FROM mining_checkpoints
+                WHERE platform=? AND game_id=? AND engine_settings=?
+                """,
+                (platform, game_id, engine_settings),
+            ).fetchone()
+        if not r:
+            return None
+        return {
+            "next_ply": int(r["next_ply"]),
+            "evals": json.loads(r["evals_json"]),
+            "updated_at": r["updated_at"],
+            "mined_ply": int(r["mined_ply"]),
+        }
+
+    def clear_mining_checkpoint(self, platform: str, game_id: str, engine_settings: str) -> None:
+        with self._connect() as con:
+            con.execute(
+                "DELETE FROM mining_checkpoints WHERE platform=? AND game_id=? AND engine_settings=?",
+                (platform, game_id, engine_settings),
             )
-        return out
 
     def count_games(self, username: str) -> int:
         with self._connect() as con:
             row = con.execute("SELECT COUNT(*) AS c FROM games WHERE username=?", (username,)).fetchone()
         return int(row["c"])
 
+    def get_sync_state(self, username: str, platform: str) -> Optional[Dict[str, Any]]:
+        """High-water mark of the last sync: {last_played_at, last_game_id, synced_at}.
+
+        Users imported before sync existed get the mark of their newest stored game.
+        """
+        with self._connect() as con:
+            r = con.execute(
+                "SELECT last_played_at, last_game_id, synced_at FROM sync_state WHERE username=? AND platform=?",
+                (username, platform),
+            ).fetchone()
+            if r:
+                return dict(r)
+            r = con.execute(
+                """
+                SELECT played_at AS last_played_at, game_id AS last_game_id, NULL AS synced_at
+                FROM games WHERE username=? AND platform=?
+                ORDER BY played_at DESC LIMIT 1
+                """,
+                (username, platform),
+            ).fetchone()
+        return dict(r) if r else None
+
+    def set_sync_state(self, username: str, platform: str, last_played_at: str, last_game_id: str) -> None:
+        with self._connect() as con:
+            con.execute(
+                """
+                INSERT INTO sync_state (username, platform, last_played_at, last_game_id, synced_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(username, platform) DO UPDATE SET
+                  last_played_at=excluded.last_played_at,
+                  last_game_id=excluded.last_game_id,
+                  synced_at=excluded.synced_at
+                """,
+                (username, platform, last_played_at, last_game_id, datetime.utcnow().isoformat()),
+            )
+
     # -----------------------
     # Puzzles
     # -----------------------
-    def save_puzzles(self, username: str, platform: str, puzzles: List[Tuple]) -> None:
+    def save_puzzles(self, username: str, platform: str, puzzles: List[Tuple]) -> List[int]:
         """Puzzles tuples:
         (game_id, ply, fen_before, played_uci, best_uci, pv_uci, tags, swing_cp)
         where pv_uci is space-separated string, tags is comma-separated string.
+        Idempotent: re-saving the same (game_id, ply) updates the puzzle in place
+        (keeping its id, stats and existing tags).
+        Returns the puzzle ids, in input order.
         """
         now = datetime.utcnow().isoformat()
+        ids: List[int] = []
         with self._connect() as con:
             for (game_id, ply, fen_before, played_uci, best_uci, pv_uci, tags, swing_cp) in puzzles:
-                con.execute(
+                cur = con.execute(
                     """
                     INSERT INTO puzzles
                       (username, platform, game_id, ply, fen_before, played_uci, best_uci, pv_uci, tags, swing_cp, created_at)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(username, platform, game_id, ply) DO UPDATE SET
+                        fen_before=excluded.fen_before,
+                        played_uci=excluded.played_uci,
+                        best_uci=excluded.best_uci,
+                        pv_uci=excluded.pv_uci,
+                        tags=COALESCE(puzzles.tags, excluded.tags),
+                        swing_cp=excluded.swing_cp
+                    RETURNING id
                     """,
                     (
                         username,
@@ -229,12 +477,114 @@ class SqliteGameRepository:
                         now,
                     ),
                 )
+                ids.append(int(cur.fetchone()["id"]))
+        return ids
+
+    # -----------------------
+    # Eval curves (per game, independent of the user; blobs are domain.eval_curve.EvalCurve)
+    # -----------------------
+    def save_eval_curves(self, engine_settings: str, curves: List[Tuple[str, str, bytes]]) -> None:
+        """curves: (platform, game_id, blob)."""
+        now = datetime.utcnow().isoformat()
+        with self._connect() as con:
+            con.executemany(
+                """
+                INSERT INTO eval_curves(platform, game_id, engine_settings, curve, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(platform, game_id) DO UPDATE SET
+                    engine_settings=excluded.engine_settings,
+                    curve=excluded.curve,
+                    updated_at=excluded.updated_at
+                """,
+                [(platform, game_id, engine_settings, sqlite3.Binary(blob), now) for (platform, game_id, blob) in curves],
+            )
+
+    def get_eval_curve(self, platform: str, game_id: str) -> Optional[bytes]:
+        with self._connect() as con:
+            r = con.execute(
+                "SELECT curve FROM eval_curves WHERE platform=? AND game_id=?", (platform, game_id)
+            ).fetchone()
+        return bytes(r["curve"]) if r else None
+
+    def list_eval_curves(self, username: str, limit: int = 5000) -> List[Dict[str, Any]]:
+        """Recent games of `username` that have a stored curve (game fields + `curve` blob)."""
+        with self._connect() as con:
+            rows = con.execute(
+                """
+                SELECT g.platform, g.game_id, g.played_at, g.white, g.black, g.result, g.opening, c.curve
+                FROM games g
+                JOIN eval_curves c ON c.platform=g.platform AND c.game_id=g.game_id
+                WHERE g.username=?
+                ORDER BY g.played_at DESC
+                LIMIT ?
+                """,
+                (username, limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    # -----------------------
+    # Game moments (missed punishments, only-moves, conversion failures)
+    # -----------------------
+    def save_moments(self, username: str, platform: str, moments: List[Tuple]) -> None:
+        """Moment tuples:
+        (kind, game_id, ply, fen_before, played_uci, best_uci, pv_uci, swing_cp, eval_cp)
+        with pv_uci space-separated. Idempotent per (game_id, ply, kind).
+        """
+        now = datetime.utcnow().isoformat()
+        with self._connect() as con:
+            con.executemany(
+                """
+                INSERT INTO game_moments
+                  (username, platform, game_id, ply, kind, fen_before, played_uci, best_uci, pv_uci,
+                   swing_cp, eval_cp, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(username, platform, game_id, ply, kind) DO UPDATE SET
+                    best_uci=excluded.best_uci,
+                    pv_uci=excluded.pv_uci,
+                    swing_cp=excluded.swing_cp,
+                    eval_cp=excluded.eval_cp
+                """,
+                [
+                    (username, platform, game_id, int(ply), kind, fen_before, played_uci, best_uci, pv_uci,
+                     int(swing_cp), int(eval_cp), now)
+                    for (kind, game_id, ply, fen_before, played_uci, best_uci, pv_uci, swing_cp, eval_cp) in moments
+                ],
+            )
+
+    def list_moments(self, username: str, kind: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._connect() as con:
+            rows = con.execute(
+                """
+                SELECT id, kind, platform, game_id, ply, fen_before, played_uci, best_uci, pv_uci, swing_cp, eval_cp,
+                       created_at
+                FROM game_moments
+                WHERE username=? AND (? IS NULL OR kind=?)
+                ORDER BY created_at DESC, swing_cp DESC
+                LIMIT ?
+                """,
+                (username, kind, kind, limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
 
     def count_puzzles(self, username: str) -> int:
         with self._connect() as con:
             row = con.execute("SELECT COUNT(*) AS c FROM puzzles WHERE username=?", (username,)).fetchone()
         return int(row["c"])
 
+    def list_puzzles(self, username: str, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._connect() as con:
+            rows = con.execute(
+                """
+                SELECT id, game_id, ply, fen_before, played_uci, best_uci, tags, swing_cp, created_at
+                FROM puzzles
+                WHERE username=?
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+                """,
+                (username, limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
     def list_puzzle_ids(self, username: str, limit: int = 50) -> List[int]:
         with self._connect() as con:
             rows = con.execute(
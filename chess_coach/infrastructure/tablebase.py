@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import chess
+import chess.syzygy
+
+from chess_coach.domain.models import PositionEval
+
+# Tablebase wins are scored like a decisive engine eval: far above any
+# swing threshold, but not a mate (DTZ is not distance to mate).
+TB_WIN_CP = 10000
+
+
+@dataclass(frozen=True)
+class TablebaseProbe:
+    """Exact result for the side to move.
+
+    wdl: 2 win, 1 cursed win (drawn by the 50-move rule), 0 draw,
+    -1 blessed loss, -2 loss. dtz: distance to the next zeroing move.
+    """
+    wdl: int
+    dtz: int
+
+
+class SyzygyTablebase:
+    """Local Syzygy tablebases (outbound adapter).
+
+    `directories` are folders with .rtbw/.rtbz files (Syzygy's own layout);
+    several can be given separated by os.pathsep. Positions with more
+    pieces than the largest table, or with castling rights, are not probed.
+    Also usable as a mining eval source (`name` / `evaluate`).
+    """
+    name = "syzygy"
+
+    def __init__(self, directories: str, max_fds: Optional[int] = 128) -> None:
+        self.directories = [d for d in directories.split(os.pathsep) if d.strip()]
+        self._tb = chess.syzygy.Tablebase(max_fds=max_fds)
+        self.tables = 0
+        for d in self.directories:
+            self.tables += self._tb.add_directory(d)
+        self.max_pieces = self._largest_table()
+
+    def _largest_table(self) -> int:
+        names = list(self._tb.wdl) + list(self._tb.dtz)
+        # table names look like "KRPvKR": one letter per piece
+        return max((len(n) - 1 for n in names), default=0)
+
+    def covers(self, board: chess.Board) -> bool:
+        return (
+            0 < chess.popcount(board.occupied) <= self.max_pieces
+            and not board.castling_rights
+        )
+
+    def probe(self, board: chess.Board) -> Optional[TablebaseProbe]:
+        if not self.covers(board):
+            return None
+        try:
+            return TablebaseProbe(wdl=self._tb.probe_wdl(board), dtz=self._tb.probe_dtz(board))
+        except (KeyError, chess.syzygy.MissingTableError):
+            return None
+
+    def rank_moves(self, board: chess.Board) -> List[Tuple[chess.Move, int]]:
+        """Legal moves with the mover's WDL after each, best first.
+
+        Within a WDL class the winner prefers the shortest DTZ (zeroing
+        moves first), the loser the longest.
+        """
+        ranked = []
+        for move in board.legal_moves:
+            board.push(move)
+            try:
+                if board.is_checkmate():
+                    key, wdl = (2, 1, 0), 2
+                else:
+                    child = self.probe(board)
+                    if child is None:
+                        return []
+                    wdl = -child.wdl
+                    zeroing = board.halfmove_clock == 0
+                    dtz = abs(child.dtz)
+                    key = (wdl, int(zeroing), -dtz) if wdl > 0 else (wdl, int(not zeroing), dtz)
+            finally:
+                board.pop()
+            ranked.append((key, move, wdl))
+        ranked.sort(key=lambda r: r[0], reverse=True)
+        return [(move, wdl) for _, move, wdl in ranked]
+
+    def evaluate(self, board: chess.Board, ply: int = 0) -> Optional[PositionEval]:
+        """Exact evaluation in PositionEval form, or None outside the tables."""
+        root = self.probe(board)
+        if root is None:
+            return None
+        if board.is_checkmate():
+            return PositionEval(cp=None, mate=0, best_move_uci=None, pv_uci=[])
+        if root.wdl in (-1, 0, 1):
+            cp = 0
+        else:
+            cp = TB_WIN_CP if root.wdl > 0 else -TB_WIN_CP
+        ranked = self.rank_moves(board)
+        best = ranked[0][0].uci() if ranked else None
+        return PositionEval(cp=cp, mate=None, best_move_uci=best, pv_uci=[best] if best else [])
+
+    def preserves_result(self, board: chess.Board, move: chess.Move) -> Optional[bool]:
+        """Whether `move` keeps the best achievable WDL; None outside the tables."""
+        ranked = self.rank_moves(board) if self.covers(board) else []
+        if not ranked:
+            return None
+        best_wdl = ranked[0][1]
+        return any(m == move and wdl == best_wdl for m, wdl in ranked)
+
+    def close(self) -> None:
+        self._tb.close()
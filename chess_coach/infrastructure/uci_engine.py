@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import chess
+import chess.engine
+
+from chess_coach.domain.models import PositionEval
+
+PV_MAX_PLIES = 12  # mining keeps 8 plies of PV; a little slack for callers that want more
+
+
+def _to_eval(info: chess.engine.InfoDict, turn: chess.Color) -> PositionEval:
+    score = info.get("score")
+    pov = score.pov(turn) if score is not None else None
+    pv = [m.uci() for m in (info.get("pv") or [])][:PV_MAX_PLIES]
+    return PositionEval(
+        cp=pov.score() if pov is not None and not pov.is_mate() else None,
+        mate=pov.mate() if pov is not None and pov.is_mate() else None,
+        best_move_uci=pv[0] if pv else None,
+        pv_uci=pv,
+    )
+
+
+class UciEngine:
+    """One UCI engine process (outbound adapter used by EnginePool).
+
+    `options` (Threads, Hash, ...) are sent once when the process starts.
+    Evals are PositionEval from the side to move's point of view, like
+    the rest of the mining pipeline expects. `analyze_multipv` returns the
+    best `n` lines, best first (fewer when there are fewer legal moves).
+    """
+
+    def __init__(self, path: str = "stockfish", depth: int = 8, options: Optional[Dict[str, Any]] = None) -> None:
+        self.path = path
+        self.depth = int(depth)
+        self._engine = chess.engine.SimpleEngine.popen_uci(path)
+        if options:
+            self.configure(options)
+
+    def configure(self, options: Dict[str, Any]) -> None:
+        self._engine.configure(options)
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        info = self._engine.analyse(board, chess.engine.Limit(depth=self.depth))
+        return _to_eval(info, board.turn)
+
+    def analyze_multipv(self, board: chess.Board, n: int) -> List[PositionEval]:
+        infos = self._engine.analyse(board, chess.engine.Limit(depth=self.depth), multipv=max(1, int(n)))
+        return [_to_eval(info, board.turn) for info in infos]
+
+    def close(self) -> None:
+        self._engine.quit()
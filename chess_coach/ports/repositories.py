@@ -1,11 +1,30 @@
 from __future__ import annotations
-from typing import Protocol, List, Tuple
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 from chess_coach.domain.models import Game
 
 
 class GameRepository(Protocol):
-    def save_games(self, games: List[Game], username: str) -> None: ...
+    def save_games(self, games: List[Game], username: str, replace: bool = True) -> int: ...
+    def get_sync_state(self, username: str, platform: str) -> Optional[Dict[str, Any]]: ...
+    def set_sync_state(self, username: str, platform: str, last_played_at: str, last_game_id: str) -> None: ...
     def list_recent_games(self, username: str, limit: int) -> List[Game]: ...
+    def list_unanalyzed_games(self, username: str, limit: int) -> List[Game]: ...
+    def mark_games_analyzed(
+        self, username: str, engine_settings: str, results: List[Tuple[str, str, int, Optional[int]]]
+    ) -> None: ...
+    def list_book_exits(self, username: str) -> Dict[str, int]: ...
+    def save_eval_curves(self, engine_settings: str, curves: List[Tuple[str, str, bytes]]) -> None: ...
+    def get_eval_curve(self, platform: str, game_id: str) -> Optional[bytes]: ...
+    def list_eval_curves(self, username: str, limit: int = 5000) -> List[Dict[str, Any]]: ...
 
-    def save_puzzles(self, username: str, platform: str, puzzles: List[Tuple]) -> None: ...
+    def save_mining_checkpoint(
+        self, platform: str, game_id: str, engine_settings: str, next_ply: int, evals: List[List[Any]]
+    ) -> None: ...
+    def set_mining_checkpoint_mined_ply(self, platform: str, game_id: str, engine_settings: str, mined_ply: int) -> None: ...
+    def load_mining_checkpoint(self, platform: str, game_id: str, engine_settings: str) -> Optional[Dict[str, Any]]: ...
+    def clear_mining_checkpoint(self, platform: str, game_id: str, engine_settings: str) -> None: ...
+
+    def save_puzzles(self, username: str, platform: str, puzzles: List[Tuple]) -> List[int]: ...
+    def save_moments(self, username: str, platform: str, moments: List[Tuple]) -> None: ...
+    def list_moments(self, username: str, kind: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]: ...
     def list_puzzles(self, username: str, limit: int = 10): ...
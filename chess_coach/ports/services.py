@@ -1,7 +1,16 @@
 from __future__ import annotations
-from typing import Protocol, List
+from datetime import datetime
+from typing import Iterator, Protocol, List, Optional
 from chess_coach.domain.models import Game
 
 
 class GameSource(Protocol):
     def fetch_games(self, username: str, limit: int) -> List[Game]: ...
+
+
+class GameStreamSource(GameSource, Protocol):
+    """A source that can stream a whole history in bounded-size batches,
+    newest game first, optionally only games played since `since`."""
+    def iter_games(
+        self, username: str, limit: Optional[int] = None, batch_size: int = 200, since: Optional[datetime] = None,
+    ) -> Iterator[List[Game]]: ...
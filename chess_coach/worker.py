@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import argparse
+import signal
+
+from chess_coach.api.deps import build_job_runner
+from chess_coach.application.jobs import start_workers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background job workers (import / mining / tagging).")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    stop = start_workers(build_job_runner, args.workers)
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    print(f"Job workers: {args.workers}. Ctrl+C para parar.")
+    try:
+        while not stop.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        stop.set()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import time
+from datetime import datetime
+
+import chess
+import chess.pgn
+import pytest
+from fastapi import HTTPException
+
+from chess_coach.api import deps
+from chess_coach.api.routers import coach
+from chess_coach.api.schemas import BootstrapRequest
+from chess_coach.application.use_cases import MinePuzzlesUseCase
+from chess_coach.domain.models import Game, PositionEval
+from chess_coach.infrastructure.engine_pool import EnginePool
+from chess_coach.infrastructure.job_queue import JOB_DONE, JOB_QUEUED
+
+
+class SlowEngine:
+    """Every white move loses 300 cp, and each search takes a while."""
+    depth = 1
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        time.sleep(0.03)
+        best = sorted(board.legal_moves, key=lambda m: m.uci())[-1].uci()
+        return PositionEval(cp=300 if board.turn == chess.BLACK else 0, mate=None, best_move_uci=best, pv_uci=[best])
+
+    def close(self) -> None:
+        pass
+
+
+def _game(i: int, plies: int = 12) -> Game:
+    board = chess.Board()
+    for _ in range(plies):
+        board.push(sorted(board.legal_moves, key=lambda m: m.uci())[0])
+    return Game(
+        platform="lichess", game_id=f"g{i}", played_at=datetime(2024, 1, 1 + i), white="me", black="opp",
+        result="*", pgn=str(chess.pgn.Game.from_board(board)),
+    )
+
+
+@pytest.fixture
+def app_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHESS_COACH_DB", str(tmp_path / "coach.db"))
+    monkeypatch.setattr(deps, "_JOB_QUEUE", None)
+    pool = EnginePool(size=1, factory=SlowEngine)
+    monkeypatch.setattr(coach, "_mine_use_case", lambda repo: MinePuzzlesUseCase(repo=repo, pool=pool, detectors=[]))
+    repo = deps.get_repo()
+    repo.save_games([_game(i) for i in range(4)], username="me")
+    yield repo
+    pool.close()
+
+
+def _request(**kw) -> BootstrapRequest:
+    return BootstrapRequest(username="me", max_new_puzzles=50, **kw)
+
+
+def test_bootstrap_without_budget_does_everything_inline(app_state):
+    out = coach.bootstrap(_request())
+    assert out["partial"] is False and out["continuation"] is None and out["job"] is None
+    assert out["decision"]["mined"] == 24
+
+
+def test_deadline_returns_partial_result_and_continuation_round_trip(app_state):
+    repo = app_state
+    started = time.monotonic()
+    out = coach.bootstrap(_request(budget_ms=500))
+    assert time.monotonic() - started < 1.5  # 4 games * 13 searches * 30 ms would take ~1.6 s
+    assert out["partial"] is True
+    assert 0 < out["decision"]["mined"] < 24
+    assert out["counts"]["puzzles"] == out["decision"]["mined"]
+    job, token = out["job"], out["continuation"]
+    assert job["state"] == JOB_QUEUED and token
+    assert deps.get_job_queue().get(job["job_id"]).payload["max_new_puzzles"] == 50 - out["decision"]["mined"]
+
+    # the token reports the handed-off job without mining anything itself
+    again = coach.bootstrap(_request(continuation=token))
+    assert again["partial"] is True and again["continuation"] == token
+    assert again["job"]["job_id"] == job["job_id"]
+    assert again["decision"]["mined"] == 0
+    assert repo.count_puzzles("me") == out["decision"]["mined"]
+
+    queue = deps.get_job_queue()
+    claimed = queue.claim("w1")
+    assert claimed.id == job["job_id"]
+    queue.complete(claimed.id, "w1", {"mined": 1})
+    done = coach.bootstrap(_request(continuation=token))
+    assert done["partial"] is False and done["continuation"] is None
+    assert done["job"]["state"] == JOB_DONE
+
+
+def test_bad_continuation_tokens_are_rejected(app_state):
+    token = coach.bootstrap(_request(budget_ms=500))["continuation"]
+    for bad in ("not-base64!!", "e30", token[:-3]):
+        with pytest.raises(HTTPException) as err:
+            coach.bootstrap(_request(continuation=bad))
+        assert err.value.status_code == 400
+    with pytest.raises(HTTPException) as err:
+        coach.bootstrap(BootstrapRequest(username="other", continuation=token))
+    assert err.value.status_code == 400
@@ -0,0 +1,70 @@
+from chess_coach.infrastructure.chesscom_client import CHESSCOM_BASE, ArchiveDiskCache, ChessComClient
+
+ARCHIVE = f"{CHESSCOM_BASE}/player/me/games/2020/01"
+
+
+def _pgn(*ids: str) -> str:
+    return "\n\n".join(
+        f'[Event "Live Chess"]\n[Link "https://www.chess.com/game/live/{i}"]\n[White "me"]\n[Black "opp"]\n'
+        f'[Result "1-0"]\n\n1. e4 e5 1-0'
+        for i in ids
+    )
+
+
+class _Response:
+    def __init__(self, status_code: int, text: str = "", headers=None, data=None) -> None:
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self._data = data
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class _Session:
+    """Chess.com stand-in: one archive whose body is `pgn`, served with ETag "v2"."""
+
+    def __init__(self, pgn: str) -> None:
+        self.pgn = pgn
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        if url.endswith("/archives"):
+            return _Response(200, data={"archives": [ARCHIVE]})
+        self.requests.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == "v2":
+            return _Response(304)
+        return _Response(200, self.pgn, {"ETag": "v2"})
+
+
+def test_month_cached_while_current_is_revalidated_once_it_closes(tmp_path):
+    cache = ArchiveDiskCache(str(tmp_path))
+    # cached during the month: one game so far
+    cache.put(ARCHIVE + "/pgn", _pgn("1"), etag="v1", last_modified=None, final=False)
+    session = _Session(_pgn("1", "2"))
+    client = ChessComClient(session=session, cache=cache)
+
+    games = client.fetch_games("me", limit=10)
+    assert sorted(g.game_id for g in games) == ["1", "2"]  # the game played after caching is found
+    assert session.requests == [{"If-None-Match": "v1"}]
+
+    # fetched after the month closed: final, no more requests
+    assert cache.get(ARCHIVE + "/pgn")["final"]
+    assert len(client.fetch_games("me", limit=10)) == 2
+    assert len(session.requests) == 1
+
+
+def test_not_modified_closed_month_becomes_final(tmp_path):
+    cache = ArchiveDiskCache(str(tmp_path))
+    cache.put(ARCHIVE + "/pgn", _pgn("1"), etag="v2", last_modified=None)
+    session = _Session(_pgn("1"))
+    client = ChessComClient(session=session, cache=cache)
+
+    assert [g.game_id for g in client.fetch_games("me", limit=10)] == ["1"]
+    assert session.requests == [{"If-None-Match": "v2"}]
+    assert cache.get(ARCHIVE + "/pgn")["final"]
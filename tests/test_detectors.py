@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import chess
+import chess.pgn
+
+from chess_coach.application.detectors import ONLY_MOVE
+from chess_coach.application.use_cases import MinePuzzlesUseCase
+from chess_coach.domain.models import Game, PositionEval
+from chess_coach.infrastructure.engine_pool import EnginePool
+from chess_coach.infrastructure.sqlite_repo import SqliteGameRepository
+
+
+def _first(board: chess.Board) -> chess.Move:
+    return sorted(board.legal_moves, key=lambda m: m.uci())[0]
+
+
+class OnlyMoveEngine:
+    """The move played (first in UCI order) is always best, 300 cp ahead of the second."""
+    depth = 1
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        best = _first(board).uci()
+        return PositionEval(cp=0, mate=None, best_move_uci=best, pv_uci=[best])
+
+    def analyze_multipv(self, board: chess.Board, n: int):
+        moves = sorted(board.legal_moves, key=lambda m: m.uci())[:n]
+        return [
+            PositionEval(cp=-300 * i, mate=None, best_move_uci=m.uci(), pv_uci=[m.uci()]) for i, m in enumerate(moves)
+        ]
+
+    def close(self) -> None:
+        pass
+
+
+def test_only_move_fires_through_the_pool_engines(tmp_path):
+    board = chess.Board()
+    for _ in range(8):
+        board.push(_first(board))
+    game = Game(
+        platform="lichess", game_id="g1", played_at=datetime(2024, 1, 1), white="me", black="opp",
+        result="*", pgn=str(chess.pgn.Game.from_board(board)),
+    )
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    repo.save_games([game], username="me")
+    pool = EnginePool(size=1, factory=OnlyMoveEngine)
+    try:
+        MinePuzzlesUseCase(repo=repo, pool=pool).execute(
+            username="me", platform="lichess", games=[game], max_new=10,
+        )
+    finally:
+        pool.close()
+    moments = repo.list_moments("me", kind=ONLY_MOVE)
+    assert sorted(m["ply"] for m in moments) == [1, 3, 5, 7]  # every white move
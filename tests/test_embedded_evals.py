@@ -0,0 +1,65 @@
+import io
+from datetime import datetime
+
+import chess
+import chess.pgn
+
+from chess_coach.application.blunder_mining import MiningStats, find_blunders
+from chess_coach.application.eval_pipeline import EmbeddedEvalSource
+from chess_coach.domain.models import Game, PositionEval
+
+SANS = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7"]
+
+
+def _annotated(evals) -> str:
+    parts = []
+    for i, (san, ev) in enumerate(zip(SANS, evals)):
+        number = f"{i // 2 + 1}. " if i % 2 == 0 else ""
+        parts.append(f"{number}{san} {{ [%eval {ev}] [%clk 0:03:00] }}")
+    return " ".join(parts) + " *"
+
+
+def _source(pgn: str) -> EmbeddedEvalSource:
+    return EmbeddedEvalSource.from_game(chess.pgn.read_game(io.StringIO(pgn)))
+
+
+def test_white_pov_annotations_become_side_to_move_evals():
+    src = _source(_annotated(["0.3", "0.25", "#-2", "#3", "-1.5"]))
+    board = chess.Board()
+    assert src.evaluate(board, 0) is None  # the start position has no comment
+    after_e4 = src.evaluate(board, 1)
+    assert (after_e4.cp, after_e4.mate) == (-30, None)  # black to move
+    assert (src.evaluate(board, 2).cp, src.evaluate(board, 2).mate) == (25, None)
+    assert (src.evaluate(board, 3).cp, src.evaluate(board, 3).mate) == (None, 2)  # black mates in 2
+    assert (src.evaluate(board, 4).cp, src.evaluate(board, 4).mate) == (None, 3)  # white mates in 3
+    assert src.evaluate(board, 5).cp == 150
+    assert all(ev.score_only and ev.best_move_uci is None for ev in src.evals.values())
+    assert len(src) == 5
+
+
+class ConfirmEngine:
+    """Agrees with the annotations: 3. Bb5 loses 300 cp."""
+    depth = 12
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        self.calls += 1
+        lost = 300 if board.ply() >= 5 else 0
+        best = sorted(board.legal_moves, key=lambda m: m.uci())[-1].uci()
+        return PositionEval(cp=lost if board.turn == chess.BLACK else -lost, mate=None, best_move_uci=best, pv_uci=[best])
+
+
+def test_annotated_game_needs_engine_searches_only_on_candidates():
+    pgn = _annotated(["0.2", "0.2", "0.2", "0.2", "-3.0", "-3.0", "-3.0", "-3.0", "-3.0", "-3.0"])
+    game = Game(
+        platform="lichess", game_id="g1", played_at=datetime(2024, 1, 1), white="me", black="opp",
+        result="*", pgn=pgn,
+    )
+    engine = ConfirmEngine()
+    stats = MiningStats()
+    blunders = find_blunders([game], engine, stats=stats)
+    assert [(b.ply, b.swing_cp) for b in blunders] == [(5, 300)]
+    assert stats.source_evals == {"pgn_eval": 10}
+    assert engine.calls == 3  # the unannotated start position + the candidate ply at full depth
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from chess_coach.infrastructure.engine_pool import BATCH, INTERACTIVE, EnginePool
+
+
+class IdleEngine:
+    depth = 1
+
+    def close(self) -> None:
+        pass
+
+
+def _wait_for(pool: EnginePool, **expected) -> None:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        stats = pool.scheduler_stats()
+        if all(stats[k] == v for k, v in expected.items()):
+            return
+        time.sleep(0.005)
+    raise AssertionError(f"scheduler never reached {expected}: {pool.scheduler_stats()}")
+
+
+def _request(pool: EnginePool, priority: str, user: str, name: str, served: list) -> threading.Thread:
+    def run() -> None:
+        with pool.acquire(priority, user=user):
+            served.append(name)
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    return t
+
+
+def test_interactive_first_then_batch_round_robin_across_users():
+    pool = EnginePool(size=1, factory=IdleEngine)
+    served: list = []
+    try:
+        with pool.acquire(BATCH, user="a"):
+            threads = []
+            # queue order: a1, a2, b1, then an interactive request arriving last
+            for i, (priority, user, name) in enumerate(
+                [(BATCH, "a", "a1"), (BATCH, "a", "a2"), (BATCH, "b", "b1"), (INTERACTIVE, "c", "check")]
+            ):
+                threads.append(_request(pool, priority, user, name, served))
+                if priority == BATCH:
+                    _wait_for(pool, waiting_batch=i + 1)
+            _wait_for(pool, waiting_interactive=1, waiting_users=2)
+        for t in threads:
+            t.join(5)
+    finally:
+        pool.close()
+    assert served == ["check", "a1", "b1", "a2"]
+
+
+def test_batch_work_leaves_the_reserved_engine_for_interactive_requests():
+    pool = EnginePool(size=2, factory=IdleEngine, interactive_reserve=1)
+    served: list = []
+    try:
+        assert pool.batch_limit == 1
+        with pool.acquire(BATCH, user="a"):
+            waiting = _request(pool, BATCH, "b", "b1", served)
+            _wait_for(pool, waiting_batch=1, batch_busy=1)
+            check = _request(pool, INTERACTIVE, "c", "check", served)
+            check.join(5)
+            assert served == ["check"]  # granted while the batch request keeps waiting
+            assert pool.scheduler_stats()["waiting_batch"] == 1
+        waiting.join(5)
+        assert served == ["check", "b1"]
+        assert pool.scheduler_stats()["batch_busy"] == 0
+    finally:
+        pool.close()
+
+
+def test_no_engine_is_reserved_by_default():
+    pool = EnginePool(size=3, factory=IdleEngine)
+    assert pool.batch_limit == 3
+    pool.close()
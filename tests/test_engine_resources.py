@@ -0,0 +1,82 @@
+import chess
+
+from chess_coach.api import deps
+from chess_coach.domain.models import PositionEval
+from chess_coach.infrastructure.engine_pool import EnginePool
+from chess_coach.infrastructure.engine_resources import plan_engine_resources
+
+
+def test_backlog_trades_threads_for_processes():
+    idle = plan_engine_resources(cores=8, memory_mb=16384, queue_depth=0)
+    busy = plan_engine_resources(cores=8, memory_mb=16384, queue_depth=5)
+    assert (idle.pool_size, idle.threads) == (4, 2)
+    assert (busy.pool_size, busy.threads) == (8, 1)
+    assert idle.source == busy.source == "auto"
+    # Hash: 25% of memory over all processes, power of two, capped
+    assert busy.hash_mb == 512 and plan_engine_resources(cores=8, memory_mb=4096, queue_depth=5).hash_mb == 128
+
+
+def test_explicit_values_win():
+    res = plan_engine_resources(cores=8, memory_mb=16384, queue_depth=5, pool_size=2)
+    assert (res.pool_size, res.threads, res.source) == (2, 4, "env")
+
+
+class _Engine:
+    depth = 1
+    spawned = []
+
+    def __init__(self) -> None:
+        self.closed = False
+        _Engine.spawned.append(self)
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        return PositionEval(cp=0, mate=None, best_move_uci=None, pv_uci=[])
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_reconfigure_retires_old_engines_without_interrupting_searches():
+    _Engine.spawned = []
+    pool = EnginePool(size=2, threads=2, factory=_Engine)
+    board = chess.Board()
+    try:
+        with pool.acquire() as busy:
+            busy.analyze(board)
+            with pool.acquire() as other:
+                other.analyze(board)
+            idle, running = _Engine.spawned[1], _Engine.spawned[0]
+
+            pool.reconfigure(size=3, threads=1, hash_mb=64)
+            assert (pool.size, pool.threads, pool.batch_limit) == (3, 1, 3)
+            assert idle.closed and not running.closed  # the busy one finishes its search first
+            busy.analyze(board)
+        assert running.closed
+
+        with pool.acquire() as fresh:
+            fresh.analyze(board)
+        assert len(_Engine.spawned) == 3 and not _Engine.spawned[2].closed
+    finally:
+        pool.close()
+
+
+def test_pool_follows_the_job_backlog(tmp_path, monkeypatch):
+    for name in ("STOCKFISH_POOL_SIZE", "STOCKFISH_THREADS", "STOCKFISH_HASH_MB", "STOCKFISH_TRIAGE_DEPTH"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("CHESS_COACH_DB", str(tmp_path / "coach.db"))
+    monkeypatch.setattr(deps, "detect_cores", lambda: 8)
+    monkeypatch.setattr(deps, "detect_memory_mb", lambda: 16384)
+    for name in ("_JOB_QUEUE", "_ENGINE_RESOURCES", "_ENGINE_POOL", "_TRIAGE_POOL"):
+        monkeypatch.setattr(deps, name, None)
+
+    pool = deps.get_engine_pool()
+    try:
+        assert (pool.size, pool.threads) == (4, 2)
+        queue = deps.get_job_queue()
+        queue.enqueue("mine", "a", "lichess", {})
+        queue.enqueue("mine", "b", "lichess", {})
+        assert deps.get_engine_pool() is pool
+        assert (pool.size, pool.threads) == (8, 1)
+        assert deps.engine_health()["config"]["queue_depth"] == 2
+    finally:
+        pool.close()
@@ -0,0 +1,96 @@
+import threading
+
+import chess
+import pytest
+
+from chess_coach.domain.models import PositionEval
+from chess_coach.infrastructure.engine_supervisor import EngineFailure, EngineHealth, SupervisedEngine
+
+
+class FakeEngine:
+    """Answers, hangs or crashes depending on `mode`."""
+
+    def __init__(self, mode: str, release: threading.Event) -> None:
+        self.mode = mode
+        self.release = release
+        self.options = {}
+        self.closed = threading.Event()
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        if self.mode == "hang":
+            self.release.wait(5)
+        elif self.mode == "crash":
+            raise BrokenPipeError("engine process died")
+        return PositionEval(cp=17, mate=None, best_move_uci="e2e4", pv_uci=["e2e4"])
+
+    def configure(self, options) -> None:
+        self.options.update(options)
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+class Factory:
+    def __init__(self, *modes: str) -> None:
+        self.modes = list(modes)
+        self.spawned = []
+        self.release = threading.Event()
+
+    def __call__(self) -> FakeEngine:
+        engine = FakeEngine(self.modes.pop(0) if self.modes else "ok", self.release)
+        self.spawned.append(engine)
+        return engine
+
+
+def test_hung_engine_is_replaced_and_the_search_retried():
+    factory = Factory("hang")
+    engine = SupervisedEngine(factory, timeout_s=0.1, retries=1)
+    engine.configure({"Threads": 2})
+    try:
+        assert engine.analyze(chess.Board()).cp == 17
+        assert len(factory.spawned) == 2
+        assert factory.spawned[1].options == {"Threads": 2}  # the respawned process keeps its options
+        factory.release.set()
+        assert factory.spawned[0].closed.wait(2)  # closed in the background once it lets go
+        snap = engine.health.snapshot()
+        assert (snap["searches"], snap["timeouts"], snap["failures"], snap["retries"], snap["restarts"]) == (1, 1, 0, 1, 1)
+    finally:
+        engine.close()
+
+
+def test_crashed_engine_is_replaced_and_the_search_retried():
+    factory = Factory("crash")
+    engine = SupervisedEngine(factory, timeout_s=1, retries=1)
+    try:
+        assert engine.analyze(chess.Board()).cp == 17
+        snap = engine.health.snapshot()
+        assert (snap["searches"], snap["timeouts"], snap["failures"], snap["retries"], snap["restarts"]) == (1, 0, 1, 1, 1)
+        assert engine.analyze(chess.Board()).cp == 17
+        assert len(factory.spawned) == 2  # a healthy process is reused
+    finally:
+        engine.close()
+
+
+def test_engine_failure_after_the_last_attempt():
+    factory = Factory("crash", "hang", "crash")
+    health = EngineHealth()
+    engine = SupervisedEngine(factory, timeout_s=0.1, retries=2, health=health)
+    try:
+        with pytest.raises(EngineFailure, match="3 attempts"):
+            engine.analyze(chess.Board())
+        snap = health.snapshot()
+        assert (snap["searches"], snap["timeouts"], snap["failures"], snap["retries"], snap["restarts"]) == (0, 1, 2, 2, 3)
+        # the next search starts on a fresh process
+        assert engine.analyze(chess.Board()).cp == 17
+        assert len(factory.spawned) == 4
+    finally:
+        factory.release.set()
+        engine.close()
+
+
+def test_optional_methods_are_supervised_only_if_the_engine_has_them():
+    engine = SupervisedEngine(Factory(), timeout_s=1)
+    try:
+        assert not hasattr(engine, "analyze_multipv")
+    finally:
+        engine.close()
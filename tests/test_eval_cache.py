@@ -0,0 +1,54 @@
+import chess
+
+from chess_coach.domain.models import PositionEval
+from chess_coach.infrastructure.eval_cache import CachedEngine, SqliteEvalCache, position_key
+
+
+class DepthEngine:
+    def __init__(self, depth: int) -> None:
+        self.depth = depth
+        self.calls = 0
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        self.calls += 1
+        return PositionEval(cp=self.depth * 10, mate=None, best_move_uci="e2e4", pv_uci=["e2e4", "e7e5"])
+
+
+def test_deeper_entry_answers_shallower_requests_only(tmp_path):
+    cache = SqliteEvalCache(db_path=str(tmp_path / "cache.db"))
+    key = position_key(chess.Board())
+    cache.put(key, depth=12, nodes=0, ev=DepthEngine(12).analyze(chess.Board()))
+    assert cache.get(key, depth=8).cp == 120
+    assert cache.get(key, depth=12).cp == 120
+    assert cache.get(key, depth=16) is None
+
+
+def test_entries_survive_a_restart(tmp_path):
+    db = str(tmp_path / "cache.db")
+    board = chess.Board()
+    writer = SqliteEvalCache(db_path=db)
+    CachedEngine(DepthEngine(12), writer).analyze(board)
+    assert SqliteEvalCache(db_path=db).get(position_key(board), depth=12) is None  # buffered until flushed
+    writer.flush()
+
+    reopened = SqliteEvalCache(db_path=db)
+    shallow = DepthEngine(8)
+    ev = CachedEngine(shallow, reopened).analyze(board)
+    assert shallow.calls == 0
+    assert (ev.cp, ev.best_move_uci, ev.pv_uci) == (120, "e2e4", ["e2e4", "e7e5"])
+    assert reopened.stats()["db_hits"] == 1
+    # now in the memory tier
+    CachedEngine(shallow, reopened).analyze(board)
+    assert reopened.stats()["memory_hits"] == 1
+
+
+def test_cached_engine_counts_hits_and_misses(tmp_path):
+    cache = SqliteEvalCache(db_path=str(tmp_path / "cache.db"))
+    engine = DepthEngine(10)
+    wrapped = CachedEngine(engine, cache)
+    board = chess.Board()
+    wrapped.analyze(board)
+    wrapped.analyze(board)
+    board.push_san("e4")
+    wrapped.analyze(board)
+    assert (wrapped.hits, wrapped.misses, engine.calls) == (1, 2, 2)
@@ -0,0 +1,44 @@
+import pytest
+
+from chess_coach.domain.eval_curve import CP_LIMIT, MATE_CP, MISSING, EvalCurve
+from chess_coach.domain.models import PositionEval
+
+
+def _ev(cp=None, mate=None) -> PositionEval:
+    return PositionEval(cp=cp, mate=mate, best_move_uci=None, pv_uci=[])
+
+
+def test_from_evals_stores_white_point_of_view():
+    # side-to-move evals: white +50, black +30, a book move, black winning beyond the clamp
+    curve = EvalCurve.from_evals([_ev(50), _ev(30), None, _ev(99999)])
+    assert list(curve.cp) == [50, -30, MISSING, -CP_LIMIT]
+    assert curve.mates == {}
+
+
+def test_mates_are_kept_apart_from_the_cp_slots():
+    # black to move at index 1 is mated in 2 -> white mates in 2
+    curve = EvalCurve.from_evals([_ev(100), _ev(mate=-2)])
+    assert list(curve.cp) == [100, MATE_CP]
+    assert curve.mate_at(1) == 2
+    assert curve.mate_at(0) is None
+
+
+def test_encode_decode_round_trip():
+    curve = EvalCurve.from_evals([_ev(-20), None, _ev(mate=3), _ev(-CP_LIMIT - 5), _ev(mate=-1)], black_first=True)
+    blob = curve.encode()
+    assert EvalCurve.read_header(blob) == (5, True)
+    back = EvalCurve.decode(blob)
+    assert list(back.cp) == list(curve.cp)
+    assert back.mates == curve.mates
+    assert back.black_first
+    assert len(back) == 5
+
+
+def test_empty_curve_round_trips():
+    back = EvalCurve.decode(EvalCurve.from_evals([]).encode())
+    assert len(back) == 0 and back.mates == {}
+
+
+def test_decode_rejects_other_blobs():
+    with pytest.raises(ValueError):
+        EvalCurve.decode(b"JSON" + bytes(8))
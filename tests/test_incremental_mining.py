@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from chess_coach.domain.models import Game
+from chess_coach.infrastructure.sqlite_repo import SqliteGameRepository
+
+
+def _game(i: int) -> Game:
+    return Game(
+        platform="lichess", game_id=f"g{i}", played_at=datetime(2024, 1, 1 + i), white="me", black="opp",
+        result="1-0", pgn="1. e4 e5 1-0",
+    )
+
+
+def _puzzle(game_id: str, ply: int, tags: str = "fork"):
+    return (game_id, ply, "fen", "e2e4", "d2d4", "d2d4 d7d5", tags, 250)
+
+
+def test_only_never_analyzed_games_of_the_window_are_listed(tmp_path):
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    repo.save_games([_game(i) for i in range(4)], username="me")
+    repo.mark_games_analyzed("me", "stockfish depth=8", [("lichess", "g3", 2, None), ("lichess", "g1", 0, None)])
+
+    assert [g.game_id for g in repo.list_unanalyzed_games("me", limit=30)] == ["g2", "g0"]
+    # the window is the most recent games, analyzed or not
+    assert [g.game_id for g in repo.list_unanalyzed_games("me", limit=2)] == ["g2"]
+    assert repo.list_unanalyzed_games("other", limit=30) == []
+
+
+def test_saving_a_puzzle_again_returns_its_id_and_keeps_stats_and_tags(tmp_path):
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    first = repo.save_puzzles("me", "lichess", [_puzzle("g1", 5), _puzzle("g1", 9)])
+    repo.record_attempt(first[0], solved=True)
+    repo.update_puzzle_tags(first[0], "pin")
+
+    again = repo.save_puzzles("me", "lichess", [_puzzle("g1", 11), _puzzle("g1", 5, tags="fork")])
+    assert again[1] == first[0]
+    assert again[0] not in first
+    assert repo.count_puzzles("me") == 3
+    p = repo.get_puzzle_by_id(first[0])
+    assert p["tags"] == "pin"
+    assert (p["attempts"], p["solved"]) == (1, 1)
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+from chess_coach.application.use_cases import SYNC_FALLBACK_WINDOW, ImportGamesUseCase
+from chess_coach.domain.models import Game
+from chess_coach.infrastructure.sqlite_repo import SqliteGameRepository
+
+START = datetime(2024, 1, 1)
+
+
+def _game(i: int) -> Game:
+    return Game(
+        platform="lichess", game_id=f"g{i}", played_at=START + timedelta(hours=i), white="me", black="opp",
+        result="1-0", pgn=f'[Event "game {i}"]\n\n1. e4 e5 1-0',
+    )
+
+
+class StreamingSource:
+    """Newest first, filtered by `since` and `limit` like the Lichess export."""
+
+    def __init__(self, count: int) -> None:
+        self.games = [_game(i) for i in range(count)]
+        self.calls = []
+        self.batches_read = 0
+
+    def iter_games(self, username, limit, batch_size=200, since=None):
+        self.calls.append({"limit": limit, "since": since})
+        games = sorted((g for g in self.games if since is None or g.played_at >= since),
+                       key=lambda g: g.played_at, reverse=True)[:limit]
+        for i in range(0, len(games), batch_size):
+            self.batches_read += 1
+            yield games[i:i + batch_size]
+
+
+class WindowSource:
+    """No server-side filter: always the newest `limit` games."""
+
+    def __init__(self, count: int) -> None:
+        self.games = [_game(i) for i in range(count)]
+        self.limits = []
+
+    def fetch_games(self, username, limit):
+        self.limits.append(limit)
+        return sorted(self.games, key=lambda g: g.played_at, reverse=True)[:limit]
+
+
+def _mark(repo):
+    state = repo.get_sync_state("me", "lichess")
+    return state and state["last_game_id"]
+
+
+def test_sync_imports_only_games_newer_than_the_mark(tmp_path):
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    source = StreamingSource(5)
+    sync = ImportGamesUseCase(source=source, repo=repo)
+    assert sync.sync("me", "lichess") == 5
+    assert source.calls[-1]["since"] is None
+    assert _mark(repo) == "g4"
+
+    source.games += [_game(5), _game(6)]
+    source.batches_read = 0
+    assert sync.sync("me", "lichess", batch_size=2) == 2
+    assert source.calls[-1]["since"] == START + timedelta(hours=4)
+    assert source.batches_read == 2  # [g6, g5], then [g4] hits the mark and reading stops
+    assert _mark(repo) == "g6"
+    assert repo.count_games("me") == 7
+
+    assert sync.sync("me", "lichess") == 0
+    assert _mark(repo) == "g6"
+
+
+def test_sync_does_not_rewrite_stored_games(tmp_path):
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    source = StreamingSource(2)
+    sync = ImportGamesUseCase(source=source, repo=repo)
+    sync.sync("me", "lichess")
+    repo.set_sync_state("me", "lichess", START.isoformat(), "g0")  # an older mark: g1 is read again
+    source.games[1] = Game(**{**source.games[1].__dict__, "pgn": "changed"})
+    assert sync.sync("me", "lichess") == 0
+    assert "changed" not in [g.pgn for g in repo.list_recent_games("me", limit=10)]
+    assert _mark(repo) == "g1"
+
+
+def test_mark_stays_put_when_limit_cuts_the_gap_short(tmp_path):
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    source = StreamingSource(3)
+    sync = ImportGamesUseCase(source=source, repo=repo)
+    sync.sync("me", "lichess")
+    source.games += [_game(i) for i in range(3, 8)]
+    assert sync.sync("me", "lichess", limit=2) == 2  # g7, g6: g3..g5 still missing
+    assert _mark(repo) == "g2"
+    assert sync.sync("me", "lichess") == 3
+    assert _mark(repo) == "g7"
+    assert repo.count_games("me") == 8
+
+
+def test_sources_without_iter_games_filter_a_fixed_window(tmp_path):
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    source = WindowSource(10)
+    sync = ImportGamesUseCase(source=source, repo=repo)
+    assert sync.sync("me", "lichess") == 10  # fewer than the window: nothing was cut off
+    assert source.limits == [SYNC_FALLBACK_WINDOW]
+    assert _mark(repo) == "g9"
+
+    source.games += [_game(i) for i in range(10, 10 + SYNC_FALLBACK_WINDOW)]
+    # the whole window is new: games between it and the mark may be missing, so the mark stays
+    assert sync.sync("me", "lichess") == SYNC_FALLBACK_WINDOW
+    assert _mark(repo) == "g9"
+
+    # a wider window reaches back to the mark; the games it re-reads are not counted again
+    assert sync.sync("me", "lichess", limit=2 * SYNC_FALLBACK_WINDOW) == 0
+    assert source.limits[-1] == 2 * SYNC_FALLBACK_WINDOW
+    assert _mark(repo) == f"g{9 + SYNC_FALLBACK_WINDOW}"
+    assert repo.count_games("me") == 10 + SYNC_FALLBACK_WINDOW
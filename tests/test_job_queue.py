@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+
+from chess_coach.application.jobs import JOB_MINE, BootstrapJobs, JobRunner
+from chess_coach.application.use_cases import MinePuzzlesUseCase
+from chess_coach.domain.models import Game, PositionEval
+from chess_coach.infrastructure.engine_pool import EnginePool
+from chess_coach.infrastructure.job_queue import JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, SqliteJobQueue
+from chess_coach.infrastructure.sqlite_repo import SqliteGameRepository
+
+
+def _queue(tmp_path) -> SqliteJobQueue:
+    return SqliteJobQueue(db_path=str(tmp_path / "jobs.db"))
+
+
+def _run_now(queue: SqliteJobQueue, job_id: int) -> None:
+    # skip the retry backoff
+    past = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+    with queue._connect() as con:
+        con.execute("UPDATE jobs SET run_after=? WHERE id=?", (past, job_id))
+
+
+def test_enqueue_dedups_active_jobs_per_user_and_kind(tmp_path):
+    queue = _queue(tmp_path)
+    job, created = queue.enqueue("mine", "me", "lichess", {"max_new": 10})
+    again, created_again = queue.enqueue("mine", "me", "lichess", {"max_new": 20})
+    assert created and not created_again
+    assert again.id == job.id and again.payload == {"max_new": 10}
+    assert queue.enqueue("mine", "other", "lichess", {})[1]
+    assert queue.enqueue("bootstrap", "me", "lichess", {})[1]
+    assert queue.count_pending() == 3
+
+    # once the job is finished the user can queue a new one
+    claimed = queue.claim("w1")
+    assert queue.complete(claimed.id, "w1", {"mined": 10})
+    assert queue.get(job.id).state == JOB_DONE
+    assert queue.get(job.id).result == {"mined": 10}
+    assert queue.enqueue("mine", "me", "lichess", {})[1]
+
+
+def test_claim_takes_oldest_job_once(tmp_path):
+    queue = _queue(tmp_path)
+    first, _ = queue.enqueue("mine", "a", "lichess", {})
+    second, _ = queue.enqueue("mine", "b", "lichess", {})
+    got = queue.claim("w1")
+    assert got.id == first.id
+    assert got.state == JOB_RUNNING and got.attempts == 1
+    assert queue.claim("w2").id == second.id
+    assert queue.claim("w3") is None
+
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    queue = _queue(tmp_path)
+    job, _ = queue.enqueue("mine", "me", "lichess", {})
+    queue.claim("w1", lease_s=-1)  # the worker died right away
+    again = queue.claim("w2")
+    assert again.id == job.id and again.attempts == 2
+
+
+def test_stale_worker_cannot_touch_a_reclaimed_job(tmp_path):
+    queue = _queue(tmp_path)
+    job, _ = queue.enqueue("mine", "me", "lichess", {})
+    queue.claim("w1", lease_s=-1)
+    queue.claim("w2")
+
+    assert not queue.report_progress(job.id, "w1", {"stage": "mining"})
+    assert not queue.complete(job.id, "w1", {"mined": 1})
+    assert not queue.fail(job.id, "w1", "boom")
+    assert queue.get(job.id).state == JOB_RUNNING
+
+    assert queue.report_progress(job.id, "w2", {"stage": "mining"})
+    assert queue.complete(job.id, "w2", {"mined": 2})
+    assert queue.get(job.id).result == {"mined": 2}
+
+
+def test_expired_job_out_of_attempts_is_failed_not_reclaimed(tmp_path):
+    queue = _queue(tmp_path)
+    job, _ = queue.enqueue("mine", "me", "lichess", {}, max_attempts=2)
+    queue.claim("w1", lease_s=-1)
+    queue.claim("w2", lease_s=-1)
+    assert queue.claim("w3") is None
+    failed = queue.get(job.id)
+    assert failed.state == JOB_FAILED and failed.attempts == 2
+    assert "lease expired" in failed.error
+
+
+def test_fail_retries_with_backoff_then_gives_up(tmp_path):
+    queue = _queue(tmp_path)
+    job, _ = queue.enqueue("mine", "me", "lichess", {}, max_attempts=2)
+
+    assert queue.fail(queue.claim("w1").id, "w1", "engine crashed")
+    retried = queue.get(job.id)
+    assert retried.state == JOB_QUEUED and retried.error == "engine crashed"
+    assert queue.claim("w1") is None  # still backing off
+
+    _run_now(queue, job.id)
+    assert queue.claim("w1").attempts == 2
+    assert queue.fail(job.id, "w1", "engine crashed again")
+    failed = queue.get(job.id)
+    assert failed.state == JOB_FAILED and failed.error == "engine crashed again"
+    assert queue.claim("w1") is None
+    assert queue.count_pending() == 0
+
+
+def test_runner_stops_reporting_for_a_job_it_lost(tmp_path):
+    queue = _queue(tmp_path)
+    job, _ = queue.enqueue("mine", "me", "lichess", {})
+    seen = []
+
+    def handler(job, report):
+        report({"stage": "mining"})
+        with queue._connect() as con:  # the lease ran out and another worker took the job
+            con.execute("UPDATE jobs SET worker='w2' WHERE id=?", (job.id,))
+        report({"stage": "mining", "games_done": 1})
+        seen.append("after")
+        return {"mined": 1}
+
+    JobRunner(queue, {"mine": handler}, worker_id="w1").run_once()
+    assert seen == []
+    after = queue.get(job.id)
+    assert after.state == JOB_RUNNING and after.result is None
+    assert after.progress == {"stage": "mining"}
+
+
+class _QuietEngine:
+    depth = 1
+
+    def analyze(self, board):
+        best = sorted(board.legal_moves, key=lambda m: m.uci())[-1].uci()
+        return PositionEval(cp=0, mate=None, best_move_uci=best, pv_uci=[best])
+
+    def close(self) -> None:
+        pass
+
+
+def test_mining_stage_heartbeats_once_per_game(tmp_path):
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    repo.save_games([
+        Game(platform="lichess", game_id=f"g{i}", played_at=datetime(2024, 1, 1 + i), white="me", black="opp",
+             result="1-0", pgn="1. e4 e5 2. Nf3 Nc6 1-0")
+        for i in range(3)
+    ], username="me")
+    pool = EnginePool(size=2, factory=_QuietEngine)
+    jobs = BootstrapJobs(
+        repo_factory=lambda: repo, source_factory=None,
+        miner_factory=lambda r: MinePuzzlesUseCase(repo=r, pool=pool, detectors=[]),
+    )
+    reports = []
+    job, _ = _queue(tmp_path).enqueue(JOB_MINE, "me", "lichess", {})
+    try:
+        jobs.run_mine(job, reports.append)
+    finally:
+        pool.close()
+    assert [r.get("games_done") for r in reports] == [None, 1, 2, 3]
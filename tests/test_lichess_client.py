@@ -0,0 +1,101 @@
+import json
+
+from chess_coach.infrastructure import lichess_client
+from chess_coach.infrastructure.lichess_client import LichessClient
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, lines) -> None:
+        self.lines = lines
+        self.read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_lines(self, chunk_size=None, decode_unicode=False):
+        for line in self.lines:
+            self.read += 1
+            yield line
+
+
+def _serve(monkeypatch, lines):
+    calls = []
+    response = _Response(lines)
+
+    def get(url, headers=None, params=None, timeout=None, stream=False):
+        calls.append({"url": url, "headers": headers, "params": params, "stream": stream})
+        return response
+
+    monkeypatch.setattr(lichess_client.requests, "get", get)
+    return calls, response
+
+
+def _pgn(game_id: str, result: str = "1-0") -> str:
+    return (
+        f'[Event "Rated Blitz game"]\n[Site "https://lichess.org/{game_id}"]\n[White "me"]\n[Black "opp"]\n'
+        f'[Result "{result}"]\n[UTCDate "2024.01.02"]\n[UTCTime "10:00:00"]\n[TimeControl "180+2"]\n\n'
+        f"1. e4 e5 {result}\n\n"
+    )
+
+
+def _json(game_id: str, **fields) -> str:
+    obj = {
+        "id": game_id, "createdAt": 1704189600000, "status": "mate", "winner": "white",
+        "players": {"white": {"user": {"name": "me"}}, "black": {"aiLevel": 3}},
+        "clock": {"initial": 180, "increment": 2}, "opening": {"name": "King's Pawn"},
+        "pgn": "1. e4 e5 1-0\n",
+    }
+    obj.update(fields)
+    return json.dumps(obj)
+
+
+def test_pgn_export_is_parsed_in_batches(monkeypatch):
+    text = "".join(_pgn(f"g{i}", "0-1" if i % 2 else "1-0") for i in range(5))
+    calls, _ = _serve(monkeypatch, text.splitlines())
+    batches = list(LichessClient().iter_games("me", limit=5, batch_size=2))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    games = [g for b in batches for g in b]
+    assert [g.game_id for g in games] == ["g0", "g1", "g2", "g3", "g4"]
+    assert games[1].result == "0-1" and games[0].time_control == "180+2"
+    assert games[0].played_at.isoformat() == "2024-01-02T10:00:00+00:00"
+    assert calls[0]["stream"] and calls[0]["params"]["max"] == 5
+    assert calls[0]["headers"]["Accept"] == "application/x-chess-pgn"
+
+
+def test_batches_are_yielded_while_the_export_downloads(monkeypatch):
+    text = "".join(_pgn(f"g{i}") for i in range(6))
+    _, response = _serve(monkeypatch, text.splitlines())
+    first = next(LichessClient().iter_games("me", limit=None, batch_size=2))
+    assert [g.game_id for g in first] == ["g0", "g1"]
+    assert response.read < len(text.splitlines())
+
+
+def test_ndjson_export_maps_fields_without_header_scan(monkeypatch):
+    lines = [_json("a1"), "", _json("a2", winner="black", players={"white": {"user": {"name": "opp"}}})]
+    calls, _ = _serve(monkeypatch, lines)
+    games = LichessClient(fmt="ndjson").fetch_games("me", limit=10)
+    assert [(g.game_id, g.result) for g in games] == [("a1", "1-0"), ("a2", "0-1")]
+    assert games[0].black == "Stockfish level 3" and games[1].black == "black"
+    assert games[0].time_control == "180+2" and games[0].opening == "King's Pawn"
+    assert games[0].pgn == "1. e4 e5 1-0"
+    assert calls[0]["params"]["pgnInJson"] == "true"
+
+
+def test_ndjson_games_without_a_result_are_not_draws(monkeypatch):
+    lines = [
+        _json("ab", status="aborted", winner=None),
+        _json("ns", status="noStart", winner=None),
+        _json("dr", status="draw", winner=None),
+        _json("st", status="stalemate", winner=None),
+    ]
+    _serve(monkeypatch, lines)
+    games = LichessClient(fmt="ndjson").fetch_games("me", limit=10)
+    assert {g.game_id: g.result for g in games} == {"ab": "*", "ns": "*", "dr": "1/2-1/2", "st": "1/2-1/2"}
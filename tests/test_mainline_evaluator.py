@@ -0,0 +1,68 @@
+import io
+from datetime import datetime
+
+import chess
+import chess.pgn
+
+from chess_coach.application.blunder_mining import MiningStats, find_blunders
+from chess_coach.application.eval_pipeline import MainlineEvaluator
+from chess_coach.domain.models import Game, PositionEval
+
+MOVES = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7"
+
+
+class CountingEngine:
+    depth = 1
+
+    def __init__(self) -> None:
+        self.fens = []
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        self.fens.append(board.fen())
+        best = sorted(board.legal_moves, key=lambda m: m.uci())[0].uci()
+        return PositionEval(cp=len(self.fens), mate=None, best_move_uci=best, pv_uci=[best])
+
+
+def _game() -> chess.pgn.Game:
+    return chess.pgn.read_game(io.StringIO(MOVES))
+
+
+def test_n_plies_cost_n_plus_one_searches():
+    engine = CountingEngine()
+    evaluator = MainlineEvaluator(engine)
+    plies = list(evaluator.iter_plies(_game()))
+    assert len(plies) == 10
+    assert len(engine.fens) == 11
+    assert len(set(engine.fens)) == 11  # every position once
+    for prev, cur in zip(plies, plies[1:]):
+        assert cur.before is prev.after  # carried forward, not searched again
+
+
+def test_resumed_evals_are_replayed_without_the_engine():
+    first = MainlineEvaluator(CountingEngine())
+    list(first.iter_plies(_game()))
+    engine = CountingEngine()
+    resumed = MainlineEvaluator(engine, resume_evals=first.evals[:6])
+    list(resumed.iter_plies(_game()))
+    assert resumed.reused == 6
+    assert len(engine.fens) == 5
+
+
+def test_skipped_plies_are_not_searched():
+    engine = CountingEngine()
+    evaluator = MainlineEvaluator(engine)
+    plies = list(evaluator.iter_plies(_game(), skip_plies=4))
+    assert [pe.ply for pe in plies] == [5, 6, 7, 8, 9, 10]
+    assert evaluator.evals[:4] == [None] * 4
+    assert len(engine.fens) == 7
+
+
+def test_mining_reports_n_plus_one_engine_calls():
+    game = Game(
+        platform="lichess", game_id="g1", played_at=datetime(2024, 1, 1), white="me", black="opp",
+        result="*", pgn=MOVES,
+    )
+    stats = MiningStats()
+    find_blunders([game], CountingEngine(), stats=stats)
+    assert stats.plies == 10
+    assert stats.engine_calls == 11
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import chess
+import chess.pgn
+
+from chess_coach.application.use_cases import MinePuzzlesUseCase
+from chess_coach.domain.models import Game, PositionEval
+from chess_coach.infrastructure.engine_pool import EnginePool
+from chess_coach.infrastructure.sqlite_repo import SqliteGameRepository
+
+
+class ScriptedEngine:
+    """Every white move loses 300 cp; the best move is never the one played."""
+    depth = 1
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        best = sorted(board.legal_moves, key=lambda m: m.uci())[-1].uci()
+        return PositionEval(cp=300 if board.turn == chess.BLACK else 0, mate=None, best_move_uci=best, pv_uci=[best])
+
+    def close(self) -> None:
+        pass
+
+
+def _game(i: int, plies: int = 12) -> Game:
+    board = chess.Board()
+    for _ in range(plies):
+        board.push(sorted(board.legal_moves, key=lambda m: m.uci())[0])
+    return Game(
+        platform="lichess", game_id=f"g{i}", played_at=datetime(2024, 1, 1 + i), white="me", black="opp",
+        result="*", pgn=str(chess.pgn.Game.from_board(board)),
+    )
+
+
+def _miner(tmp_path):
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    repo.save_games([_game(i) for i in range(3)], username="me")
+    pool = EnginePool(size=2, factory=ScriptedEngine)
+    return repo, pool, MinePuzzlesUseCase(repo=repo, pool=pool, detectors=[])
+
+
+def _bootstrap(repo, miner, max_new: int) -> int:
+    games = repo.list_unanalyzed_games("me", limit=30)
+    return miner.execute(username="me", platform="lichess", games=games, max_new=max_new)
+
+
+def test_repeated_bootstraps_make_progress_past_the_limit(tmp_path):
+    repo, pool, miner = _miner(tmp_path)
+    try:
+        counts = []
+        for _ in range(4):
+            assert _bootstrap(repo, miner, max_new=4) == 4
+            counts.append(repo.count_puzzles("me"))
+        assert counts == [4, 8, 12, 16]
+    finally:
+        pool.close()
+
+
+def test_all_blunders_are_found_once_and_games_end_analyzed(tmp_path):
+    repo, pool, miner = _miner(tmp_path)
+    try:
+        mined = [_bootstrap(repo, miner, max_new=4) for _ in range(6)]
+        assert sum(mined) == 18  # 6 white moves per game, 3 games, none counted twice
+        assert repo.count_puzzles("me") == 18
+        assert repo.list_unanalyzed_games("me", limit=30) == []
+    finally:
+        pool.close()
+
+
+def test_streaming_bootstrap_resumes_after_the_last_saved_puzzle(tmp_path):
+    repo, pool, miner = _miner(tmp_path)
+    try:
+        games = repo.list_unanalyzed_games("me", limit=30)
+        first = [b.ply for _, b in miner.iter_execute(username="me", platform="lichess", games=games, max_new=2)]
+        games = repo.list_unanalyzed_games("me", limit=30)
+        second = [b.ply for _, b in miner.iter_execute(username="me", platform="lichess", games=games, max_new=2)]
+        assert first == [1, 3]
+        assert second == [5, 7]
+        assert repo.count_puzzles("me") == 4
+    finally:
+        pool.close()
+
+
+def test_game_finished_after_the_limit_keeps_its_checkpoint(tmp_path):
+    # g1 is cut by max_new; in the next run it finishes in a worker while the
+    # newer g2 fills the limit, so its results are dropped and it must resume again
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    repo.save_games([_game(0), _game(1)], username="me")
+    pool = EnginePool(size=3, factory=ScriptedEngine, interactive_reserve=0)
+    miner = MinePuzzlesUseCase(repo=repo, pool=pool, detectors=[])
+    try:
+        counts = []
+        for run in range(5):
+            if run == 1:
+                repo.save_games([_game(2)], username="me")
+            before = repo.count_puzzles("me")
+            mined = _bootstrap(repo, miner, max_new=4)
+            assert repo.count_puzzles("me") - before == mined  # no puzzle is reported twice
+            counts.append(repo.count_puzzles("me"))
+        assert counts == [4, 8, 12, 16, 18]
+        assert repo.list_unanalyzed_games("me", limit=30) == []
+    finally:
+        pool.close()
@@ -0,0 +1,82 @@
+import struct
+from datetime import datetime
+
+import chess
+import chess.polyglot
+
+from chess_coach.application.blunder_mining import MiningStats, find_blunders
+from chess_coach.application.pro_diagnostics_engine import build_opening_breakpoints
+from chess_coach.application.use_cases import MinePuzzlesUseCase
+from chess_coach.domain.models import Game, PositionEval
+from chess_coach.infrastructure.engine_pool import EnginePool
+from chess_coach.infrastructure.opening_book import PolyglotBook
+from chess_coach.infrastructure.sqlite_repo import SqliteGameRepository
+
+MOVES = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7"
+
+
+def _write_book(path, sans) -> None:
+    """Polyglot .bin with one entry per move of the line `sans`."""
+    board = chess.Board()
+    entries = []
+    for san in sans:
+        move = board.parse_san(san)
+        raw = move.to_square | (move.from_square << 6)
+        entries.append((chess.polyglot.zobrist_hash(board), raw))
+        board.push(move)
+    with open(path, "wb") as f:
+        for key, raw in sorted(entries):
+            f.write(struct.pack(">QHHI", key, raw, 1, 0))
+
+
+def _book(tmp_path) -> PolyglotBook:
+    path = tmp_path / "book.bin"
+    _write_book(path, ["e4", "e5", "Nf3"])
+    return PolyglotBook(str(path))
+
+
+class BlunderEngine:
+    """Every move loses 300 cp, so any ply that is mined yields a blunder."""
+    depth = 1
+
+    def __init__(self) -> None:
+        self.plies = []
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        self.plies.append(board.ply())
+        best = sorted(board.legal_moves, key=lambda m: m.uci())[-1].uci()
+        return PositionEval(cp=300 if board.ply() % 2 else 0, mate=None, best_move_uci=best, pv_uci=[best])
+
+    def close(self) -> None:
+        pass
+
+
+def _game() -> Game:
+    return Game(
+        platform="lichess", game_id="g1", played_at=datetime(2024, 1, 1), white="me", black="opp",
+        result="*", pgn=MOVES, opening="Ruy Lopez",
+    )
+
+
+def test_book_moves_are_neither_searched_nor_mined(tmp_path):
+    engine = BlunderEngine()
+    stats = MiningStats()
+    blunders = find_blunders([_game()], engine, book=_book(tmp_path), stats=stats)
+    assert stats.book_plies == 3
+    assert min(engine.plies) == 3  # first search: the position after the last book move
+    assert sorted(b.ply for b in blunders) == [4, 5, 6, 7, 8, 9, 10]
+
+
+def test_book_exit_is_recorded_for_breakpoints(tmp_path):
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    repo.save_games([_game()], username="me")
+    pool = EnginePool(size=1, factory=BlunderEngine)
+    try:
+        MinePuzzlesUseCase(repo=repo, pool=pool, book=_book(tmp_path), detectors=[]).execute(
+            username="me", platform="lichess", games=[_game()], max_new=20,
+        )
+    finally:
+        pool.close()
+    assert repo.list_book_exits("me") == {"g1": 3}
+    [bp] = build_opening_breakpoints(repo, "me")
+    assert (bp["opening_name"], bp["move_number"], bp["avg_out_of_book_move"]) == ("Ruy Lopez", 3, 2.0)  # first own puzzle: 3. Bb5
@@ -0,0 +1,83 @@
+from chess_coach.application.use_cases import BulkImportPgnUseCase
+from chess_coach.infrastructure.pgn_file import GAME_START, PgnFileReader
+from chess_coach.infrastructure.sqlite_repo import SqliteGameRepository
+
+GAMES = 1500  # ~190 KB: several 64 KiB chunks
+MOVES = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 7. Bb3 d6 8. c3 O-O"
+
+
+def _write(path, count: int = GAMES) -> bytes:
+    games = []
+    for i in range(count):
+        white, black = ("me", f"opp{i}") if i % 3 else (f"opp{i}", "someone")
+        games.append(
+            f'[Event "Rated blitz game"]\n[Site "https://lichess.org/id{i:05d}"]\n[Date "2024.01.01"]\n'
+            f'[White "{white}"]\n[Black "{black}"]\n[Result "1-0"]\n\n{MOVES} 1-0\n'
+        )
+    data = "\n".join(games).encode()
+    path.write_bytes(data)
+    return data
+
+
+def test_chunks_end_on_game_boundaries_and_cover_every_game_once(tmp_path):
+    path = tmp_path / "games.pgn"
+    data = _write(path)
+    chunks = list(PgnFileReader(str(path), workers=2, chunk_bytes=1).iter_chunks())
+    assert len(chunks) >= 3
+    offsets = [off for off, _ in chunks]
+    assert offsets == sorted(offsets) and offsets[-1] == len(data)
+    for off in offsets[:-1]:
+        assert data[off - 1:off + len(GAME_START) - 1] == GAME_START  # the newline stays behind
+    ids = [g.game_id for _, games in chunks for g in games]
+    assert ids == [f"id{i:05d}" for i in range(GAMES)]
+    assert {g.platform for _, games in chunks for g in games} == {"lichess"}
+
+
+def test_resume_from_a_yielded_offset_reads_the_rest(tmp_path):
+    path = tmp_path / "games.pgn"
+    _write(path)
+    reader = PgnFileReader(str(path), workers=1, chunk_bytes=64 * 1024)
+    chunks = list(reader.iter_chunks())
+    first_off, first_games = chunks[0]
+    rest = [g.game_id for _, games in reader.iter_chunks(first_off) for g in games]
+    assert rest == [g.game_id for _, games in chunks[1:] for g in games]
+    assert len(first_games) + len(rest) == GAMES
+
+
+def test_player_filter_keeps_only_their_games(tmp_path):
+    path = tmp_path / "games.pgn"
+    _write(path, count=30)
+    games = [g for _, chunk in PgnFileReader(str(path), workers=1, player="ME").iter_chunks() for g in chunk]
+    assert len(games) == 20
+    assert all("me" in (g.white, g.black) for g in games)
+
+
+def test_bulk_import_reports_progress_and_resumes(tmp_path):
+    path = tmp_path / "games.pgn"
+    data = _write(path)
+    repo = SqliteGameRepository(db_path=str(tmp_path / "coach.db"))
+    reader = PgnFileReader(str(path), workers=2, chunk_bytes=64 * 1024)
+    progress = []
+
+    class Interrupted(Exception):
+        pass
+
+    def crash_after_first(p):
+        progress.append(p)
+        raise Interrupted
+
+    use_case = BulkImportPgnUseCase(reader, repo)
+    try:
+        use_case.execute("me", on_progress=crash_after_first)
+    except Interrupted:
+        pass
+    resume_at = progress[0]["offset"]
+    saved = repo.count_games("me")
+    assert 0 < saved == progress[0]["games"] < GAMES
+
+    progress.clear()
+    summary = use_case.execute("me", start_offset=resume_at, on_progress=progress.append)
+    assert summary["offset"] == len(data)
+    assert summary["games"] == GAMES - saved
+    assert [p["offset"] for p in progress] == sorted(p["offset"] for p in progress)
+    assert repo.count_games("me") == GAMES
@@ -0,0 +1,66 @@
+from chess_coach.infrastructure.pgn_tokenizer import iter_pgn
+
+GAME_1 = """[Event "Rated Blitz game"]
+[Site "https://lichess.org/abcd1234"]
+[White "me"]
+[Black "opp"]
+[Result "1-0"]
+
+1. e4 { [%eval 0.2] [%clk 0:03:00] } 1... e5 { [%eval 0.25] [%clk 0:03:00] } 2. Nf3 1-0"""
+
+GAME_2 = """[Event "Rated Blitz game"]
+[Site "https://lichess.org/efgh5678"]
+[White "opp"]
+[Black "me"]
+[Result "0-1"]
+
+1. d4 d5 0-1"""
+
+
+def _split(text: str):
+    return list(iter_pgn(text.splitlines()))
+
+
+def test_splits_games_and_parses_headers():
+    recs = _split(GAME_1 + "\n\n" + GAME_2 + "\n")
+    assert [r.headers["Site"] for r in recs] == ["https://lichess.org/abcd1234", "https://lichess.org/efgh5678"]
+    assert recs[0].text == GAME_1
+    assert recs[1].movetext == "1. d4 d5 0-1"
+
+
+def test_games_without_blank_line_between_them():
+    recs = _split(GAME_1 + "\n" + GAME_2)
+    assert len(recs) == 2
+    assert recs[0].movetext.endswith("2. Nf3 1-0")
+
+
+def test_comment_wrapped_across_lines_does_not_start_a_game():
+    wrapped = GAME_1.replace("{ [%eval 0.2] [%clk 0:03:00] }", "{ [%eval 0.2]\n[%clk 0:03:00] }")
+    recs = _split(wrapped + "\n\n" + GAME_2)
+    assert len(recs) == 2
+    assert recs[0].headers["White"] == "me"
+    assert recs[0].movetext.endswith("2. Nf3 1-0")
+    assert "[%clk 0:03:00] }" in recs[0].movetext
+
+
+def test_tag_like_line_inside_a_comment_is_movetext():
+    text = GAME_2.replace("1. d4 d5 0-1", '1. d4 { see\n[Event "Other game"]\nfor this idea } d5 0-1')
+    recs = _split(text)
+    assert len(recs) == 1
+    assert recs[0].headers["Event"] == "Rated Blitz game"
+    assert recs[0].movetext.endswith("d5 0-1")
+
+
+def test_brace_in_semicolon_comment_does_not_open_a_comment():
+    text = GAME_1.replace("2. Nf3 1-0", "2. Nf3 ; a { that never closes\n1-0")
+    recs = _split(text + "\n\n" + GAME_2)
+    assert len(recs) == 2
+
+
+def test_unclosed_comment_ends_at_the_next_event_after_a_blank_line():
+    broken = GAME_1.replace("2. Nf3 1-0", "2. Nf3 { never closed 1-0")
+    recs = _split(broken + "\n\n" + GAME_2 + "\n\n" + GAME_1)
+    assert [r.headers["Site"] for r in recs] == [
+        "https://lichess.org/abcd1234", "https://lichess.org/efgh5678", "https://lichess.org/abcd1234",
+    ]
+    assert recs[1].movetext == "1. d4 d5 0-1"
@@ -0,0 +1,81 @@
+import io
+from datetime import datetime
+
+import chess
+import chess.pgn
+
+from chess_coach.application.blunder_mining import MiningStats, find_blunders
+from chess_coach.domain.models import Game, PositionEval
+
+MOVES = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6"
+BLACK_BLUNDER, WHITE_BLUNDER = 4, 5  # 2... Nc6 gives away 300 cp, 3. Bb5 gives it back
+
+
+def _game() -> Game:
+    return Game(
+        platform="lichess", game_id="g1", played_at=datetime(2024, 1, 1), white="me", black="opp",
+        result="*", pgn=MOVES,
+    )
+
+
+class SwingEngine:
+    """White is 300 cp up only in the position after ply 4; the best move is never the one played."""
+    depth = 12
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        self.calls += 1
+        white = 300 if board.ply() == BLACK_BLUNDER else 0
+        cp = white if board.turn == chess.WHITE else -white
+        best = sorted(board.legal_moves, key=lambda m: m.uci())[-1].uci()
+        return PositionEval(cp=cp, mate=None, best_move_uci=best, pv_uci=[best])
+
+
+class PlayedBestEngine:
+    """Every move in the game is the engine's best move, at a steady +40 for white."""
+    depth = 12
+
+    def __init__(self) -> None:
+        self.calls = 0
+        game = chess.pgn.read_game(io.StringIO(MOVES))
+        board = game.board()
+        self.best = {}
+        for mv in game.mainline_moves():
+            self.best[board.fen()] = mv.uci()
+            board.push(mv)
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        self.calls += 1
+        best = self.best.get(board.fen()) or next(iter(board.legal_moves)).uci()
+        cp = 40 if board.turn == chess.WHITE else -40
+        return PositionEval(cp=cp, mate=None, best_move_uci=best, pv_uci=[best])
+
+
+def test_without_username_both_sides_are_mined():
+    blunders = find_blunders([_game()], SwingEngine())
+    assert sorted(b.ply for b in blunders) == [BLACK_BLUNDER, WHITE_BLUNDER]
+
+
+def test_only_the_users_moves_are_mined():
+    assert [b.ply for b in find_blunders([_game()], SwingEngine(), username="me")] == [WHITE_BLUNDER]
+    assert [b.ply for b in find_blunders([_game()], SwingEngine(), username="OPP")] == [BLACK_BLUNDER]
+
+
+def test_unknown_username_mines_both_sides():
+    blunders = find_blunders([_game()], SwingEngine(), username="someone-else")
+    assert sorted(b.ply for b in blunders) == [BLACK_BLUNDER, WHITE_BLUNDER]
+
+
+def test_opponent_positions_after_best_moves_need_no_search():
+    engine, stats = PlayedBestEngine(), MiningStats()
+    assert find_blunders([_game()], engine, username="me", stats=stats) == []
+    # 9 positions; the 4 with black to move follow white's best move and come from the PV
+    assert engine.calls == 5
+    assert stats.source_evals.get("best_move") == 4
+
+    engine, stats = PlayedBestEngine(), MiningStats()
+    find_blunders([_game()], engine, stats=stats)
+    assert engine.calls == 9
+    assert "best_move" not in stats.source_evals
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import chess
+import chess.pgn
+
+from chess_coach.application.blunder_mining import MiningStats, find_blunders
+from chess_coach.domain.models import Game
+from chess_coach.infrastructure.tablebase import TB_WIN_CP, SyzygyTablebase
+
+START = "8/8/8/8/8/2k5/8/K6Q w - - 0 1"  # KQ vs K
+
+
+class KQvKProber:
+    """Stands in for the Syzygy files: KQ vs K is won unless black can take the queen."""
+
+    def probe_wdl(self, board: chess.Board) -> int:
+        if not board.pieces(chess.QUEEN, chess.WHITE):
+            return 0
+        if board.turn == chess.BLACK and any(board.is_capture(m) for m in board.legal_moves):
+            return 0
+        return 2 if board.turn == chess.WHITE else -2
+
+    def probe_dtz(self, board: chess.Board) -> int:
+        wdl = self.probe_wdl(board)
+        return 0 if wdl == 0 else (1 if wdl > 0 else -1)
+
+    def close(self) -> None:
+        pass
+
+
+def _tablebase(tmp_path) -> SyzygyTablebase:
+    tb = SyzygyTablebase(str(tmp_path))  # no table files: probing is faked
+    tb._tb = KQvKProber()
+    tb.max_pieces = 3
+    return tb
+
+
+def test_evaluate_maps_wdl_to_decisive_scores(tmp_path):
+    tb = _tablebase(tmp_path)
+    won = tb.evaluate(chess.Board(START))
+    assert (won.cp, won.mate) == (TB_WIN_CP, None)
+    assert won.best_move_uci in {m.uci() for m in chess.Board(START).legal_moves}
+    assert tb.evaluate(chess.Board(START.replace(" w ", " b "))).cp == -TB_WIN_CP
+    assert tb.evaluate(chess.Board()) is None  # 32 pieces and castling rights: not probed
+    assert tb.evaluate(chess.Board("8/8/8/3k4/8/8/8/K7 w - - 0 1")).cp == 0
+
+
+def test_preserves_result_validates_puzzle_moves(tmp_path):
+    tb = _tablebase(tmp_path)
+    board = chess.Board("8/8/8/8/2k5/8/8/K2Q4 w - - 2 2")
+    assert tb.preserves_result(board, chess.Move.from_uci("d1d2")) is True
+    assert tb.preserves_result(board, chess.Move.from_uci("d1d5")) is False  # hangs the queen
+    assert tb.preserves_result(chess.Board(), chess.Move.from_uci("e2e4")) is None
+
+
+class NoEngine:
+    depth = 8
+
+    def analyze(self, board: chess.Board):
+        raise AssertionError(f"engine searched a tablebase position: {board.fen()}")
+
+
+def test_mining_takes_endgame_evals_from_the_tablebase(tmp_path):
+    board = chess.Board(START)
+    for san in ("Qd1", "Kc4", "Qd5+", "Kxd5"):
+        board.push_san(san)
+    game = Game(
+        platform="lichess", game_id="g1", played_at=datetime(2024, 1, 1), white="me", black="opp",
+        result="1/2-1/2", pgn=str(chess.pgn.Game.from_board(board)),
+    )
+    stats = MiningStats()
+    blunders = find_blunders([game], NoEngine(), tablebase=_tablebase(tmp_path), stats=stats)
+    assert [(b.ply, b.move_uci, b.swing_cp) for b in blunders] == [(3, "d1d5", TB_WIN_CP)]
+    assert blunders[0].best_move_uci != "d1d5"
+    assert stats.engine_calls == 0
+    assert stats.source_evals == {"syzygy": 5}
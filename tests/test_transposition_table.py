@@ -0,0 +1,106 @@
+import threading
+from datetime import datetime
+
+import chess
+import pytest
+
+from chess_coach.application.blunder_mining import MiningStats, find_blunders
+from chess_coach.application.eval_pipeline import TranspositionTable
+from chess_coach.domain.models import Game, PositionEval
+
+
+def test_repeated_key_is_computed_once():
+    table = TranspositionTable()
+    calls = []
+    compute = lambda: calls.append(1) or "ev"  # noqa: E731
+    assert table.analyze(("k", 8, 0), compute) == ("ev", False)
+    assert table.analyze(("k", 8, 0), compute) == ("ev", True)
+    assert table.analyze(("k", 12, 0), compute) == ("ev", False)  # other settings: own search
+    assert len(calls) == 2
+    assert table.stats() == {"positions": 3, "dedup_hits": 1, "dedup_ratio": 0.333}
+
+
+def test_concurrent_request_waits_for_the_search_in_flight():
+    table = TranspositionTable()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append("slow")
+        started.set()
+        release.wait(5)
+        return "ev"
+
+    results = {}
+    first = threading.Thread(target=lambda: results.setdefault("first", table.analyze(("k",), slow)))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.setdefault("second", table.analyze(("k",), lambda: "own")))
+    second.start()
+    second.join(0.05)
+    assert second.is_alive()  # waiting, not searching
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert results == {"first": ("ev", False), "second": ("ev", True)}
+    assert calls == ["slow"]
+
+
+def test_failed_search_lets_the_waiter_search_itself():
+    table = TranspositionTable()
+    started, release = threading.Event(), threading.Event()
+
+    def crash():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("engine died")
+
+    errors, results = [], {}
+
+    def run_first():
+        try:
+            table.analyze(("k",), crash)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    first = threading.Thread(target=run_first)
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.setdefault("second", table.analyze(("k",), lambda: "own")))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert errors == ["engine died"]
+    assert results["second"] == ("own", False)
+    # nothing stale left behind: the next request searches (nothing was stored by the failed one)
+    with pytest.raises(RuntimeError):
+        table.analyze(("other",), lambda: (_ for _ in ()).throw(RuntimeError("again")))
+    assert table.analyze(("other",), lambda: "ok") == ("ok", False)
+
+
+class CountingEngine:
+    depth = 1
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        self.calls += 1
+        best = sorted(board.legal_moves, key=lambda m: m.uci())[0].uci()
+        return PositionEval(cp=0, mate=None, best_move_uci=best, pv_uci=[best])
+
+
+def test_positions_shared_across_games_are_searched_once():
+    games = [
+        Game(platform="lichess", game_id=gid, played_at=datetime(2024, 1, 1), white="me", black="opp",
+             result="*", pgn=pgn)
+        for gid, pgn in (("g1", "1. e4 e5 2. Nf3 Nc6 *"), ("g2", "1. e4 e5 2. Nf3 Nf6 *"), ("g3", "1. Nf3 Nc6 2. e4 e5 *"))
+    ]
+    engine = CountingEngine()
+    stats = MiningStats()
+    find_blunders(games, engine, stats=stats)
+    # g1: 5 positions; g2 adds only the last one; g3 transposes into g1 after 4 plies
+    assert engine.calls == 5 + 1 + 3
+    assert stats.positions == 15
+    assert stats.dedup_hits == 6
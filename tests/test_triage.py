@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import chess
+
+from chess_coach.application.blunder_mining import MiningStats, find_blunders
+from chess_coach.domain.models import Game, PositionEval
+
+MOVES = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7"
+BLUNDER_PLY = 5  # 3. Bb5 drops 300 cp; every other move is quiet
+
+
+class ScoreEngine:
+    """White is 300 cp worse from ply 5 on; the best move is never the one played."""
+
+    def __init__(self, depth: int) -> None:
+        self.depth = depth
+        self.calls = 0
+
+    def analyze(self, board: chess.Board) -> PositionEval:
+        self.calls += 1
+        lost = 300 if board.ply() >= BLUNDER_PLY else 0
+        cp = lost if board.turn == chess.BLACK else -lost
+        best = sorted(board.legal_moves, key=lambda m: m.uci())[-1].uci()
+        return PositionEval(cp=cp, mate=None, best_move_uci=best, pv_uci=[best])
+
+
+def _game() -> Game:
+    return Game(
+        platform="lichess", game_id="g1", played_at=datetime(2024, 1, 1), white="me", black="opp",
+        result="*", pgn=MOVES,
+    )
+
+
+def test_deep_search_only_on_candidate_plies():
+    deep, shallow = ScoreEngine(depth=12), ScoreEngine(depth=4)
+    stats = MiningStats()
+    blunders = find_blunders([_game()], deep, triage_engine=shallow, stats=stats)
+    assert [(b.ply, b.swing_cp) for b in blunders] == [(BLUNDER_PLY, 300)]
+    assert shallow.calls == 11
+    assert deep.calls == 2  # before and after the one candidate ply
+    assert stats.deep_calls == 2
+    assert stats.deep_searches_saved == 9
+
+
+def test_without_triage_every_position_is_searched_deep():
+    deep = ScoreEngine(depth=12)
+    blunders = find_blunders([_game()], deep)
+    assert [b.ply for b in blunders] == [BLUNDER_PLY]
+    assert deep.calls == 11